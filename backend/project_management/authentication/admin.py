@@ -1,3 +1,11 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ['doc_type', 'object_id', 'title', 'status', 'visibility', 'updated_at']
+    list_filter = ['doc_type', 'visibility']
+    search_fields = ['title']
+    readonly_fields = ['search_vector', 'updated_at']
@@ -0,0 +1,123 @@
+"""
+Django management command to benchmark the global search execution modes
+Seeds synthetic search documents for every type, then times the single
+ranked query and the grouped (one query per type) search run sequentially
+and concurrently, reporting p50/p95 latency per mode. Worker threads use
+their own connections and cannot see uncommitted rows, so the documents are
+committed and deleted again when the run ends. Meanwhile they are owner-only
+documents of a temporary inactive user, the one the searches run as, so no
+real user's search can return them.
+Run with: python manage.py benchmark_search --per-type 5000
+"""
+import random
+import statistics
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from authentication.models import SearchDocument
+from authentication.search import (
+    DOCUMENT_TYPES, document_vector, is_supported, search_documents, search_documents_by_type,
+)
+
+
+# Seeded object ids start here so they never collide with real documents
+OBJECT_ID_OFFSET = 10 ** 12
+
+WORDS = [
+    'alpha', 'apollo', 'atlas', 'beacon', 'cobalt', 'comet', 'delta', 'ember',
+    'falcon', 'galaxy', 'harbor', 'horizon', 'jade', 'kepler', 'lumen', 'matrix',
+    'nebula', 'nova', 'orbit', 'phoenix', 'pioneer', 'quartz', 'radiant',
+    'summit', 'titan', 'vector', 'vertex', 'zenith', 'zephyr', 'migration',
+]
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[max(0, int(len(ordered) * fraction + 0.5) - 1)]
+
+
+class Command(BaseCommand):
+    help = 'Compare p95 latency of single-query, sequential and concurrent grouped search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--per-type', type=int, default=5000, help='Documents seeded for each search type')
+        parser.add_argument('--queries', default='phoenix,orbit nova,zen', help='Comma separated search texts')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query and mode')
+        parser.add_argument('--limit', type=int, default=10, help='Results per query (per type when grouped)')
+
+    def handle(self, *args, **options):
+        queries = [query.strip() for query in options['queries'].split(',') if query.strip()]
+        if not queries:
+            raise CommandError('--queries must contain at least one search text')
+        if options['per_type'] < 1 or options['repeat'] < 1:
+            raise CommandError('--per-type and --repeat must be positive')
+
+        if not is_supported():
+            self.stdout.write(self.style.WARNING(
+                'Not running on PostgreSQL: timing the icontains fallback.'
+            ))
+
+        limit = options['limit']
+        modes = {
+            'single query': lambda text: search_documents(user, text, limit),
+            'per type, sequential': lambda text: search_documents_by_type(user, text, limit, concurrent=False),
+            'per type, concurrent': lambda text: search_documents_by_type(user, text, limit, concurrent=True),
+        }
+
+        user = User.objects.create_user(username=f'search-benchmark-{uuid.uuid4().hex[:12]}', is_active=False)
+        user.set_unusable_password()
+        user.save(update_fields=['password'])
+        self._seed(options['per_type'], user)
+        try:
+            timings = {mode: [] for mode in modes}
+            for text in queries:
+                for mode, run in modes.items():
+                    run(text)  # warm up connections and caches
+                    for _ in range(options['repeat']):
+                        started = time.perf_counter()
+                        run(text)
+                        timings[mode].append((time.perf_counter() - started) * 1000)
+        finally:
+            SearchDocument.objects.filter(object_id__gte=OBJECT_ID_OFFSET, owner_user=user).delete()
+            user.delete()
+
+        self.stdout.write(f"{'mode':<22} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+        for mode, mode_timings in timings.items():
+            self.stdout.write(
+                f'{mode:<22} {statistics.median(mode_timings):>9.2f} {percentile(mode_timings, 0.95):>9.2f}'
+            )
+
+        sequential = percentile(timings['per type, sequential'], 0.95)
+        concurrent = percentile(timings['per type, concurrent'], 0.95)
+        message = f'Concurrent grouped search p95: {concurrent:.2f} ms vs {sequential:.2f} ms sequential'
+        if concurrent < sequential:
+            self.stdout.write(self.style.SUCCESS(f'{message} ({sequential / concurrent:.1f}x faster).'))
+        else:
+            self.stdout.write(self.style.WARNING(f'{message} (no improvement).'))
+
+    def _seed(self, per_type, user):
+        rng = random.Random(42)
+        documents = []
+        for doc_type in DOCUMENT_TYPES:
+            for i in range(per_type):
+                documents.append(SearchDocument(
+                    doc_type=doc_type,
+                    object_id=OBJECT_ID_OFFSET + i,
+                    title=f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {i}',
+                    body=' '.join(rng.choice(WORDS) for _ in range(12)),
+                    snippet='',
+                    status='active',
+                    owner_user=user,
+                    visibility='owner',
+                ))
+        SearchDocument.objects.bulk_create(documents, batch_size=5000)
+        if is_supported():
+            SearchDocument.objects.filter(object_id__gte=OBJECT_ID_OFFSET, owner_user=user).update(
+                search_vector=document_vector()
+            )
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE authentication_searchdocument')
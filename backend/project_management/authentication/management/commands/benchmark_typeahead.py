@@ -0,0 +1,166 @@
+"""
+Django management command to benchmark the typeahead suggestions
+Seeds synthetic projects and leads with generated names inside a rolled back
+transaction, then times repeated suggest() calls (including misspelled
+queries) and reports the query count and p50/p95 latency per query.
+Names are drawn from --words distinct words: with few words every query
+matches a large share of the rows, with many it behaves like real names.
+Run with: python manage.py benchmark_typeahead --rows 100000
+"""
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from authentication.typeahead import DEFAULT_LIMIT, suggest
+
+
+WORDS = [
+    'alpha', 'apollo', 'atlas', 'beacon', 'cobalt', 'comet', 'delta', 'ember',
+    'falcon', 'galaxy', 'harbor', 'horizon', 'ion', 'jade', 'kepler', 'lumen',
+    'matrix', 'nebula', 'nova', 'orbit', 'phoenix', 'pioneer', 'quartz',
+    'radiant', 'summit', 'titan', 'vector', 'vertex', 'zenith', 'zephyr',
+]
+SURNAMES = [
+    'sharma', 'patel', 'johnson', 'williams', 'garcia', 'mueller', 'tanaka',
+    'kowalski', 'fernandes', 'okafor', 'nguyen', 'anderson', 'rossi', 'ivanova',
+]
+SYLLABLES = [
+    'ba', 'cor', 'da', 'el', 'fen', 'gri', 'hal', 'ka', 'lin', 'mor', 'nev',
+    'ost', 'pra', 'qui', 'ros', 'sel', 'tor', 'ul', 'var', 'wen', 'xi', 'yor', 'zan',
+]
+
+
+def vocabulary(rng, words, size):
+    """words followed by generated words from SYLLABLES, size in total"""
+    result = list(words)
+    seen = set(result)
+    while len(result) < size:
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            result.append(word)
+    return result
+
+
+class Command(BaseCommand):
+    help = 'Time typeahead suggestions against a large seeded name/title set'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Rows to seed, split between projects and leads')
+        parser.add_argument(
+            '--words',
+            type=int,
+            default=len(WORDS),
+            help='Distinct words in project and lead names (extra ones are generated)',
+        )
+        parser.add_argument(
+            '--queries',
+            default='phoenix,phonix orb,zenit,garcia,kowalsky,nova summ',
+            help='Comma separated search texts (misspellings included)',
+        )
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help='Suggestions per query')
+        parser.add_argument('--budget-ms', type=float, default=10.0, help='p95 latency target in milliseconds')
+
+    def handle(self, *args, **options):
+        queries = [query.strip() for query in options['queries'].split(',') if query.strip()]
+        if not queries:
+            raise CommandError('--queries must contain at least one search text')
+        if options['rows'] < 2 or options['repeat'] < 1:
+            raise CommandError('--rows must be at least 2 and --repeat at least 1')
+
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                'Not running on PostgreSQL: timing the icontains fallback without trigram indexes.'
+            ))
+
+        results = []
+        with transaction.atomic():
+            self._seed(options['rows'], options['words'])
+            if connection.vendor == 'postgresql':
+                self._settle_indexes()
+
+            for query in queries:
+                suggest(query, options['limit'])  # warm up
+                timings = []
+                for _ in range(options['repeat']):
+                    with CaptureQueriesContext(connection) as captured:
+                        started = time.perf_counter()
+                        suggestions = suggest(query, options['limit'])
+                        timings.append((time.perf_counter() - started) * 1000)
+                p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+                top = suggestions[0]['title'] if suggestions else '-'
+                results.append((query, len(captured.captured_queries), statistics.median(timings), p95, top))
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'query':<14} {'queries':>8} {'p50 (ms)':>9} {'p95 (ms)':>9}  top match")
+        for query, query_count, p50, p95, top in results:
+            self.stdout.write(f'{query:<14} {query_count:>8} {p50:>9.2f} {p95:>9.2f}  {top}')
+
+        worst = max(p95 for _, _, _, p95, _ in results)
+        if worst <= options['budget_ms']:
+            self.stdout.write(self.style.SUCCESS(
+                f"All queries answered within {options['budget_ms']:.0f} ms at p95 over {options['rows']} rows "
+                f"({options['words']} distinct words)."
+            ))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"Slowest p95 was {worst:.2f} ms, above the {options['budget_ms']:.0f} ms target."
+            ))
+
+    def _settle_indexes(self):
+        """
+        Move the seeded rows out of the GIN pending lists (which are scanned
+        linearly and make the planner avoid the index) and refresh statistics,
+        as autovacuum would have done for rows already in the tables
+        """
+        from leads.models import Lead
+        from projects.models import Project
+
+        indexes = [
+            index.name
+            for model in (Project, Lead)
+            for index in model._meta.indexes
+            if 'gin_trgm_ops' in index.opclasses
+        ]
+        with connection.cursor() as cursor:
+            for name in indexes:
+                cursor.execute('SELECT gin_clean_pending_list(%s::regclass)', [name])
+            cursor.execute('ANALYZE projects_project, leads_lead')
+
+    def _seed(self, rows, words):
+        from leads.models import Lead
+        from projects.models import Project
+
+        rng = random.Random(42)
+        names = vocabulary(rng, WORDS, words)
+        surnames = vocabulary(rng, SURNAMES, max(len(SURNAMES), words // 2))
+        today = timezone.now().date()
+        project_count = rows // 2
+
+        Project.objects.bulk_create([
+            Project(
+                title=f'{rng.choice(names).title()} {rng.choice(names).title()} {i}',
+                description='',
+                start_date=today,
+                end_date=today + timedelta(days=30),
+                status='planning',
+                budget=0,
+            )
+            for i in range(project_count)
+        ], batch_size=5000)
+        Lead.objects.bulk_create([
+            Lead(
+                name=f'{rng.choice(names).title()} {rng.choice(surnames).title()}',
+                email=f'lead{i}@example.com',
+                contact='0000000000',
+                lead_source='benchmark',
+            )
+            for i in range(rows - project_count)
+        ], batch_size=5000)
@@ -0,0 +1,35 @@
+"""
+Management command to backfill the unified search documents
+Run it after migrating and after bulk imports or raw updates, which bypass
+the save signals.
+Usage: python manage.py rebuild_search_documents [--types project,task] [--batch-size 1000]
+"""
+from django.core.management.base import BaseCommand, CommandError
+from authentication.search import DOCUMENT_TYPES, rebuild_documents
+
+
+class Command(BaseCommand):
+    help = 'Rebuild SearchDocument rows in primary key batches and drop documents of deleted objects'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--types',
+            default='',
+            help=f"Comma separated document types (default: all of {', '.join(DOCUMENT_TYPES)})",
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Objects indexed per batch')
+
+    def handle(self, *args, **options):
+        doc_types = [doc_type.strip() for doc_type in options['types'].split(',') if doc_type.strip()]
+        unknown = [doc_type for doc_type in doc_types if doc_type not in DOCUMENT_TYPES]
+        if unknown:
+            raise CommandError(f"Unknown type(s): {', '.join(unknown)}")
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        counts = rebuild_documents(doc_types or None, options['batch_size'])
+        for doc_type, count in counts.items():
+            self.stdout.write(f'{doc_type:<12} {count:>8}')
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully indexed {sum(counts.values())} document(s).')
+        )
@@ -0,0 +1,14 @@
+# Generated by Django 5.2.6 on 2026-10-18 07:05
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """pg_trgm for the typeahead name/title indexes (a no-op on other databases)"""
+
+    dependencies = []
+
+    operations = [
+        TrigramExtension(),
+    ]
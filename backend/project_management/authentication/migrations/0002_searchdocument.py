@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:30
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('authentication', '0001_trigram_extension'),
+        ('employee', '0008_name_trgm'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doc_type', models.CharField(help_text='Search result type, e.g. project or sprint_task', max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True, help_text='Secondary searchable text (description, notes, ...)')),
+                ('snippet', models.CharField(blank=True, max_length=100)),
+                ('status', models.CharField(blank=True, max_length=50)),
+                ('visibility', models.CharField(choices=[('public', 'Everyone'), ('owner', 'Owner only'), ('staff', 'Owner and staff')], default='public', max_length=10)),
+                ('extra', models.JSONField(blank=True, default=dict, help_text='Display fields of related objects (project, sprint, ...)')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Title weighted A, body weighted B', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner_employee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='employee.employee')),
+                ('owner_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='authenticat_search__41a2a9_gin'), models.Index(fields=['visibility'], name='authenticat_visibil_4a5cbc_idx')],
+                'constraints': [models.UniqueConstraint(fields=('doc_type', 'object_id'), name='unique_search_document')],
+            },
+        ),
+    ]
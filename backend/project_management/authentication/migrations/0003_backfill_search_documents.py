@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:31
+
+from django.db import migrations
+
+
+def backfill_search_documents(apps, schema_editor):
+    # The document builders read the current models, so this depends on the
+    # latest migration of every indexed app
+    from authentication.search import rebuild_documents
+
+    rebuild_documents()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_searchdocument'),
+        ('clients', '0002_name_trgm'),
+        ('employee', '0011_resume_parse_cache'),
+        ('invoices', '0002_alter_invoice_invoice_number'),
+        ('leads', '0002_name_trgm'),
+        ('projects', '0004_name_trgm'),
+        ('sprint', '0004_name_trgm'),
+        ('tasks', '0001_initial'),
+        ('teams', '0002_name_trgm'),
+        ('tickets', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
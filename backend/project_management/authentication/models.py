@@ -1,3 +1,53 @@
 from django.db import models
+from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
-# Create your models here.
+
+class SearchDocument(models.Model):
+    """
+    One row per searchable object (project, task, sprint, ...), kept in sync by
+    signals (see search.py) so the global search is a single indexed query
+    """
+    VISIBILITY_CHOICES = [
+        ("public", "Everyone"),
+        ("owner", "Owner only"),
+        ("staff", "Owner and staff"),
+    ]
+
+    doc_type = models.CharField(max_length=20, help_text="Search result type, e.g. project or sprint_task")
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True, help_text="Secondary searchable text (description, notes, ...)")
+    snippet = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=50, blank=True)
+    owner_user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    owner_employee = models.ForeignKey(
+        'employee.Employee',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    visibility = models.CharField(max_length=10, choices=VISIBILITY_CHOICES, default="public")
+    extra = models.JSONField(default=dict, blank=True, help_text="Display fields of related objects (project, sprint, ...)")
+    search_vector = SearchVectorField(null=True, editable=False, help_text="Title weighted A, body weighted B")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['doc_type', 'object_id'], name='unique_search_document'),
+        ]
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            models.Index(fields=['visibility']),
+        ]
+
+    def __str__(self):
+        return f"{self.doc_type} #{self.object_id}: {self.title}"
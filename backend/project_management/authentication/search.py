@@ -0,0 +1,404 @@
+"""
+Unified search documents for the global search
+Every searchable object is denormalized into one SearchDocument row (title,
+snippet, status, owner and a weighted tsvector: title A, body B). Signals
+upsert the row when the object is saved and delete it with the object, so a
+search is a single indexed query over one table with the per-user visibility
+filter applied in SQL. Adding a searchable type means adding a builder to
+DOCUMENT_TYPES; it does not add a query. Full-text matching needs
+PostgreSQL; other databases fall back to icontains over the same table.
+
+Grouped results (the best rows of every type) need one query per type;
+search_documents_by_type() runs those with a per-type timeout, concurrently
+on a thread pool when SEARCH_CONCURRENT is set.
+"""
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import OperationalError, close_old_connections, connection, transaction
+from django.db.models import Case, Count, F, FloatField, Q, Value, When, Window
+
+from .models import SearchDocument
+
+
+def _project_document(project) -> Dict:
+    return {
+        'title': project.title,
+        'body': project.description,
+        'status': project.status,
+        'owner_user_id': project.assigned_to_id,
+    }
+
+
+def _task_document(task) -> Dict:
+    return {
+        'title': task.task_name,
+        'body': task.description,
+        'status': task.status,
+        'owner_employee_id': task.assigned_to_id,
+        'visibility': 'owner',
+        'extra': {'project': task.project.title if task.project else None},
+    }
+
+
+def _sprint_task_document(sprint_task) -> Dict:
+    sprint = sprint_task.sprint
+    return {
+        'title': sprint_task.title,
+        'body': sprint_task.description,
+        'status': sprint_task.status,
+        'owner_user_id': sprint_task.assigned_to_id,
+        'visibility': 'owner',
+        'extra': {
+            'sprint': sprint.name if sprint else None,
+            'project': sprint.project.title if sprint and sprint.project else None,
+        },
+    }
+
+
+def _sprint_document(sprint) -> Dict:
+    return {
+        'title': sprint.name,
+        'body': sprint.description,
+        'status': sprint.status,
+        'extra': {'project': sprint.project.title if sprint.project else None},
+    }
+
+
+def _employee_document(employee) -> Dict:
+    return {
+        'title': employee.name,
+        'body': f"{employee.designation or ''} {employee.department or ''}",
+        'snippet': f"{employee.designation or ''} • {employee.department or ''}".strip(' • '),
+        'status': 'active' if employee.is_active else 'inactive',
+        'owner_user_id': employee.user_id,
+        'owner_employee_id': employee.id,
+    }
+
+
+def _team_document(team) -> Dict:
+    return {
+        'title': team.name,
+        'body': team.note,
+        'status': 'active' if team.is_active else 'inactive',
+        'owner_employee_id': team.team_lead_id,
+    }
+
+
+def _client_document(client) -> Dict:
+    return {
+        'title': client.name,
+        'body': f'{client.address} {client.state} {client.country}',
+        'snippet': ', '.join(part for part in (client.state, client.country) if part),
+        'status': 'active' if client.is_active else 'inactive',
+        'owner_user_id': client.user_id,
+        'visibility': 'staff',
+    }
+
+
+def _lead_document(lead) -> Dict:
+    return {
+        'title': lead.name,
+        'body': f'{lead.description} {lead.email} {lead.lead_source}',
+        'snippet': lead.email,
+        'status': lead.status,
+        'owner_employee_id': lead.assign_to_id,
+        'visibility': 'staff',
+    }
+
+
+def _ticket_document(ticket) -> Dict:
+    return {
+        'title': ticket.title,
+        'body': ticket.description,
+        'status': ticket.status,
+        'owner_employee_id': ticket.assigned_to_id,
+        'visibility': 'staff',
+        'extra': {'project': ticket.project.title if ticket.project else None},
+    }
+
+
+def _invoice_document(invoice) -> Dict:
+    project = invoice.project.title if invoice.project else None
+    client = invoice.client.name if invoice.client else None
+    return {
+        'title': invoice.invoice_number or f'Invoice #{invoice.pk}',
+        'body': f"{client or ''} {project or ''}",
+        'snippet': ' • '.join(part for part in (client, project) if part),
+        'status': invoice.status,
+        'owner_user_id': invoice.client.user_id if invoice.client else None,
+        'visibility': 'staff',
+        'extra': {'project': project, 'client': client},
+    }
+
+
+# Document type -> (model label, document builder, relations the builder reads)
+DOCUMENT_TYPES = {
+    'project': ('projects.Project', _project_document, []),
+    'task': ('tasks.Task', _task_document, ['project']),
+    'sprint_task': ('sprint.SprintTask', _sprint_task_document, ['sprint__project']),
+    'sprint': ('sprint.Sprint', _sprint_document, ['project']),
+    'employee': ('employee.Employee', _employee_document, []),
+    'team': ('teams.Team', _team_document, []),
+    'client': ('clients.Client', _client_document, []),
+    'lead': ('leads.Lead', _lead_document, []),
+    'ticket': ('tickets.Ticket', _ticket_document, ['project']),
+    'invoice': ('invoices.Invoice', _invoice_document, ['project', 'client']),
+}
+
+# Parent type -> documents copying its fields into `extra`, with the lookup to the parent
+DEPENDENT_DOCUMENTS = {
+    'project': [
+        ('task', 'project'), ('sprint', 'project'), ('sprint_task', 'sprint__project'),
+        ('ticket', 'project'), ('invoice', 'project'),
+    ],
+    'sprint': [('sprint_task', 'sprint')],
+    'client': [('invoice', 'client')],
+}
+
+DOCUMENT_FIELDS = [
+    'title', 'body', 'snippet', 'status', 'owner_user', 'owner_employee',
+    'visibility', 'extra', 'updated_at',
+]
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def is_supported() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def document_model(doc_type: str):
+    return apps.get_model(DOCUMENT_TYPES[doc_type][0])
+
+
+def document_queryset(doc_type: str):
+    """Objects of one document type with the relations their builder reads"""
+    label, _, related = DOCUMENT_TYPES[doc_type]
+    return apps.get_model(label).objects.select_related(*related).order_by('pk')
+
+
+def document_vector() -> SearchVector:
+    return (
+        SearchVector('title', weight='A', config=settings.SEARCH_CONFIG)
+        + SearchVector('body', weight='B', config=settings.SEARCH_CONFIG)
+    )
+
+
+def index_objects(doc_type: str, instances: Iterable) -> int:
+    """Upsert the documents of the given objects (one insert plus one vector update)"""
+    build = DOCUMENT_TYPES[doc_type][1]
+    documents = []
+    for instance in instances:
+        fields = {
+            'status': '', 'owner_user_id': None, 'owner_employee_id': None,
+            'visibility': 'public', 'extra': {},
+            **build(instance),
+        }
+        fields['title'] = (fields['title'] or '')[:255]
+        fields['body'] = (fields['body'] or '').strip()
+        fields['snippet'] = (fields.get('snippet', fields['body']) or '')[:100]
+        fields['status'] = fields['status'][:50]
+        documents.append(SearchDocument(doc_type=doc_type, object_id=instance.pk, **fields))
+    if not documents:
+        return 0
+
+    SearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['doc_type', 'object_id'],
+        update_fields=DOCUMENT_FIELDS,
+    )
+    if is_supported():
+        SearchDocument.objects.filter(
+            doc_type=doc_type,
+            object_id__in=[document.object_id for document in documents]
+        ).update(search_vector=document_vector())
+    return len(documents)
+
+
+def index_queryset(doc_type: str, queryset, batch_size: int = 1000) -> int:
+    """Index a queryset from document_queryset() in primary key batches"""
+    indexed = 0
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return indexed
+        indexed += index_objects(doc_type, batch)
+        last_pk = batch[-1].pk
+
+
+def index_object(doc_type: str, pk: int, refresh_dependents: bool = False):
+    """Re-index one object, and the documents copying its fields when it was updated"""
+    index_objects(doc_type, document_queryset(doc_type).filter(pk=pk))
+    if refresh_dependents:
+        for dependent_type, lookup in DEPENDENT_DOCUMENTS.get(doc_type, []):
+            index_queryset(dependent_type, document_queryset(dependent_type).filter(**{lookup: pk}))
+
+
+def remove_object(doc_type: str, pk: int):
+    SearchDocument.objects.filter(doc_type=doc_type, object_id=pk).delete()
+
+
+def rebuild_documents(doc_types: Optional[Iterable[str]] = None, batch_size: int = 1000) -> Dict[str, int]:
+    """Backfill every document of the given types (default: all) and drop orphans"""
+    counts = {}
+    for doc_type in doc_types or DOCUMENT_TYPES:
+        counts[doc_type] = index_queryset(doc_type, document_queryset(doc_type), batch_size)
+        SearchDocument.objects.filter(doc_type=doc_type).exclude(
+            object_id__in=document_model(doc_type).objects.values('pk')
+        ).delete()
+    return counts
+
+
+def visible_to(user) -> Q:
+    """Public documents, documents the user (or their employee profile) owns, and staff documents for staff"""
+    visible = Q(visibility='public') | Q(owner_user=user) | Q(owner_employee__user=user)
+    if user.is_staff:
+        visible |= Q(visibility='staff')
+    return visible
+
+
+def prefix_query(text: str) -> Optional[SearchQuery]:
+    """
+    Query matching every word of text as a prefix ('proj dash' finds
+    'Project Dashboard'), or None when text has no words
+    """
+    tokens = TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    raw = ' & '.join(f'{token}:*' for token in tokens)
+    return SearchQuery(raw, search_type='raw', config=settings.SEARCH_CONFIG)
+
+
+def _contains_rank(text: str):
+    """Relevance of an icontains match when full-text search is unavailable"""
+    return Case(
+        When(title__iexact=text, then=Value(1.0)),
+        When(title__istartswith=text, then=Value(0.8)),
+        When(title__icontains=text, then=Value(0.6)),
+        default=Value(0.2),
+        output_field=FloatField(),
+    )
+
+
+def _matching_documents(user, text: str):
+    """Documents visible to user that match text, annotated with rank (None when text has no words)"""
+    documents = SearchDocument.objects.filter(visible_to(user))
+    if is_supported():
+        query = prefix_query(text)
+        if query is None:
+            return None
+        return documents.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query)
+        )
+    return documents.filter(
+        Q(title__icontains=text) | Q(body__icontains=text)
+    ).annotate(rank=_contains_rank(text))
+
+
+def search_documents(user, text: str, limit: int) -> List[SearchDocument]:
+    """
+    Best `limit` documents visible to user, highest rank first. Each carries
+    rank, type_matches (matches of its type) and total_matches
+    """
+    documents = _matching_documents(user, text)
+    if documents is None:
+        return []
+    return list(
+        documents.annotate(
+            type_matches=Window(Count('id'), partition_by=[F('doc_type')]),
+            total_matches=Window(Count('id')),
+        )
+        .defer('body', 'search_vector')
+        .order_by('-rank', '-updated_at')[:limit]
+    )
+
+
+def _search_type(user, text: str, doc_type: str, limit: int, timeout_ms: int) -> List[SearchDocument]:
+    """Best `limit` documents of one type; PostgreSQL cancels the query after timeout_ms"""
+    documents = _matching_documents(user, text)
+    if documents is None:
+        return []
+    documents = (
+        documents.filter(doc_type=doc_type)
+        .annotate(type_matches=Window(Count('id')))
+        .defer('body', 'search_vector')
+        .order_by('-rank', '-updated_at')[:limit]
+    )
+    with transaction.atomic():
+        if is_supported():
+            with connection.cursor() as cursor:
+                cursor.execute(f'SET LOCAL statement_timeout = {int(timeout_ms)}')
+        return list(documents)
+
+
+def _search_type_in_thread(*args) -> List[SearchDocument]:
+    # Worker threads open their own connection; release it like the end of a request would
+    try:
+        return _search_type(*args)
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.SEARCH_MAX_WORKERS,
+                thread_name_prefix='search'
+            )
+        return _executor
+
+
+def search_documents_by_type(user, text: str, limit: int, doc_types: Optional[Iterable[str]] = None,
+                             concurrent: Optional[bool] = None,
+                             timeout_ms: Optional[int] = None) -> Tuple[Dict[str, List[SearchDocument]], List[str]]:
+    """
+    Best `limit` documents of every type (default: all), one query per type.
+    Concurrent mode (default: SEARCH_CONCURRENT) runs the queries on a thread pool, each on its own
+    connection, and gives up on a type after timeout_ms so one slow type
+    cannot stall the response. Returns ({type: documents}, timed out types).
+    """
+    doc_types = list(doc_types or DOCUMENT_TYPES)
+    timeout_ms = timeout_ms or settings.SEARCH_TYPE_TIMEOUT_MS
+    if concurrent is None:
+        concurrent = settings.SEARCH_CONCURRENT
+    results = {}
+    timed_out = []
+
+    if not concurrent:
+        for doc_type in doc_types:
+            try:
+                results[doc_type] = _search_type(user, text, doc_type, limit, timeout_ms)
+            except OperationalError:
+                # statement_timeout cancelled the query
+                timed_out.append(doc_type)
+        return results, timed_out
+
+    executor = _get_executor()
+    futures = {
+        executor.submit(_search_type_in_thread, user, text, doc_type, limit, timeout_ms): doc_type
+        for doc_type in doc_types
+    }
+    done, not_done = wait(futures, timeout=timeout_ms / 1000)
+    for future in done:
+        try:
+            results[futures[future]] = future.result()
+        except OperationalError:
+            timed_out.append(futures[future])
+    for future in not_done:
+        future.cancel()
+        timed_out.append(futures[future])
+    return results, sorted(timed_out, key=doc_types.index)
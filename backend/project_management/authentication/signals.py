@@ -0,0 +1,32 @@
+"""
+Signal handlers keeping the unified search documents and the typeahead cache in sync
+"""
+from django.apps import apps
+from django.db.models.signals import post_save, post_delete
+
+from .search import DOCUMENT_TYPES, document_model, index_object, remove_object
+from .typeahead import SOURCES as TYPEAHEAD_SOURCES
+from .typeahead_cache import invalidate_typeahead
+
+
+DOCUMENT_TYPE_BY_MODEL = {document_model(doc_type): doc_type for doc_type in DOCUMENT_TYPES}
+
+
+def searchable_saved(sender, instance, created, **kwargs):
+    # Updates also refresh documents that copy this object's fields (e.g. a task's project title)
+    index_object(DOCUMENT_TYPE_BY_MODEL[sender], instance.pk, refresh_dependents=not created)
+
+
+def searchable_deleted(sender, instance, **kwargs):
+    remove_object(DOCUMENT_TYPE_BY_MODEL[sender], instance.pk)
+
+
+for model, doc_type in DOCUMENT_TYPE_BY_MODEL.items():
+    post_save.connect(searchable_saved, sender=model, dispatch_uid=f'search_document_saved_{doc_type}')
+    post_delete.connect(searchable_deleted, sender=model, dispatch_uid=f'search_document_deleted_{doc_type}')
+
+
+for label, _ in TYPEAHEAD_SOURCES.values():
+    model = apps.get_model(label)
+    post_save.connect(invalidate_typeahead, sender=model, dispatch_uid=f'typeahead_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_typeahead, sender=model, dispatch_uid=f'typeahead_cache_delete_{model.__name__}')
@@ -1,3 +1,42 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from clients.models import Client
+from leads.models import Lead
+from projects.models import Project
+
+
+class TypeaheadVisibilityTests(TestCase):
+    url = '/api/auth/search/typeahead/'
+
+    def setUp(self):
+        cache.clear()
+        Project.objects.create(
+            title='Acme Portal', description='', start_date=date(2026, 1, 1), end_date=date(2026, 6, 30),
+            status='in_progress', budget=1000,
+        )
+        Client.objects.create(user=User.objects.create_user('acme-client'), name='Acme Corp', phone='1')
+        Lead.objects.create(name='Acme Leads', email='lead@acme.test', contact='1', lead_source='Web')
+        self.client = APIClient()
+
+    def labels(self, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get(self.url, {'q': 'acme', **params})
+        return response, {result['type'] for result in response.data.get('results', [])}
+
+    def test_staff_see_clients_and_leads(self):
+        staff = User.objects.create_user('staff', is_staff=True)
+        _, types = self.labels(staff)
+        self.assertEqual(types, {'project', 'client', 'lead'})
+
+    def test_non_staff_do_not_see_clients_and_leads(self):
+        member = User.objects.create_user('member')
+        _, types = self.labels(member)
+        self.assertEqual(types, {'project'})
 
-# Create your tests here.
+        response, _ = self.labels(member, types='client')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,191 @@
+"""
+Typeahead suggestions for the global search box
+Names and titles have pg_trgm GIN indexes, so a keystroke costs one UNION ALL
+query: each source returns up to CANDIDATE_LIMIT rows matching the text by
+trigram word similarity (which tolerates typos and partial words) or by
+substring, and the best rows are returned by similarity. The substring test
+is a case-insensitive regex rather than icontains: icontains compares
+UPPER(column), which the trigram index cannot serve. Other databases fall
+back to icontains matches ranked in Python. The candidate lists are what the
+per-user prefix cache (typeahead_cache.py) keeps and refines. Clients and
+leads are staff documents in global search, so only staff get them here too.
+"""
+import re
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.apps import apps
+from django.contrib.postgres.search import TrigramSimilarity, TrigramWordSimilarity
+from django.db import connection
+from django.db.models import CharField, F, Q, Value
+
+
+# Result type -> (model label, indexed name/title field)
+SOURCES = {
+    'project': ('projects.Project', 'title'),
+    'employee': ('employee.Employee', 'name'),
+    'sprint': ('sprint.Sprint', 'name'),
+    'team': ('teams.Team', 'name'),
+    'client': ('clients.Client', 'name'),
+    'lead': ('leads.Lead', 'name'),
+}
+
+# Sources only staff may search (their SearchDocuments have visibility 'staff')
+STAFF_SOURCES = {'client', 'lead'}
+
+MIN_LENGTH = 2
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+
+# Rows fetched per source; a source returning this many may have more matches
+CANDIDATE_LIMIT = 50
+
+WORD_RE = re.compile(r'[^\W_]+')
+
+
+def normalize(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+def trigrams(text: str) -> set:
+    """pg_trgm style trigrams: every word padded with two spaces before and one after"""
+    grams = set()
+    for word in WORD_RE.findall(text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def word_similarity(text: str, label: str) -> float:
+    """Share of the text's trigrams found in label (close to pg_trgm's word_similarity)"""
+    text_grams = trigrams(text)
+    if not text_grams:
+        return 0.0
+    return len(text_grams & trigrams(label)) / len(text_grams)
+
+
+def score(text: str, label: str) -> float:
+    """In-memory relevance of label for text, on the same scale as the database ranking"""
+    if connection.vendor == 'postgresql':
+        return word_similarity(text, label)
+    return SequenceMatcher(None, text, label.lower()).ratio()
+
+
+def available_types(user=None) -> List[str]:
+    """Result types user may search; every type when no user is given"""
+    if user is None or user.is_staff:
+        return list(SOURCES)
+    return [type_name for type_name in SOURCES if type_name not in STAFF_SOURCES]
+
+
+def prepare(text: str, limit=DEFAULT_LIMIT, types: Optional[Iterable[str]] = None,
+            user=None) -> Tuple[str, int, List[str]]:
+    """Normalized text (empty when too short), clamped limit and types validated for user"""
+    available = available_types(user)
+    types = list(types) if types else available
+    unknown = [type_name for type_name in types if type_name not in available]
+    if unknown:
+        raise ValueError(f"Unknown type(s) {', '.join(unknown)}. Choose from: {', '.join(available)}")
+    text = normalize(text)
+    if len(text) < MIN_LENGTH:
+        text = ''
+    return text, min(max(int(limit), 1), MAX_LIMIT), types
+
+
+def _source(type_name: str):
+    label, field = SOURCES[type_name]
+    return apps.get_model(label), field
+
+
+def _trigram_queryset(type_name: str, text: str):
+    """Best candidates of one source, projected to the shared union columns"""
+    model, field = _source(type_name)
+    return (
+        model.objects.filter(
+            Q(**{f'{field}__trigram_word_similar': text}) | Q(**{f'{field}__iregex': re.escape(text)})
+        )
+        .annotate(
+            type=Value(type_name, output_field=CharField()),
+            label=F(field),
+            score=TrigramWordSimilarity(text, field),
+            similarity=TrigramSimilarity(field, text),
+        )
+        .order_by('-score', '-similarity')
+        .values('id', 'type', 'label', 'score', 'similarity')[:CANDIDATE_LIMIT]
+    )
+
+
+def _trigram_candidates(text: str, types: List[str]) -> List[Dict]:
+    querysets = [_trigram_queryset(type_name, text) for type_name in types]
+    rows = querysets[0].union(*querysets[1:], all=True) if len(querysets) > 1 else querysets[0]
+    return [
+        {'type': row['type'], 'id': row['id'], 'title': row['label'], 'score': row['score']}
+        for row in rows
+    ]
+
+
+def _contains_candidates(text: str, types: List[str]) -> List[Dict]:
+    """icontains matches ranked by string similarity (no typo tolerance)"""
+    candidates = []
+    for type_name in types:
+        model, field = _source(type_name)
+        rows = model.objects.filter(**{f'{field}__icontains': text}).values_list('id', field)[:CANDIDATE_LIMIT]
+        candidates.extend(
+            {'type': type_name, 'id': row_id, 'title': label, 'score': score(text, label)}
+            for row_id, label in rows
+        )
+    return candidates
+
+
+def fetch_candidates(text: str, types: List[str]) -> Tuple[List[Dict], bool]:
+    """
+    Candidates for normalized text with their scores, and whether any source
+    hit CANDIDATE_LIMIT (the list may then miss matches)
+    """
+    if connection.vendor == 'postgresql':
+        candidates = _trigram_candidates(text, types)
+    else:
+        candidates = _contains_candidates(text, types)
+    per_type = {}
+    for candidate in candidates:
+        per_type[candidate['type']] = per_type.get(candidate['type'], 0) + 1
+    return candidates, any(count >= CANDIDATE_LIMIT for count in per_type.values())
+
+
+def is_fuzzy() -> bool:
+    """Whether matching tolerates typos (trigram similarity, PostgreSQL only)"""
+    return connection.vendor == 'postgresql'
+
+
+def refine(candidates: List[Dict], text: str) -> List[Dict]:
+    """
+    Candidates fetched for a prefix of text that contain text, rescored.
+    Only substring matches carry over: every label containing text also
+    contains the prefix, so none is missing, but a trigram match for text need
+    not have been one for the prefix ('pz' does not match 'Project', 'pzoject'
+    does), so typo matches must come from the database.
+    """
+    refined = []
+    for candidate in candidates:
+        label = candidate['title'].lower()
+        if text in label:
+            refined.append({**candidate, 'score': score(text, label)})
+    return refined
+
+
+def top(candidates: List[Dict], limit: int) -> List[Dict]:
+    best = sorted(candidates, key=lambda candidate: candidate['score'], reverse=True)[:limit]
+    return [{**candidate, 'score': round(candidate['score'], 3)} for candidate in best]
+
+
+def suggest(text: str, limit: int = DEFAULT_LIMIT, types: Optional[Iterable[str]] = None,
+            user=None) -> List[Dict]:
+    """
+    Top `limit` names/titles similar to text across the given result types
+    (default: all the user may search), best match first
+    """
+    text, limit, types = prepare(text, limit, types, user)
+    if not text:
+        return []
+    candidates, _ = fetch_candidates(text, types)
+    return top(candidates, limit)
@@ -0,0 +1,114 @@
+"""
+Per-user prefix-refinement cache for typeahead
+Each user has a small LRU list of recent typeahead texts with their candidate
+rows. A repeated text is a hit; a text extending a cached prefix whose
+candidate list was complete ("pr" -> "pro" -> "proj") is answered by
+filtering those candidates in memory (a refinement); anything else queries
+the database. Refining keeps substring matches only, so with typo-tolerant
+matching a refinement that leaves fewer than `limit` suggestions also goes
+to the database, where typo matches of the longer text can be found. Model signals bump a cache generation, which drops every
+user's list at once, like the dashboard cache.
+"""
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .typeahead import DEFAULT_LIMIT, fetch_candidates, is_fuzzy, prepare, refine, top
+
+
+GENERATION_KEY = 'typeahead:generation'
+ENTRIES_KEY = 'typeahead:{generation}:{user_id}'
+STATS_KEY = 'typeahead:stats:{outcome}'
+
+OUTCOMES = ['hits', 'refinements', 'misses']
+
+
+def get_generation() -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY, time.time_ns())
+    return generation
+
+
+def invalidate_typeahead(*args, **kwargs):
+    """Drop every cached typeahead list (usable directly as a signal receiver)"""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def _increment(key: str):
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def _lookup(entries: List[Dict], text: str, types: str) -> Tuple[Optional[Dict], str]:
+    """Entry answering text and the outcome: exact hit, refinement of the longest complete prefix, or miss"""
+    prefix = None
+    for entry in entries:
+        if entry['types'] != types:
+            continue
+        if entry['text'] == text:
+            return entry, 'hits'
+        if not entry['truncated'] and text.startswith(entry['text']):
+            if prefix is None or len(entry['text']) > len(prefix['text']):
+                prefix = entry
+    if prefix is not None:
+        return prefix, 'refinements'
+    return None, 'misses'
+
+
+def cached_suggest(user, text: str, limit=DEFAULT_LIMIT,
+                   types: Optional[Iterable[str]] = None) -> Tuple[List[Dict], str]:
+    """suggest() through the user's prefix cache; returns (suggestions, outcome)"""
+    text, limit, types = prepare(text, limit, types, user)
+    if not text:
+        return [], 'skipped'
+    type_key = ','.join(types)
+
+    key = ENTRIES_KEY.format(generation=get_generation(), user_id=user.pk)
+    # Least recently used first
+    entries = cache.get(key) or []
+    entry, outcome = _lookup(entries, text, type_key)
+
+    if outcome == 'refinements':
+        refined = refine(entry['candidates'], text)
+        if len(refined) < limit and is_fuzzy():
+            outcome = 'misses'
+        else:
+            entry = {'text': text, 'types': type_key, 'candidates': refined, 'truncated': False}
+
+    if outcome == 'hits':
+        entries.remove(entry)
+    elif outcome == 'misses':
+        candidates, truncated = fetch_candidates(text, types)
+        entry = {'text': text, 'types': type_key, 'candidates': candidates, 'truncated': truncated}
+
+    entries.append(entry)
+    cache.set(key, entries[-settings.TYPEAHEAD_CACHE_ENTRIES:], timeout=settings.TYPEAHEAD_CACHE_TIMEOUT)
+    _increment(STATS_KEY.format(outcome=outcome))
+    return top(entry['candidates'], limit), outcome
+
+
+def cache_stats() -> Dict:
+    """Hit, refinement and miss counters; hit_ratio counts refinements as hits"""
+    values = cache.get_many([STATS_KEY.format(outcome=outcome) for outcome in OUTCOMES])
+    stats = {outcome: values.get(STATS_KEY.format(outcome=outcome), 0) for outcome in OUTCOMES}
+    requests = sum(stats.values())
+    return {
+        **stats,
+        'requests': requests,
+        'hit_ratio': round((stats['hits'] + stats['refinements']) / requests, 4) if requests else 0,
+        'generation': get_generation(),
+    }
+
+
+def reset_cache_stats():
+    cache.delete_many([STATS_KEY.format(outcome=outcome) for outcome in OUTCOMES])
@@ -11,5 +11,7 @@ urlpatterns = [
     path('recent-work/', views.user_recent_work_view, name='user_recent_work'),
     path('projects/', views.user_projects_view, name='user_projects'),
     path('search/', views.global_search_view, name='global_search'),
+    path('search/typeahead/', views.typeahead_view, name='search_typeahead'),
+    path('search/typeahead/cache-stats/', views.typeahead_cache_stats_view, name='search_typeahead_cache_stats'),
 ]
 
@@ -472,20 +472,41 @@ def user_projects_view(request):
         )
 
 
+# Result icons per search document type (status-specific icons in _search_icon)
+SEARCH_ICONS = {
+    'project': '📁',
+    'task': '📋',
+    'sprint_task': '🚀',
+    'sprint': '🏃',
+    'employee': '👤',
+    'team': '👥',
+    'client': '🏢',
+    'lead': '🎯',
+    'ticket': '🎫',
+    'invoice': '🧾',
+}
+
+
+def _search_icon(doc_type: str, status_value: str) -> str:
+    if doc_type == 'task' and status_value == 'completed':
+        return '✓'
+    if doc_type == 'sprint_task' and status_value == 'done':
+        return '✅'
+    return SEARCH_ICONS.get(doc_type, '🔍')
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def global_search_view(request):
-    """Global search across all resources with auto-suggestions"""
+    """
+    Global search across all resources with auto-suggestions, best matches first
+    One query over the unified search documents, filtered to what the user may see.
+    With group=type the best `limit` matches of every type are returned instead
+    (fetched concurrently when SEARCH_CONCURRENT is set); types slower than
+    SEARCH_TYPE_TIMEOUT_MS are listed in `timed_out` and left out.
+    """
     try:
-        from django.db.models import Q
-        from tasks.models import Task
-        from sprint.models import SprintTask, Sprint
-        from employee.models import Employee
-        from projects.models import Project
-        try:
-            from teams.models import Team
-        except ImportError:
-            Team = None
+        from .search import DOCUMENT_TYPES, search_documents, search_documents_by_type
         
         query = request.query_params.get('q', '').strip()
         limit = int(request.query_params.get('limit', 10))
@@ -497,145 +518,46 @@ def global_search_view(request):
                 'count': 0
             }, status=status.HTTP_200_OK)
         
-        user = request.user
-        
-        # Get employee record
-        employee = None
-        try:
-            employee = Employee.objects.get(user=user)
-        except Employee.DoesNotExist:
-            pass
-        
-        results = {
-            'projects': [],
-            'tasks': [],
-            'sprint_tasks': [],
-            'sprints': [],
-            'employees': [],
-            'teams': [],
-        }
-        
-        # Search Projects
-        projects = Project.objects.filter(
-            Q(title__icontains=query) | Q(description__icontains=query)
-        ).order_by('-id')[:limit]
-        for project in projects:
-            results['projects'].append({
-                'id': project.id,
-                'type': 'project',
-                'title': project.title,
-                'description': project.description[:100] if project.description else '',
-                'status': project.status,
-                'icon': '📁',
-            })
-        
-        # Search Tasks (assigned to current user's employee)
-        if employee:
-            tasks = Task.objects.filter(
-                Q(task_name__icontains=query) | Q(description__icontains=query),
-                assigned_to=employee
-            ).select_related('project').order_by('-created_at')[:limit]
-            for task in tasks:
-                results['tasks'].append({
-                    'id': task.id,
-                    'type': 'task',
-                    'title': task.task_name,
-                    'description': task.description[:100] if task.description else '',
-                    'status': task.status,
-                    'project': task.project.title if task.project else None,
-                    'icon': '✓' if task.status == 'completed' else '📋',
-                })
-        
-        # Search Sprint Tasks
-        sprint_tasks = SprintTask.objects.filter(
-            Q(title__icontains=query) | Q(description__icontains=query),
-            assigned_to=user
-        ).select_related('sprint', 'sprint__project').order_by('-created_at')[:limit]
-        for task in sprint_tasks:
-            project_name = None
-            if task.sprint and task.sprint.project:
-                project_name = task.sprint.project.title
-            results['sprint_tasks'].append({
-                'id': task.id,
-                'type': 'sprint_task',
-                'title': task.title,
-                'description': task.description[:100] if task.description else '',
-                'status': task.status,
-                'sprint': task.sprint.name if task.sprint else None,
-                'project': project_name,
-                'icon': '✅' if task.status == 'done' else '🚀',
-            })
-        
-        # Search Sprints
-        sprints = Sprint.objects.filter(
-            Q(name__icontains=query) | Q(description__icontains=query)
-        ).select_related('project').order_by('-created_at')[:limit]
-        for sprint in sprints:
-            results['sprints'].append({
-                'id': sprint.id,
-                'type': 'sprint',
-                'title': sprint.name,
-                'description': sprint.description[:100] if sprint.description else '',
-                'status': sprint.status,
-                'project': sprint.project.title if sprint.project else None,
-                'icon': '🏃',
-            })
-        
-        # Search Employees (only names, limited to 5)
-        employees = Employee.objects.filter(
-            Q(name__icontains=query) | Q(department__icontains=query) | Q(designation__icontains=query)
-        ).select_related('user')[:5]
-        for emp in employees:
-            results['employees'].append({
-                'id': emp.id,
-                'type': 'employee',
-                'title': emp.name,
-                'description': f"{emp.designation or ''} • {emp.department or ''}".strip(' • '),
-                'icon': '👤',
-            })
+        timed_out = []
+        if request.query_params.get('group') == 'type':
+            documents_by_type, timed_out = search_documents_by_type(request.user, query, limit)
+            documents = sorted(
+                (document for type_documents in documents_by_type.values() for document in type_documents),
+                key=lambda document: document.rank,
+                reverse=True
+            )
+            count = sum(type_documents[0].type_matches for type_documents in documents_by_type.values() if type_documents)
+        else:
+            documents = search_documents(request.user, query, limit)
+            count = documents[0].total_matches if documents else 0
         
-        # Search Teams
-        if Team:
-            try:
-                teams = Team.objects.filter(
-                    Q(name__icontains=query) | Q(note__icontains=query)
-                )[:limit]
-                for team in teams:
-                    results['teams'].append({
-                        'id': team.id,
-                        'type': 'team',
-                        'title': team.name,
-                        'description': team.note[:100] if team.note else '',
-                        'icon': '👥',
-                    })
-            except Exception:
-                pass
-        
-        # Combine all results
         all_results = []
-        all_results.extend(results['projects'])
-        all_results.extend(results['tasks'])
-        all_results.extend(results['sprint_tasks'])
-        all_results.extend(results['sprints'])
-        all_results.extend(results['employees'])
-        if Team:
-            all_results.extend(results['teams'])
+        results = {f'{doc_type}s': [] for doc_type in DOCUMENT_TYPES}
+        by_type = {f'{doc_type}s': 0 for doc_type in DOCUMENT_TYPES}
+        for document in documents:
+            result = {
+                'id': document.object_id,
+                'type': document.doc_type,
+                'title': document.title,
+                'description': document.snippet,
+                'status': document.status,
+                **document.extra,
+                'icon': _search_icon(document.doc_type, document.status),
+                'rank': document.rank,
+            }
+            all_results.append(result)
+            results[f'{document.doc_type}s'].append(result)
+            by_type[f'{document.doc_type}s'] = document.type_matches
         
         # Generate AI-powered suggestions based on query
         suggestions = _generate_search_suggestions(query, results)
         
         return Response({
-            'results': all_results[:limit],
+            'results': all_results,
             'suggestions': suggestions,
-            'count': len(all_results),
-            'by_type': {
-                'projects': len(results['projects']),
-                'tasks': len(results['tasks']),
-                'sprint_tasks': len(results['sprint_tasks']),
-                'sprints': len(results['sprints']),
-                'employees': len(results['employees']),
-                'teams': len(results['teams']),
-            }
+            'count': count,
+            'by_type': by_type,
+            'timed_out': timed_out,
         }, status=status.HTTP_200_OK)
         
     except Exception as e:
@@ -647,6 +569,56 @@ def global_search_view(request):
         )
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def typeahead_view(request):
+    """
+    Fast, typo-tolerant name/title suggestions for the search box
+    Query params: q (at least 2 characters), limit (default 8, max 20),
+    types (comma separated subset of project, employee, sprint, team, and for staff client, lead)
+    Answers come from the user's prefix cache when possible (X-Typeahead-Cache header).
+    """
+    from .typeahead_cache import cached_suggest
+
+    try:
+        query = request.query_params.get('q', '')
+        types = [t.strip() for t in request.query_params.get('types', '').split(',') if t.strip()]
+        try:
+            results, outcome = cached_suggest(request.user, query, request.query_params.get('limit', 8), types)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = Response({
+            'results': results,
+            'count': len(results),
+        }, status=status.HTTP_200_OK)
+        response['X-Typeahead-Cache'] = {'hits': 'HIT', 'refinements': 'REFINED'}.get(outcome, 'MISS')
+        return response
+
+    except Exception as e:
+        return Response(
+            {'error': f'Failed to fetch suggestions: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def typeahead_cache_stats_view(request):
+    """Get (or reset) hit/refinement/miss counters and the hit ratio of the typeahead cache"""
+    from .typeahead_cache import cache_stats, reset_cache_stats
+
+    try:
+        if request.method == 'DELETE':
+            reset_cache_stats()
+        return Response(cache_stats(), status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response(
+            {'error': f'Error fetching cache stats: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 def _generate_search_suggestions(query: str, results: dict) -> list:
     """Generate AI-powered search suggestions based on query and results"""
     suggestions = []
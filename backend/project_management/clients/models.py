@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.contrib.auth.models import User
 
 
@@ -25,6 +26,9 @@ class Client(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['name'], name='client_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"Client({self.name})"
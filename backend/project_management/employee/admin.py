@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Address, BankDetails, Documents, Employee
+from .models import (
+    Address, BankDetails, Documents, Employee, EmployeeWorkload, ResumeParseCache, ResumeParseFile, ResumeParseJob
+)
 
 
 @admin.register(Address)
@@ -55,3 +57,34 @@ class EmployeeAdmin(admin.ModelAdmin):
         return obj.user.email if obj.user else '-'
     
     email.short_description = 'Email'
+
+
+@admin.register(EmployeeWorkload)
+class EmployeeWorkloadAdmin(admin.ModelAdmin):
+    list_display = ['employee', 'task_total', 'task_open', 'sprint_task_total', 'sprint_task_open', 'updated_at']
+    search_fields = ['employee__name']
+    readonly_fields = ['task_total', 'task_open', 'sprint_task_total', 'sprint_task_open', 'updated_at']
+
+
+class ResumeParseFileInline(admin.TabularInline):
+    model = ResumeParseFile
+    fields = ['filename', 'status', 'error', 'seconds', 'cached']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+
+@admin.register(ResumeParseJob)
+class ResumeParseJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'created_by', 'status', 'total', 'processed', 'failed', 'files_per_second', 'created_at']
+    list_filter = ['status']
+    readonly_fields = ['total', 'processed', 'failed', 'started_at', 'finished_at', 'created_at', 'updated_at']
+    inlines = [ResumeParseFileInline]
+
+
+@admin.register(ResumeParseCache)
+class ResumeParseCacheAdmin(admin.ModelAdmin):
+    list_display = ['sha256', 'parser_version', 'hits', 'created_at', 'last_used_at']
+    list_filter = ['parser_version']
+    search_fields = ['sha256']
+    readonly_fields = ['sha256', 'parser_version', 'result', 'hits', 'created_at', 'last_used_at']
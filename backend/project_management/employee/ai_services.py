@@ -4,10 +4,18 @@ Provides AI-powered insights, recommendations, and analytics
 """
 
 import os
-import re
 from typing import Dict, List
 from datetime import date, datetime, timedelta
 import requests
+from django.core.paginator import Paginator
+
+from .nl_query import compile_query, search_employees
+
+
+NL_SEARCH_FIELDS = ['id', 'name', 'department', 'designation', 'is_active', 'joining_date']
+NL_SEARCH_PAGE_SIZE = 25
+NL_SEARCH_MAX_PAGE_SIZE = 100
+
 
 class EmployeeAIService:
     """AI service for employee-related features"""
@@ -218,38 +226,42 @@ Format the response in markdown with clear sections."""
     def analyze_natural_language_query(query: str) -> Dict:
         """Parse natural language queries into structured filters"""
         try:
-            query_lower = query.lower()
-            filters = {}
-            
-            # Department detection
-            departments = ['development', 'design', 'hr', 'sales', 'marketing', 'finance', 'qa', 'support', 'it']
-            for dept in departments:
-                if dept in query_lower:
-                    filters['department'] = dept.title()
-                    break
-            
-            # Status detection
-            if 'active' in query_lower or 'working' in query_lower:
-                filters['status'] = 'active'
-            elif 'inactive' in query_lower:
-                filters['status'] = 'inactive'
-            
-            # Time-based queries
-            if 'recent' in query_lower or 'new' in query_lower or 'last month' in query_lower:
-                filters['time_range'] = 'recent'
-            if 'joined' in query_lower and 'year' in query_lower:
-                filters['time_range'] = 'year'
-            
-            # Number extraction
-            if 'top' in query_lower or 'first' in query_lower:
-                numbers = re.findall(r'\d+', query)
-                if numbers:
-                    filters['limit'] = int(numbers[0])
-            
+            compiled = compile_query(query)
+            filters = dict(compiled['filters'])
+            if compiled['limit']:
+                filters['limit'] = compiled['limit']
             return filters
             
         except Exception as e:
             return {}
+    
+    @staticmethod
+    def natural_language_search(query: str, page=1, page_size=NL_SEARCH_PAGE_SIZE) -> Dict:
+        """
+        Employees matching a natural language query, one page at a time.
+        The query is compiled to ORM filters (see nl_query.py), so the
+        database filters and pages the employees.
+        """
+        try:
+            page = max(int(page), 1)
+            page_size = min(max(int(page_size), 1), NL_SEARCH_MAX_PAGE_SIZE)
+        except (TypeError, ValueError):
+            raise ValueError('page and page_size must be integers')
+        
+        compiled, queryset = search_employees(query, NL_SEARCH_FIELDS)
+        paginator = Paginator(queryset, page_size)
+        page_obj = paginator.get_page(page)
+        return {
+            'query': query,
+            'filters': compiled['filters'],
+            'unparsed': compiled['unparsed'],
+            'count': paginator.count,
+            'page': page_obj.number,
+            'page_size': page_size,
+            'next': page_obj.next_page_number() if page_obj.has_next() else None,
+            'previous': page_obj.previous_page_number() if page_obj.has_previous() else None,
+            'results': list(page_obj),
+        }
 
 
 class DashboardAIService:
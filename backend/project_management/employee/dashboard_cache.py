@@ -0,0 +1,141 @@
+"""
+Response cache for the dashboard endpoints
+Entries are keyed by endpoint, request parameters and a cache generation.
+Model signals bump the generation, which invalidates every dashboard entry at
+once without pattern deletes, so it works with the local-memory and file
+cache backends as well as shared ones.
+"""
+import hashlib
+import json
+import time
+from functools import wraps
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.response import Response
+
+
+GENERATION_KEY = 'dashboard:generation'
+STATS_KEY = 'dashboard:stats:{endpoint}:{outcome}'
+
+# Endpoint names registered through @cached_dashboard, used for reporting stats
+CACHED_ENDPOINTS = set()
+
+
+def get_generation() -> int:
+    """Current cache generation, initialised from the clock so evictions never reuse an old value"""
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY, time.time_ns())
+    return generation
+
+
+def invalidate_dashboards(*args, **kwargs):
+    """Invalidate every cached dashboard response (usable directly as a signal receiver)"""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def _increment(key: str):
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def _has_errors(data) -> bool:
+    """True when a response body reports a failure, including per-widget ones from the batch endpoint"""
+    if not isinstance(data, dict):
+        return False
+    return bool(data.get('error') or data.get('errors'))
+
+
+def cache_key(endpoint: str, request, view_kwargs: Dict) -> str:
+    """Key from endpoint, query parameters, request body and today's date"""
+    params = {key: sorted(request.query_params.getlist(key)) for key in request.query_params}
+    payload = {
+        'params': params,
+        'kwargs': view_kwargs,
+        'body': request.data if request.method == 'POST' else None,
+        # Widgets depend on today's date (overdue, current month), so roll over at midnight
+        'date': timezone.now().date().isoformat(),
+    }
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    return f'dashboard:{get_generation()}:{endpoint}:{digest}'
+
+
+def cached_dashboard(endpoint: str):
+    """
+    Serve a dashboard view from the cache, storing successful responses
+    Responses reporting an error (e.g. a failed widget in a batch) are not stored,
+    so a transient failure is not served until the next invalidation.
+    """
+    def decorator(view_func):
+        CACHED_ENDPOINTS.add(endpoint)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key = cache_key(endpoint, request, kwargs)
+            cached = cache.get(key)
+            if cached is not None:
+                _increment(STATS_KEY.format(endpoint=endpoint, outcome='hits'))
+                response = Response(cached, status=200)
+                response['X-Dashboard-Cache'] = 'HIT'
+                return response
+
+            _increment(STATS_KEY.format(endpoint=endpoint, outcome='misses'))
+            response = view_func(request, *args, **kwargs)
+            if response.status_code == 200 and not _has_errors(response.data):
+                cache.set(key, response.data, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
+            response['X-Dashboard-Cache'] = 'MISS'
+            return response
+
+        return wrapper
+    return decorator
+
+
+def cache_stats() -> Dict:
+    """Hit/miss counters per endpoint and overall"""
+    keys = {
+        (endpoint, outcome): STATS_KEY.format(endpoint=endpoint, outcome=outcome)
+        for endpoint in CACHED_ENDPOINTS
+        for outcome in ('hits', 'misses')
+    }
+    values = cache.get_many(list(keys.values()))
+
+    endpoints = {}
+    total_hits = total_misses = 0
+    for endpoint in sorted(CACHED_ENDPOINTS):
+        hits = values.get(keys[(endpoint, 'hits')], 0)
+        misses = values.get(keys[(endpoint, 'misses')], 0)
+        total_hits += hits
+        total_misses += misses
+        endpoints[endpoint] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else 0,
+        }
+
+    requests = total_hits + total_misses
+    return {
+        'backend': settings.CACHES['default']['BACKEND'],
+        'generation': get_generation(),
+        'hits': total_hits,
+        'misses': total_misses,
+        'hit_ratio': round(total_hits / requests, 4) if requests else 0,
+        'endpoints': endpoints,
+    }
+
+
+def reset_cache_stats():
+    cache.delete_many([
+        STATS_KEY.format(endpoint=endpoint, outcome=outcome)
+        for endpoint in CACHED_ENDPOINTS
+        for outcome in ('hits', 'misses')
+    ])
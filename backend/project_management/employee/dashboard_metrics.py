@@ -0,0 +1,285 @@
+"""
+Aggregate queries for the dashboard endpoints
+Every widget is computed with a fixed number of conditional aggregates, so the
+query count does not grow with the number of projects, tasks or employees.
+Results are memoized per instance, and DashboardMetrics.for_request() shares
+one instance per request so figures used by several widgets are queried once.
+"""
+
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+from django.db.models import Count, Min, Q, Sum
+from django.utils import timezone
+
+from . import workload
+from .display_names import DisplayNameResolver
+from .models import Employee, EmployeeWorkload
+
+
+class DashboardMetrics:
+    """Reusable aggregation layer shared by the dashboard views"""
+
+    PROJECT_STATUSES = ['in_progress', 'completed', 'planning', 'paused', 'cancelled', 'not_started']
+
+    # Healthy range: 5-15 tasks per employee
+    WORKLOAD_HEALTHY_MIN = workload.HEALTHY_MIN
+    WORKLOAD_HEALTHY_MAX = workload.HEALTHY_MAX
+
+    DUE_SOON_DAYS = 7
+    DUE_LIST_LIMIT = 6
+    MANAGER_LIMIT = 5
+
+    OPEN_TASK_STATUSES = workload.TASK_OPEN_STATUSES
+
+    def __init__(self, today: Optional[date] = None, display_names: Optional[DisplayNameResolver] = None):
+        self.today = today or timezone.now().date()
+        self.display_names = display_names or DisplayNameResolver()
+        self._memo = {}
+
+    @classmethod
+    def for_request(cls, request) -> 'DashboardMetrics':
+        """Request-scoped instance so widgets built for the same request share results"""
+        http_request = getattr(request, '_request', request)
+        metrics = getattr(http_request, '_dashboard_metrics', None)
+        if metrics is None:
+            metrics = cls(display_names=DisplayNameResolver.for_request(request))
+            http_request._dashboard_metrics = metrics
+        return metrics
+
+    def _memoize(self, key, compute: Callable):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def project_summary(self) -> Dict:
+        """Status histogram, due-date buckets, totals and budget in one query"""
+        return self._memoize('project_summary', self._project_summary)
+
+    def _project_summary(self) -> Dict:
+        from projects.models import Project
+
+        due_soon = self.today + timedelta(days=self.DUE_SOON_DAYS)
+        aggregates = {
+            status: Count('id', filter=Q(status=status))
+            for status in self.PROJECT_STATUSES
+        }
+        aggregates.update({
+            'total': Count('id'),
+            'over_due': Count('id', filter=Q(end_date__lt=self.today)),
+            'due': Count('id', filter=Q(end_date__gte=self.today, end_date__lte=due_soon)),
+            'on_time': Count('id', filter=Q(end_date__gt=due_soon)),
+            'over_due_open': Count('id', filter=Q(end_date__lt=self.today, status__in=['in_progress', 'planning'])),
+            'total_budget': Sum('budget'),
+        })
+        summary = Project.objects.aggregate(**aggregates)
+        summary['total_budget'] = float(summary['total_budget'] or 0)
+        return summary
+
+    def due_projects(self) -> Dict[str, List[Dict]]:
+        """First few over due and due soon projects for display"""
+        from projects.models import Project
+
+        due_soon = self.today + timedelta(days=self.DUE_SOON_DAYS)
+        projects = Project.objects.order_by('id').values('id', 'title')
+        over_due = projects.filter(end_date__lt=self.today)[:self.DUE_LIST_LIMIT]
+        due = projects.filter(end_date__gte=self.today, end_date__lte=due_soon)[:self.DUE_LIST_LIMIT]
+        return {
+            'over_due': [{'id': p['id'], 'name': p['title']} for p in over_due],
+            'due': [{'id': p['id'], 'name': p['title']} for p in due],
+        }
+
+    def task_counts(self) -> Dict[str, int]:
+        """Total, completed and pending task counts"""
+        from tasks.models import Task
+
+        return self._memoize('task_counts', lambda: Task.objects.aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            pending=Count('id', filter=Q(status__in=self.OPEN_TASK_STATUSES)),
+        ))
+
+    def project_task_counts(self) -> Dict[int, Dict[str, int]]:
+        """Total and completed task counts per project in one grouped query"""
+        from tasks.models import Task
+
+        def compute():
+            rows = (
+                Task.objects.filter(project__isnull=False)
+                .values('project_id')
+                .annotate(total=Count('id'), completed=Count('id', filter=Q(status='completed')))
+            )
+            return {row['project_id']: {'total': row['total'], 'completed': row['completed']} for row in rows}
+
+        return self._memoize('project_task_counts', compute)
+
+    def employee_counts(self) -> Dict[str, int]:
+        """Total and active employee counts"""
+        return self._memoize('employee_counts', lambda: Employee.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(is_active=True)),
+        ))
+
+    def employee_task_counts(self) -> Dict[int, int]:
+        """Assigned task count per employee, read from the workload index"""
+        return self._memoize('employee_task_counts', lambda: dict(
+            EmployeeWorkload.objects.values_list('employee_id', 'task_total')
+        ))
+
+    def client_count(self) -> int:
+        from clients.models import Client
+
+        return self._memoize('client_count', Client.objects.count)
+
+    def workload_bands(self) -> Dict[str, int]:
+        """Count active employees per workload band from the workload index"""
+        return self._memoize('workload_bands', workload.band_counts)
+
+    @staticmethod
+    def workload_percentages(bands: Dict[str, int]) -> Dict[str, int]:
+        """Convert band counts to percentages that add up to 100"""
+        total = bands['healthy'] + bands['underutilised'] + bands['overutilised']
+        if total == 0:
+            return {'healthy': 0, 'underutilised': 0, 'overutilised': 0}
+
+        healthy_percent = round((bands['healthy'] / total) * 100)
+        underutilised_percent = round((bands['underutilised'] / total) * 100)
+        overutilised_percent = max(0, 100 - healthy_percent - underutilised_percent)
+        return {
+            'healthy': healthy_percent,
+            'underutilised': underutilised_percent,
+            'overutilised': overutilised_percent,
+        }
+
+    def project_managers(self) -> List[Dict]:
+        """Top project managers by number of assigned projects"""
+        from projects.models import Project
+
+        rows = list(
+            Project.objects.filter(assigned_to__isnull=False)
+            .values('assigned_to_id', 'assigned_to__email', 'assigned_to__username')
+            .annotate(count=Count('id'), first_project=Min('id'))
+            .order_by('first_project')
+        )
+        self.display_names.prime(row['assigned_to_id'] for row in rows)
+
+        # Group by email (unique identifier) but display name
+        project_managers = {}
+        for row in rows:
+            user_email = row['assigned_to__email'] or row['assigned_to__username']
+            if not user_email:
+                continue
+            if user_email not in project_managers:
+                project_managers[user_email] = {
+                    'name': self._manager_name(self.display_names.entry(row['assigned_to_id'])) or user_email,
+                    'count': 0
+                }
+            project_managers[user_email]['count'] += row['count']
+
+        manager_data = list(project_managers.values())
+        return sorted(manager_data, key=lambda x: x['count'], reverse=True)[:self.MANAGER_LIMIT]
+
+    @staticmethod
+    def _manager_name(entry: Optional[Dict]) -> str:
+        """Prefer Employee name, then User full name, then formatted username"""
+        if entry is None:
+            return ''
+        if entry['employee_name']:
+            return entry['employee_name']
+        if entry['full_name']:
+            return entry['full_name']
+
+        username = entry['username'] or ''
+        if '@' in username:
+            username = username.split('@')[0]
+        return username.replace('.', ' ').replace('_', ' ').title()
+
+    def financial_totals(self) -> Dict[str, float]:
+        """Paid revenue, invoiced, income and expense totals read from the monthly rollups"""
+        from finance.rollups import financial_totals
+
+        return self._memoize('financial_totals', financial_totals)
+
+    def monthly_series(self, months: int) -> List[Dict]:
+        """Monthly rollup totals, newest month first"""
+        from finance.rollups import monthly_series
+
+        return self._memoize(('monthly_series', months), lambda: monthly_series(months, self.today))
+
+    def time_series(self, source: str, days: int, granularity: str) -> List[Dict]:
+        """Created/completed series for one model, oldest period first"""
+        from .timeseries import time_series
+
+        return self._memoize(
+            ('time_series', source, days, granularity),
+            lambda: time_series(source, days, granularity, self.today)
+        )
+
+    def project_health_scores(self, ordering: str = 'score'):
+        """Stored project health scores, refreshing stale ones once per request"""
+        from projects import health
+
+        self._memoize('project_health_refresh', health.refresh_scores)
+        return health.ordered_scores(ordering)
+
+    def kanban_data(self) -> Dict:
+        """Build the complete Kanban dashboard payload"""
+        projects = self.project_summary()
+        due_projects = self.due_projects()
+        workload = self.workload_percentages(self.workload_bands())
+        finance = self.financial_totals()
+
+        # Actual Revenue: Sum of all income amounts
+        total_revenue = finance['income']
+
+        # Planned Revenue: Sum of all invoice amounts, falling back to project budgets
+        planned_revenue = finance['invoiced'] or projects['total_budget']
+        if planned_revenue == 0 and total_revenue > 0:
+            # Estimate: Assume 20% growth target
+            planned_revenue = total_revenue * 1.20
+
+        # Actual Cost: Sum of all expense amounts
+        total_cost = finance['cost']
+        if total_cost > 0:
+            # Plan for 10% increase over actual expenses
+            planned_cost = total_cost * 1.10
+        else:
+            # Estimate cost as 25% of revenue (standard business ratio)
+            planned_cost = planned_revenue * 0.25
+
+        # Planned projects: complete current projects + add 50% more
+        open_projects = projects['in_progress'] + projects['planning'] + projects['not_started']
+        planned_projects = int(open_projects * 1.5) + projects['completed'] if projects['total'] else 0
+
+        return {
+            'project_status': {status: projects[status] for status in self.PROJECT_STATUSES},
+            'project_due_date': {
+                'on_time': projects['on_time'],
+                'due': projects['due'],
+                'over_due': projects['over_due'],
+                # Over due first, then due soon
+                'due_projects': (due_projects['over_due'] + due_projects['due'])[:6],
+                'over_due_projects': due_projects['over_due'][:3],
+                'due_soon_projects': due_projects['due'][:3]
+            },
+            'workload': workload,
+            'project_managers': self.project_managers(),
+            'financial': {
+                'total_projects': {
+                    'actual': projects['total'],
+                    'planned': planned_projects
+                },
+                'total_revenue': {
+                    'actual': round(total_revenue, 2),
+                    'planned': round(planned_revenue, 2)
+                },
+                'total_cost': {
+                    'actual': round(total_cost, 2),
+                    'planned': round(planned_cost, 2)
+                },
+                'total_margin': {
+                    'actual': round(total_revenue - total_cost, 2),
+                    'planned': round(planned_revenue - planned_cost, 2)
+                }
+            }
+        }
@@ -0,0 +1,566 @@
+"""
+Dashboard widget builders
+Each builder returns the payload of one dashboard endpoint. Builders take the
+request-scoped DashboardMetrics, so figures shared between widgets (task
+totals, paid revenue, active employees, ...) are queried once per request
+whether a widget is served by its own endpoint or through the batch endpoint.
+"""
+from typing import Dict, List, Tuple
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Avg, Count, Max
+from django.db.models.functions import TruncMonth
+
+from finance.rollups import add_months, month_start
+from . import timeseries, workload
+from .ai_services import DashboardAIService
+from .dashboard_metrics import DashboardMetrics
+from .models import Employee
+
+
+DEFAULT_PAGE_SIZE = 10
+
+
+def _progress(counts: Dict[str, int]) -> int:
+    return int((counts['completed'] / counts['total'] * 100) if counts['total'] > 0 else 0)
+
+
+def summary(metrics: DashboardMetrics, params) -> Dict:
+    """Dashboard summary statistics"""
+    employees = metrics.employee_counts()
+    projects = metrics.project_summary()
+    tasks = metrics.task_counts()
+    return {
+        'employees': employees['total'],
+        'projects': projects['total'],
+        'ongoing_projects': projects['in_progress'],
+        'tasks': tasks['total'],
+        'completed_tasks': tasks['completed'],
+        'pending_tasks': tasks['pending'],
+        'clients': metrics.client_count(),
+        'active_employees': employees['active'],
+        'inactive_employees': employees['total'] - employees['active'],
+    }
+
+
+def project_progress(metrics: DashboardMetrics, params) -> Dict:
+    """Progress of the top 10 projects"""
+    from projects.models import Project
+
+    task_counts = metrics.project_task_counts()
+    project_progress = []
+
+    for project in Project.objects.all()[:10]:
+        counts = task_counts.get(project.id)
+        if counts:
+            # Calculate progress based on tasks
+            progress_percentage = _progress(counts)
+        elif project.start_date and project.end_date:
+            # If no tasks, calculate based on dates
+            total_days = (project.end_date - project.start_date).days
+            if total_days > 0:
+                elapsed_days = (metrics.today - project.start_date).days
+                progress_percentage = min(100, max(0, int((elapsed_days / total_days) * 100)))
+            else:
+                progress_percentage = 0
+        else:
+            progress_percentage = 0
+
+        project_progress.append({
+            'id': project.id,
+            'name': project.title,
+            'progress': progress_percentage,
+            'status': project.status,
+        })
+
+    # Sort by progress descending
+    project_progress.sort(key=lambda x: x['progress'], reverse=True)
+    return {'projects': project_progress}
+
+
+def weekly_progress(metrics: DashboardMetrics, params) -> Dict:
+    """Task completion progress over the last 7 days"""
+    series = metrics.time_series('tasks', 7, 'day')
+    return {
+        'data': [
+            {
+                'week': point['period'].strftime('%a'),  # Mon, Tue, etc.
+                'progress': point['progress']
+            }
+            for point in series
+        ]
+    }
+
+
+def time_series(metrics: DashboardMetrics, params) -> Dict:
+    """Created/completed series for tasks, sprint tasks, tickets or to-dos"""
+    source = params.get('source', 'tasks')
+    days = int(params.get('days', timeseries.DEFAULT_DAYS))
+    granularity = params.get('granularity', 'day')
+    series = metrics.time_series(source, days, granularity)
+    return {
+        'source': source,
+        'days': days,
+        'granularity': granularity,
+        'data': [{**point, 'period': point['period'].isoformat()} for point in series]
+    }
+
+
+def status_percentage(metrics: DashboardMetrics, params) -> Dict:
+    """Overall task completion percentage for the donut chart"""
+    tasks = metrics.task_counts()
+    if tasks['total'] > 0:
+        completion_percentage = int((tasks['completed'] / tasks['total']) * 100)
+    else:
+        completion_percentage = 0
+    return {
+        'completion_percentage': completion_percentage,
+        'remaining_percentage': 100 - completion_percentage,
+        'total_tasks': tasks['total'],
+        'completed_tasks': tasks['completed']
+    }
+
+
+def ai_insights(metrics: DashboardMetrics, params) -> Dict:
+    """Schedule insights for recent in-progress projects"""
+    from projects.models import Project
+
+    task_counts = metrics.project_task_counts()
+    today = metrics.today
+    insights = []
+
+    for project in Project.objects.filter(status='in_progress').order_by('-start_date')[:5]:
+        counts = task_counts.get(project.id)
+        if not counts or not project.end_date:
+            continue
+
+        progress = _progress(counts)
+        days_remaining = (project.end_date - today).days
+
+        # Estimate completion based on current progress
+        days_elapsed = (today - project.start_date).days if project.start_date else 0
+        if progress <= 0 or days_elapsed <= 0:
+            continue
+
+        rate = progress / days_elapsed
+        estimated_days_needed = (100 - progress) / rate if rate > 0 else days_remaining
+        days_ahead = days_remaining - estimated_days_needed
+
+        if days_ahead > 0:
+            insights.append({
+                'project_name': project.title,
+                'progress': progress,
+                'days_ahead': int(days_ahead),
+                'message': f"{project.title} is {progress}% complete — expected to finish {int(days_ahead)} day{'s' if days_ahead > 1 else ''} ahead."
+            })
+        elif days_ahead < -1:
+            insights.append({
+                'project_name': project.title,
+                'progress': progress,
+                'days_behind': int(abs(days_ahead)),
+                'message': f"{project.title} is {progress}% complete — may finish {int(abs(days_ahead))} day{'s' if abs(days_ahead) > 1 else ''} behind schedule."
+            })
+
+    # If no insights, provide default
+    if not insights:
+        insights.append({
+            'project_name': 'General',
+            'progress': 0,
+            'message': 'No active projects to analyze. Create projects to get AI insights.'
+        })
+
+    return {'insights': insights[:3]}
+
+
+def kanban_data(metrics: DashboardMetrics, params) -> Dict:
+    """Comprehensive Kanban dashboard data"""
+    return metrics.kanban_data()
+
+
+def _workload_data(metrics: DashboardMetrics) -> Dict[str, int]:
+    bands = metrics.workload_bands()
+    total = bands['healthy'] + bands['underutilised'] + bands['overutilised']
+    return {
+        'healthy': round((bands['healthy'] / total * 100) if total > 0 else 0),
+        'underutilised': round((bands['underutilised'] / total * 100) if total > 0 else 0),
+        'overutilised': round((bands['overutilised'] / total * 100) if total > 0 else 0)
+    }
+
+
+def employee_workload(metrics: DashboardMetrics, params) -> Dict:
+    """
+    Active employees with their indexed task counts, busiest first
+    Supports ?band=underutilised|healthy|overutilised and optional page/page_size pagination
+    """
+    employees = workload.with_workload(Employee.objects.filter(is_active=True))
+    band = params.get('band')
+    if band:
+        employees = employees.filter(workload.band_filter(band))
+    rows, page_info = _paginate(employees.order_by('-task_total', 'name'), params)
+    return {
+        'bands': _workload_data(metrics),
+        'band': band,
+        'employees': [
+            {
+                'id': employee.id,
+                'name': employee.name,
+                'department': employee.department,
+                'designation': employee.designation,
+                'task_total': employee.task_total,
+                'task_open': employee.task_open,
+                'sprint_task_total': employee.sprint_task_total,
+                'sprint_task_open': employee.sprint_task_open,
+            }
+            for employee in rows
+        ],
+        **page_info
+    }
+
+
+def _paginate(queryset, params) -> Tuple[List, Dict]:
+    """Page through a queryset when page or page_size is given, otherwise return every row"""
+    if 'page' not in params and 'page_size' not in params:
+        rows = list(queryset)
+        return rows, {'count': len(rows)}
+
+    try:
+        page = int(params.get('page', 1))
+        page_size = int(params.get('page_size', DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        page = 1
+        page_size = DEFAULT_PAGE_SIZE
+
+    paginator = Paginator(queryset, max(page_size, 1))
+    try:
+        page_obj = paginator.page(page)
+    except (EmptyPage, PageNotAnInteger):
+        page_obj = paginator.page(1)
+    return list(page_obj), {
+        'count': paginator.count,
+        'next': page_obj.next_page_number() if page_obj.has_next() else None,
+        'previous': page_obj.previous_page_number() if page_obj.has_previous() else None,
+    }
+
+
+def _health_projects(metrics: DashboardMetrics, with_status: bool = False) -> List[Dict]:
+    """Project id, title and stored health score in project order"""
+    fields = ['project_id', 'project__title', 'score'] + (['project__status'] if with_status else [])
+    rows = metrics.project_health_scores().order_by('project_id').values(*fields)
+    projects = []
+    for row in rows:
+        project = {'id': row['project_id'], 'title': row['project__title']}
+        if with_status:
+            project['status'] = row['project__status']
+        project['health_score'] = row['score']
+        projects.append(project)
+    return projects
+
+
+def ai_insights_comprehensive(metrics: DashboardMetrics, params) -> Dict:
+    """Comprehensive AI-powered dashboard insights"""
+    from django.utils import timezone
+
+    projects = metrics.project_summary()
+    projects_data = {
+        'total': projects['total'],
+        'in_progress': projects['in_progress'],
+        'completed': projects['completed'],
+        'over_due': projects['over_due_open']
+    }
+
+    totals = metrics.financial_totals()
+    financial_data = {
+        'total_revenue': totals['paid_revenue'],
+        'total_cost': totals['cost'],
+        'planned_revenue': totals['invoiced'],
+        'current_month_revenue': metrics.monthly_series(1)[0]['paid_revenue']
+    }
+
+    insights = DashboardAIService.generate_dashboard_insights(
+        projects_data, financial_data, _workload_data(metrics)
+    )
+    return {
+        'insights': insights,
+        'generated_at': timezone.now().isoformat()
+    }
+
+
+def revenue_forecast(metrics: DashboardMetrics, params) -> Dict:
+    """Revenue forecast for the next N months"""
+    months = int(params.get('months', 3))
+    return DashboardAIService.predict_revenue_forecast(metrics.financial_totals()['paid_revenue'], months)
+
+
+def project_health_scores(metrics: DashboardMetrics, params) -> Dict:
+    """
+    Health scores for all projects, lowest score first
+    Supports ?ordering=score|-score and optional page/page_size pagination
+    """
+    scores = metrics.project_health_scores(params.get('ordering', 'score'))
+    rows, page_info = _paginate(scores, params)
+    average_score = scores.aggregate(average=Avg('score'))['average']
+    return {
+        'health_scores': [
+            {
+                'project_id': row.project_id,
+                'project_name': row.project.title,
+                'score': row.score,
+                'status': row.health_status,
+                'color': row.color,
+                'factors': row.factors,
+                'recommendations': row.recommendations,
+                'computed_at': row.computed_at,
+            }
+            for row in rows
+        ],
+        'average_score': float(average_score or 0),
+        **page_info
+    }
+
+
+def anomaly_detection(metrics: DashboardMetrics, params) -> Dict:
+    """Anomalies in projects and financial data"""
+    from projects.models import Project
+
+    projects = [
+        {
+            'id': project.id,
+            'title': project.title,
+            'budget': float(project.budget),
+            # Expense model doesn't have project field
+            'spent': 0.0,
+            'end_date': project.end_date,
+            'status': project.status
+        }
+        for project in Project.objects.all()
+    ]
+
+    financial_data = {
+        'total_revenue': metrics.financial_totals()['paid_revenue'],
+        'current_month_revenue': metrics.monthly_series(1)[0]['paid_revenue']
+    }
+
+    anomalies = DashboardAIService.detect_anomalies(projects, financial_data)
+    return {
+        'anomalies': anomalies,
+        'count': len(anomalies)
+    }
+
+
+def _employee_rows(metrics: DashboardMetrics):
+    for employee in workload.with_workload(Employee.objects.filter(is_active=True)):
+        yield employee, employee.task_total
+
+
+def smart_recommendations(metrics: DashboardMetrics, params) -> Dict:
+    """Smart recommendations for resource allocation and optimization"""
+    projects = _health_projects(metrics)
+
+    employees = [
+        {
+            'id': employee.id,
+            'name': employee.name,
+            'task_count': task_count,
+            'department': employee.department,
+            'designation': employee.designation
+        }
+        for employee, task_count in _employee_rows(metrics)
+    ]
+
+    totals = metrics.financial_totals()
+    financial_data = {
+        'total_revenue': totals['paid_revenue'],
+        'total_cost': totals['cost']
+    }
+
+    recommendations = DashboardAIService.generate_smart_recommendations(
+        projects, employees, financial_data
+    )
+    return {
+        'recommendations': recommendations,
+        'count': len(recommendations)
+    }
+
+
+def risk_assessment(metrics: DashboardMetrics, params) -> Dict:
+    """
+    Risk assessment for projects and employees, highest project risk first
+    Supports ?ordering=-risk_score|risk_score and optional page/page_size pagination
+    """
+    from tasks.models import Task
+
+    scores = metrics.project_health_scores(params.get('ordering', '-risk_score'))
+    rows, page_info = _paginate(scores, params)
+
+    # Unique employees assigned to tasks of each listed project, in one query
+    team_members = {}
+    assignments = (
+        Task.objects.filter(project_id__in=[row.project_id for row in rows], assigned_to__isnull=False)
+        .values(
+            'project_id', 'assigned_to_id', 'assigned_to__name', 'assigned_to__user__email',
+            'assigned_to__designation', 'assigned_to__department'
+        )
+        .order_by('project_id', 'assigned_to_id')
+        .distinct()
+    )
+    for row in assignments:
+        team_members.setdefault(row['project_id'], []).append({
+            'id': row['assigned_to_id'],
+            'name': row['assigned_to__name'] or 'Unknown',
+            'email': row['assigned_to__user__email'],
+            'designation': row['assigned_to__designation'] or None,
+            'department': row['assigned_to__department'] or None,
+        })
+
+    project_risks = [
+        {
+            'project_id': row.project_id,
+            'project_name': row.project.title,
+            'risk_score': row.risk_score,
+            'risk_level': row.risk_level,
+            'factors': row.factors,
+            'assigned_team_members': team_members.get(row.project_id, []),
+        }
+        for row in rows
+    ]
+
+    employees = []
+    for employee, task_count in _employee_rows(metrics):
+        # Calculate tenure
+        tenure_days = (metrics.today - employee.joining_date).days if employee.joining_date else 0
+        employees.append({
+            'id': employee.id,
+            'name': employee.name,
+            'task_count': task_count,
+            'department': employee.department,
+            'designation': employee.designation,
+            'is_active': employee.is_active,
+            'tenure_days': tenure_days
+        })
+    employee_risks = DashboardAIService.calculate_risk_scores([], employees)['employee_risks']
+
+    highest_risk = scores.aggregate(highest=Max('risk_score'))['highest'] or 0
+    return {
+        'project_risks': project_risks,
+        'employee_risks': employee_risks,
+        'overall_risk': 'high' if highest_risk > 70 else 'medium' if highest_risk > 40 else 'low',
+        **page_info
+    }
+
+
+def trend_predictions(metrics: DashboardMetrics, params) -> Dict:
+    """Trend predictions for revenue, projects and costs"""
+    from projects.models import Project
+
+    months = int(params.get('months', 6))
+
+    # Get actual total revenue and cost from all time
+    totals = metrics.financial_totals()
+    total_revenue = totals['paid_revenue']
+    total_cost = totals['cost']
+
+    # Get financial data (last 12 months) for trend analysis
+    financial_data = [
+        {'revenue': month['paid_revenue'], 'cost': month['cost']}
+        for month in metrics.monthly_series(12)
+    ]
+
+    # If no monthly data, use average of total revenue/cost
+    if all(d['revenue'] == 0 for d in financial_data) and total_revenue > 0:
+        for d in financial_data:
+            d['revenue'] = total_revenue / 12
+
+    if all(d['cost'] == 0 for d in financial_data) and total_cost > 0:
+        for d in financial_data:
+            d['cost'] = total_cost / 12
+
+    project_data = list(Project.objects.values('id', 'title', 'status'))
+
+    return DashboardAIService.generate_trend_predictions(
+        financial_data, project_data, months
+    )
+
+
+def performance_benchmark(metrics: DashboardMetrics, params) -> Dict:
+    """Performance benchmarks comparing current vs historical"""
+    from projects.models import Project
+
+    # Revenue for the current month and the 6 months before it
+    series = metrics.monthly_series(7)
+
+    # Completed projects per month over the same window in one grouped query
+    completed_by_month = {
+        month_start(row['month']): row['count']
+        for row in Project.objects.filter(
+            status='completed',
+            end_date__gte=series[-1]['month'],
+            end_date__lt=add_months(series[0]['month'], 1)
+        ).annotate(month=TruncMonth('end_date')).values('month').annotate(count=Count('id'))
+    }
+
+    current_data = {
+        'revenue': series[0]['paid_revenue'],
+        'completed_projects': completed_by_month.get(series[0]['month'], 0)
+    }
+
+    # Historical data (last 6 months, excluding current month)
+    historical_data = [
+        {
+            'revenue': month['paid_revenue'],
+            'completed_projects': completed_by_month.get(month['month'], 0)
+        }
+        for month in series[1:]
+    ]
+
+    # If no historical data, use total averages as fallback
+    if all(d['revenue'] == 0 for d in historical_data):
+        total_revenue = metrics.financial_totals()['paid_revenue']
+        if total_revenue > 0:
+            for d in historical_data:
+                d['revenue'] = total_revenue
+
+    if all(d['completed_projects'] == 0 for d in historical_data):
+        total_completed = metrics.project_summary()['completed']
+        if total_completed > 0:
+            for d in historical_data:
+                d['completed_projects'] = total_completed
+
+    return DashboardAIService.benchmark_performance(current_data, historical_data)
+
+
+def natural_language_query(metrics: DashboardMetrics, params) -> Dict:
+    """Answer a natural language query about the dashboard data"""
+    query = params.get('query', '')
+    if not query:
+        raise ValueError('Query is required')
+
+    projects = _health_projects(metrics, with_status=True)
+
+    available_data = {
+        'current_revenue': metrics.financial_totals()['paid_revenue'],
+        'projects': projects,
+        'workload': _workload_data(metrics)
+    }
+    return DashboardAIService.process_natural_language_query(query, available_data)
+
+
+# Widget name -> builder, shared by the single endpoints and the batch endpoint
+WIDGETS = {
+    'summary': summary,
+    'project_progress': project_progress,
+    'weekly_progress': weekly_progress,
+    'time_series': time_series,
+    'status_percentage': status_percentage,
+    'ai_insights': ai_insights,
+    'kanban_data': kanban_data,
+    'employee_workload': employee_workload,
+    'ai_insights_comprehensive': ai_insights_comprehensive,
+    'revenue_forecast': revenue_forecast,
+    'project_health_scores': project_health_scores,
+    'anomaly_detection': anomaly_detection,
+    'smart_recommendations': smart_recommendations,
+    'risk_assessment': risk_assessment,
+    'trend_predictions': trend_predictions,
+    'performance_benchmark': performance_benchmark,
+    'natural_language_query': natural_language_query,
+}
@@ -0,0 +1,129 @@
+"""
+Display names for users
+DisplayNameResolver loads the Employee name, full name and username of many
+users with one query, memoizes them for the request and shares them between
+requests through the cache. Employee and User saves delete the cached entry.
+Serializers get a resolver from their context with resolver_for() and list
+serializers prime it for every row up front (DisplayNameListSerializer), so
+listing N people costs one query instead of N.
+"""
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.db import models
+from rest_framework import serializers
+
+
+CACHE_KEY = 'display_name:{user_id}'
+
+
+def _cache_key(user_id) -> str:
+    return CACHE_KEY.format(user_id=user_id)
+
+
+def invalidate_display_name(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+def _user_id(user) -> Optional[int]:
+    return getattr(user, 'pk', user)
+
+
+class DisplayNameResolver:
+    """Batch loader for user display names and employee projections"""
+
+    def __init__(self):
+        self._entries = {}
+
+    @classmethod
+    def for_request(cls, request) -> 'DisplayNameResolver':
+        """Request-scoped instance so every serializer in a response shares one memo"""
+        http_request = getattr(request, '_request', request)
+        resolver = getattr(http_request, '_display_names', None)
+        if resolver is None:
+            resolver = cls()
+            http_request._display_names = resolver
+        return resolver
+
+    def prime(self, users: Iterable):
+        """Load entries for users (or user ids): memo first, then cache, then one query"""
+        missing = {_user_id(user) for user in users if user is not None} - set(self._entries)
+        missing.discard(None)
+        if not missing:
+            return
+
+        cached = cache.get_many([_cache_key(user_id) for user_id in missing])
+        for user_id in list(missing):
+            entry = cached.get(_cache_key(user_id))
+            if entry is not None:
+                self._entries[user_id] = entry
+                missing.discard(user_id)
+        if not missing:
+            return
+
+        rows = User.objects.filter(id__in=missing).values(
+            'id', 'username', 'first_name', 'last_name',
+            'employee_profile__id', 'employee_profile__name',
+        )
+        loaded = {}
+        for row in rows:
+            loaded[row['id']] = {
+                'username': row['username'],
+                'full_name': f"{row['first_name']} {row['last_name']}".strip(),
+                'employee_id': row['employee_profile__id'],
+                'employee_name': row['employee_profile__name'],
+            }
+        self._entries.update(loaded)
+        cache.set_many(
+            {_cache_key(user_id): entry for user_id, entry in loaded.items()},
+            timeout=settings.DISPLAY_NAME_CACHE_TIMEOUT
+        )
+
+    def entry(self, user) -> Optional[Dict]:
+        user_id = _user_id(user)
+        if user_id is None:
+            return None
+        if user_id not in self._entries:
+            self.prime([user_id])
+        return self._entries.get(user_id)
+
+    def name(self, user) -> str:
+        """Employee name, then the user's full name, then the username"""
+        entry = self.entry(user)
+        if entry is None:
+            return ''
+        return entry['employee_name'] or entry['full_name'] or entry['username']
+
+    def employee(self, user) -> Optional[Dict]:
+        """{'id', 'name'} of the user's employee profile, if any"""
+        entry = self.entry(user)
+        if entry is None or entry['employee_id'] is None:
+            return None
+        return {'id': entry['employee_id'], 'name': entry['employee_name']}
+
+
+def resolver_for(serializer) -> DisplayNameResolver:
+    """Resolver shared through the root serializer's context (request-scoped when possible)"""
+    context = serializer.context
+    if 'display_names' not in context:
+        request = context.get('request')
+        context['display_names'] = DisplayNameResolver.for_request(request) if request else DisplayNameResolver()
+    return context['display_names']
+
+
+class DisplayNameListSerializer(serializers.ListSerializer):
+    """
+    Primes the display name resolver for every row before serializing them.
+    The child serializer lists the attributes holding user ids in
+    Meta.display_name_fields (e.g. ['id'] for User, ['assigned_to_id'] for tasks).
+    """
+
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        fields = getattr(self.child.Meta, 'display_name_fields', ['id'])
+        resolver_for(self).prime(
+            getattr(row, field) for row in rows for field in fields
+        )
+        return super().to_representation(rows)
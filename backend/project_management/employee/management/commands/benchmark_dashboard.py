@@ -0,0 +1,146 @@
+"""
+Django management command to benchmark the dashboard aggregates
+Seeds synthetic employees, projects and tasks at increasing sizes inside a
+rolled back transaction and reports the query count and time for each size.
+Run with: python manage.py benchmark_dashboard --sizes 10,100,1000
+"""
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from employee.dashboard_metrics import DashboardMetrics
+from employee.models import Employee
+from employee.workload import rebuild_workloads
+
+
+# Seeded ids are the run number (6 digits) and the row number (7 digits)
+MAX_EMPLOYEES = 10 ** 7 - 1
+
+
+def seeded_id(kind: str, run: int, i: int) -> str:
+    """
+    Unique id for a seeded PAN/Aadhaar number; the leading letter keeps it
+    apart from real numbers (PAN has 5 letters, Aadhaar 12 digits)
+    """
+    return f'{kind}{run:06d}{i:07d}'
+
+
+class Command(BaseCommand):
+    help = 'Show that dashboard query count stays constant as the employee/project tables grow'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            default='10,100,1000',
+            help='Comma separated number of employees to seed for each run',
+        )
+        parser.add_argument(
+            '--tasks-per-employee',
+            type=int,
+            default=8,
+            help='Tasks assigned to each seeded employee',
+        )
+        parser.add_argument(
+            '--projects-per-employee',
+            type=float,
+            default=0.5,
+            help='Projects seeded per employee',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError('--sizes must be a comma separated list of integers')
+        if any(size < 1 or size > MAX_EMPLOYEES for size in sizes):
+            raise CommandError(f'--sizes must be between 1 and {MAX_EMPLOYEES}')
+
+        results = []
+        for size in sizes:
+            with transaction.atomic():
+                self._seed(size, options['tasks_per_employee'], options['projects_per_employee'])
+
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    DashboardMetrics().kanban_data()
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+
+                results.append((size, len(queries.captured_queries), elapsed_ms))
+                transaction.set_rollback(True)
+
+        self.stdout.write(f"{'employees':>10} {'queries':>8} {'time (ms)':>10}")
+        for size, query_count, elapsed_ms in results:
+            self.stdout.write(f'{size:>10} {query_count:>8} {elapsed_ms:>10.1f}')
+
+        if len({query_count for _, query_count, _ in results}) == 1:
+            self.stdout.write(self.style.SUCCESS('Query count is constant across all sizes.'))
+        else:
+            self.stdout.write(self.style.WARNING('Query count changed with table size.'))
+
+    def _seed(self, employee_count, tasks_per_employee, projects_per_employee):
+        from projects.models import Project
+        from tasks.models import Task
+
+        today = timezone.now().date()
+        run = random.randrange(10 ** 6)
+        prefix = f'bench{run:06d}'
+        for field_name in ('pan_no', 'aadhar_no'):
+            max_length = Employee._meta.get_field(field_name).max_length
+            if len(seeded_id('B', run, employee_count)) > max_length:
+                raise CommandError(f'Seeded ids do not fit Employee.{field_name} ({max_length} characters)')
+
+        users = User.objects.bulk_create([
+            User(username=f'{prefix}_{i}', email=f'{prefix}_{i}@example.com')
+            for i in range(employee_count)
+        ])
+        employees = Employee.objects.bulk_create([
+            Employee(
+                user=user,
+                name=f'Benchmark Employee {i}',
+                father_name='Benchmark',
+                contact_no='0000000000',
+                gender='Others',
+                pan_no=seeded_id('B', run, i),
+                aadhar_no=seeded_id('A', run, i),
+                joining_date=today,
+                basic_salary=0,
+            )
+            for i, user in enumerate(users)
+        ])
+
+        statuses = DashboardMetrics.PROJECT_STATUSES
+        project_count = max(1, int(employee_count * projects_per_employee))
+        projects = Project.objects.bulk_create([
+            Project(
+                title=f'Benchmark Project {i}',
+                description='',
+                start_date=today - timedelta(days=30),
+                end_date=today + timedelta(days=(i % 30) - 10),
+                status=statuses[i % len(statuses)],
+                assigned_to=users[i % len(users)],
+                budget=1000,
+            )
+            for i in range(project_count)
+        ])
+
+        tasks = []
+        for i, employee in enumerate(employees):
+            for j in range(tasks_per_employee + (i % 12) - 6):
+                tasks.append(Task(
+                    task_name=f'Benchmark Task {i}-{j}',
+                    project=projects[(i + j) % len(projects)],
+                    assigned_to=employee,
+                    status='completed' if j % 3 == 0 else 'todo',
+                    start_date=today,
+                    end_date=today,
+                ))
+        Task.objects.bulk_create(tasks, batch_size=1000)
+
+        # bulk_create skips the signals that maintain the workload index
+        rebuild_workloads()
@@ -0,0 +1,61 @@
+"""
+Management command running the batch resume parsing worker
+Claims pending ResumeParseJobs and parses their files in a pool of
+RESUME_PARSE_WORKERS processes (see employee/resume_jobs.py). Run it next to
+the web process; --once parses what is queued and exits.
+Usage: python manage.py process_resume_jobs [--once] [--workers 4] [--sleep 2]
+"""
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from employee.resume_jobs import claim_job, new_pool, run_job
+
+
+class Command(BaseCommand):
+    help = 'Parse queued batch resume jobs in a process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process the queued jobs and exit')
+        parser.add_argument('--workers', type=int, default=settings.RESUME_PARSE_WORKERS,
+                            help='Parser processes')
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help='Seconds to wait when no job is queued')
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        if workers < 1:
+            raise CommandError('--workers must be positive')
+
+        executor = new_pool(workers)
+        jobs = 0
+        try:
+            while True:
+                job = claim_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+                    continue
+                while True:
+                    try:
+                        job = run_job(job, executor, workers)
+                        break
+                    except BrokenProcessPool:
+                        # A parser process died (the file it had is marked failed); carry on with a fresh pool
+                        self.stderr.write(self.style.WARNING(f'Parser pool crashed on job {job.id}; restarting it.'))
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        executor = new_pool(workers)
+                jobs += 1
+                self.stdout.write(
+                    f'Job {job.id}: {job.processed}/{job.total} file(s), {job.failed} failed, '
+                    f'{job.files_per_second} files/s'
+                )
+        except KeyboardInterrupt:
+            pass
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        self.stdout.write(self.style.SUCCESS(f'Successfully processed {jobs} resume job(s).'))
@@ -0,0 +1,16 @@
+"""
+Management command to rebuild the employee workload index from tasks and sprint tasks
+Usage: python manage.py rebuild_workload_index
+"""
+from django.core.management.base import BaseCommand
+from employee.workload import rebuild_workloads
+
+
+class Command(BaseCommand):
+    help = 'Recompute EmployeeWorkload rows from all tasks and sprint tasks'
+
+    def handle(self, *args, **options):
+        employees = rebuild_workloads()
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt workload index for {employees} employee(s).')
+        )
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+TASK_OPEN_STATUSES = ['todo', 'in_progress', 'review', 'testing']
+SPRINT_TASK_OPEN_STATUSES = ['todo', 'pending', 'in_progress', 'in_review']
+
+
+def backfill_workloads(apps, schema_editor):
+    Employee = apps.get_model('employee', 'Employee')
+    EmployeeWorkload = apps.get_model('employee', 'EmployeeWorkload')
+    Task = apps.get_model('tasks', 'Task')
+    SprintTask = apps.get_model('sprint', 'SprintTask')
+
+    counts = {}
+    for row in (
+        Task.objects.filter(assigned_to__isnull=False)
+        .values('assigned_to_id')
+        .annotate(total=Count('id'), open=Count('id', filter=Q(status__in=TASK_OPEN_STATUSES)))
+    ):
+        counts.setdefault(row['assigned_to_id'], {}).update(task_total=row['total'], task_open=row['open'])
+
+    for row in (
+        SprintTask.objects.filter(assigned_to__employee_profile__isnull=False)
+        .values('assigned_to__employee_profile__id')
+        .annotate(total=Count('id'), open=Count('id', filter=Q(status__in=SPRINT_TASK_OPEN_STATUSES)))
+    ):
+        counts.setdefault(row['assigned_to__employee_profile__id'], {}).update(
+            sprint_task_total=row['total'], sprint_task_open=row['open']
+        )
+
+    EmployeeWorkload.objects.bulk_create([
+        EmployeeWorkload(employee_id=employee_id, **counts.get(employee_id, {}))
+        for employee_id in Employee.objects.values_list('id', flat=True)
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0006_userprofile'),
+        ('sprint', '0003_sprint_task_counters'),
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeWorkload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_total', models.IntegerField(default=0)),
+                ('task_open', models.IntegerField(default=0)),
+                ('sprint_task_total', models.IntegerField(default=0)),
+                ('sprint_task_open', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='workload', to='employee.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task_total'], name='employee_em_task_to_225406_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_workloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0010_resume_parse_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeparsefile',
+            name='cached',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='ResumeParseCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64)),
+                ('parser_version', models.CharField(max_length=20)),
+                ('result', models.JSONField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('sha256', 'parser_version'), name='resume_parse_cache_key')],
+            },
+        ),
+    ]
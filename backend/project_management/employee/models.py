@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 class Department(models.Model):
@@ -103,6 +106,15 @@ class Employee(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['name'], name='employee_name_trgm', opclasses=['gin_trgm_ops']),
+            # Natural language search: department__iexact compares UPPER(department),
+            # designation__iregex (~*) is served by the trigram index
+            models.Index(Upper('department'), name='employee_department_upper'),
+            GinIndex(fields=['designation'], name='employee_designation_trgm', opclasses=['gin_trgm_ops']),
+            models.Index(fields=['is_active', 'joining_date'], name='employee_active_joined_idx'),
+            models.Index(fields=['joining_date'], name='employee_joining_date_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -118,3 +130,103 @@ class UserProfile(models.Model):
 
     def __str__(self):
         return f"Profile of {self.user.username}"
+
+
+class EmployeeWorkload(models.Model):
+    """Task and sprint task counts per employee, maintained by signals (see workload.py)."""
+    employee = models.OneToOneField(Employee, on_delete=models.CASCADE, related_name='workload')
+    task_total = models.IntegerField(default=0)
+    task_open = models.IntegerField(default=0)
+    sprint_task_total = models.IntegerField(default=0)
+    sprint_task_open = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['task_total']),
+        ]
+
+    def __str__(self):
+        return f"Workload of {self.employee.name}"
+
+
+class ResumeParseJob(models.Model):
+    """A batch of resumes parsed by the process_resume_jobs worker (see resume_jobs.py)."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+    ]
+
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='resume_parse_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'updated_at']),
+        ]
+
+    @property
+    def files_per_second(self) -> float:
+        """Throughput since the worker started the job"""
+        if not self.started_at or not self.processed:
+            return 0.0
+        seconds = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        return round(self.processed / seconds, 2) if seconds > 0 else 0.0
+
+    def __str__(self):
+        return f"Resume job {self.id}: {self.processed}/{self.total} ({self.status})"
+
+
+class ResumeParseFile(models.Model):
+    """One resume of a ResumeParseJob; the upload is deleted once it is parsed."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    job = models.ForeignKey(ResumeParseJob, on_delete=models.CASCADE, related_name='files')
+    filename = models.CharField(max_length=255)
+    upload = models.FileField(upload_to='resume_jobs/%Y/%m/%d/', blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    seconds = models.FloatField(null=True, blank=True)
+    # Result came from ResumeParseCache
+    cached = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['job', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.status})"
+
+
+class ResumeParseCache(models.Model):
+    """Parse results by SHA-256 of the file and parser version, least recently used evicted (see resume_cache.py)."""
+    sha256 = models.CharField(max_length=64)
+    parser_version = models.CharField(max_length=20)
+    result = models.JSONField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['sha256', 'parser_version'], name='resume_parse_cache_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} (parser {self.parser_version}, {self.hits} hits)"
@@ -0,0 +1,242 @@
+"""
+Natural language employee search
+compile_query() turns a phrase such as "active backend developers in
+Development who joined after 2023" into one Django Q over indexed Employee
+columns: department (case-insensitive equality on UPPER(department)),
+designation (case-insensitive ~* matches, which the pg_trgm index serves),
+is_active and joining_date. The database filters and pages the rows, so no
+employee list is loaded into Python. An explicit "in <X> department" names
+the department even when another department name appears first: in "qa
+engineers in it department" the department is IT and "qa" is part of the
+role.
+"""
+import re
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from django.db.models import Q
+
+from .models import Department, Designation, Employee
+
+
+# Fallback department names when the Department table is empty
+DEFAULT_DEPARTMENTS = ['development', 'design', 'hr', 'sales', 'marketing', 'finance', 'qa', 'support', 'it']
+
+# Words matched against designation even when no Designation title contains them
+ROLE_WORDS = {
+    'backend', 'frontend', 'fullstack', 'developer', 'engineer', 'designer', 'manager',
+    'lead', 'intern', 'tester', 'analyst', 'architect', 'devops', 'consultant',
+    'executive', 'trainee', 'administrator', 'accountant', 'recruiter', 'director',
+}
+
+ACTIVE_WORDS = {'active', 'current', 'working'}
+INACTIVE_WORDS = {'inactive', 'former', 'left', 'exited', 'terminated'}
+
+NEWEST_WORDS = {'newest', 'latest', 'recent', 'recently', 'new'}
+OLDEST_WORDS = {'oldest', 'earliest', 'longest'}
+
+# Words joining filters together; never reported as unparsed
+STOP_WORDS = {
+    'a', 'all', 'an', 'and', 'any', 'are', 'by', 'department', 'dept', 'employee',
+    'employees', 'find', 'for', 'from', 'get', 'hired', 'in', 'is', 'joined', 'list',
+    'me', 'member', 'members', 'of', 'on', 'people', 'person', 'serving', 'show',
+    'staff', 'started', 'team', 'that', 'the', 'their', 'those', 'who', 'with', 'it',
+}
+
+UNIT_DAYS = {'day': 1, 'week': 7, 'month': 30, 'year': 365}
+
+# "recent" / "new" without an explicit period means the last month
+RECENT_DAYS = 30
+
+DEFAULT_ORDERING = ['-created_at', '-id']
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+DATE_RE = re.compile(r'\b(after|since|before|in|during)\s+(\d{4})(?:-(\d{2})-(\d{2}))?\b')
+PERIOD_RE = re.compile(r'\b(?:last|past|previous)\s+(\d+\s+)?(day|week|month|year)s?\b')
+LIMIT_RE = re.compile(r'\b(top|first|latest|newest|oldest)\s+(\d+)\b')
+
+
+def singular(word: str) -> str:
+    if len(word) > 3 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def _vocabulary() -> Dict:
+    """Department names (lowercase -> title) and designation words known to the database; both tables are small"""
+    departments = {title.lower(): title for title in Department.objects.values_list('title', flat=True)}
+    designation_words = set(ROLE_WORDS)
+    for title in Designation.objects.values_list('title', flat=True):
+        designation_words.update(singular(word) for word in WORD_RE.findall(title.lower()))
+    return {
+        'departments': departments or {name: name.upper() if len(name) <= 2 else name.title() for name in DEFAULT_DEPARTMENTS},
+        'designation_words': designation_words - STOP_WORDS,
+    }
+
+
+def _consume(text: str, match) -> str:
+    """Blank out a parsed phrase so its words are not parsed again"""
+    return text[:match.start()] + ' ' * (match.end() - match.start()) + text[match.end():]
+
+
+def _date_filter(keyword: str, year: int, month: Optional[str], day: Optional[str]):
+    """Q and a readable description for "after 2023", "before 2024-03-01", "in 2022"..."""
+    if month:
+        when = date(year, int(month), int(day))
+        lookups = {'after': 'gt', 'since': 'gte', 'before': 'lt', 'in': 'exact', 'during': 'exact'}
+        return Q(**{f'joining_date__{lookups[keyword]}': when}), f'{keyword} {when.isoformat()}'
+    if keyword == 'after':
+        return Q(joining_date__gt=date(year, 12, 31)), f'after {year}'
+    if keyword == 'since':
+        return Q(joining_date__gte=date(year, 1, 1)), f'since {year}'
+    if keyword == 'before':
+        return Q(joining_date__lt=date(year, 1, 1)), f'before {year}'
+    return Q(joining_date__range=(date(year, 1, 1), date(year, 12, 31))), f'in {year}'
+
+
+def _department_pattern(department: str) -> re.Pattern:
+    return re.compile(r'\b' + r'\s+'.join(re.escape(word) for word in department.split()) + r's?\b')
+
+
+def _explicit_department(text: str, departments: List[str]):
+    """(department, match) for an "in/of/from [the] <X> department|dept" phrase, or None"""
+    for department in departments:
+        match = re.search(
+            r'\b(?:in|of|from)\s+(?:the\s+)?' + _department_pattern(department).pattern + r'\s+(?:department|dept)\b',
+            text
+        )
+        if match:
+            return department, match
+    return None
+
+
+def compile_query(query: str, today: Optional[date] = None) -> Dict:
+    """
+    Compile a natural language query into {'q', 'ordering', 'limit',
+    'filters', 'unparsed'}: the Q to filter Employee with, the ordering,
+    an optional "top N" limit, the recognised filters (for display) and the
+    words that were ignored
+    """
+    today = today or date.today()
+    text = ' '.join(query.lower().split())
+    q = Q()
+    filters = {}
+    ordering = None
+    limit = None
+
+    match = LIMIT_RE.search(text)
+    if match:
+        limit = int(match.group(2))
+        if match.group(1) in NEWEST_WORDS:
+            ordering = ['-joining_date', '-id']
+        elif match.group(1) in OLDEST_WORDS:
+            ordering = ['joining_date', 'id']
+        text = _consume(text, match)
+
+    for match in list(DATE_RE.finditer(text)):
+        keyword, year, month, day = match.groups()
+        try:
+            date_q, description = _date_filter(keyword, int(year), month, day)
+        except ValueError:
+            continue
+        q &= date_q
+        filters.setdefault('joined', []).append(description)
+        text = _consume(text, match)
+
+    match = PERIOD_RE.search(text)
+    if match:
+        count = int(match.group(1) or 1)
+        unit = match.group(2)
+        q &= Q(joining_date__gte=today - timedelta(days=count * UNIT_DAYS[unit]))
+        filters.setdefault('joined', []).append(f"last {count} {unit}{'s' if count > 1 else ''}")
+        text = _consume(text, match)
+    elif re.search(r'\bthis\s+year\b', text):
+        q &= Q(joining_date__gte=date(today.year, 1, 1))
+        filters.setdefault('joined', []).append('this year')
+        text = re.sub(r'\bthis\s+year\b', ' ', text)
+
+    vocabulary = _vocabulary()
+    # Longest names first so "human resources" wins over "resources"
+    departments = sorted(vocabulary['departments'], key=len, reverse=True)
+    role_departments = []
+    explicit = _explicit_department(text, departments)
+    if explicit:
+        department, match = explicit
+        title = vocabulary['departments'][department]
+        q &= Q(department__iexact=title)
+        filters['department'] = title
+        text = _consume(text, match)
+        # Other department names left over describe the role ("qa engineers")
+        for name in departments:
+            pattern = _department_pattern(name)
+            if name not in STOP_WORDS and pattern.search(text):
+                role_departments.append(name)
+                text = pattern.sub(' ', text)
+        departments = []
+    for department in departments:
+        pattern = _department_pattern(department)
+        match = pattern.search(text)
+        if not match:
+            continue
+        # Role and common words ("qa engineers", "it") only name a department in context
+        context = re.search(
+            r'\b(?:in|from|of)\s+' + pattern.pattern + r'|' + pattern.pattern + r'\s+(?:department|dept|team)\b', text
+        )
+        if (department in vocabulary['designation_words'] or department in STOP_WORDS) and not context:
+            continue
+        title = vocabulary['departments'][department]
+        q &= Q(department__iexact=title)
+        filters['department'] = title
+        text = _consume(text, match)
+        break
+
+    words = WORD_RE.findall(text)
+    if INACTIVE_WORDS & set(words):
+        q &= Q(is_active=False)
+        filters['status'] = 'inactive'
+    elif ACTIVE_WORDS & set(words):
+        q &= Q(is_active=True)
+        filters['status'] = 'active'
+
+    if ordering is None:
+        if NEWEST_WORDS & set(words):
+            ordering = ['-joining_date', '-id']
+        elif OLDEST_WORDS & set(words):
+            ordering = ['joining_date', 'id']
+    if 'joined' not in filters and {'recent', 'recently', 'new'} & set(words):
+        q &= Q(joining_date__gte=today - timedelta(days=RECENT_DAYS))
+        filters['joined'] = [f'last {RECENT_DAYS} days']
+
+    designation_terms = list(role_departments)
+    unparsed = []
+    handled = ACTIVE_WORDS | INACTIVE_WORDS | NEWEST_WORDS | OLDEST_WORDS | STOP_WORDS
+    for word in words:
+        term = singular(word)
+        if term in vocabulary['designation_words']:
+            if term not in designation_terms:
+                designation_terms.append(term)
+        elif word not in handled and term not in handled:
+            unparsed.append(word)
+    for term in designation_terms:
+        q &= Q(designation__iregex=re.escape(term))
+    if designation_terms:
+        filters['designation'] = designation_terms
+
+    return {
+        'q': q,
+        'ordering': ordering or DEFAULT_ORDERING,
+        'limit': limit,
+        'filters': filters,
+        'unparsed': unparsed,
+    }
+
+
+def search_employees(query: str, fields: List[str], today: Optional[date] = None):
+    """Compiled query and the matching Employee rows as a values() queryset (not evaluated)"""
+    compiled = compile_query(query, today)
+    queryset = Employee.objects.filter(compiled['q']).order_by(*compiled['ordering']).values(*fields)
+    if compiled['limit']:
+        queryset = queryset[:compiled['limit']]
+    return compiled, queryset
@@ -0,0 +1,74 @@
+"""
+Content-hash cache of parsed resumes
+The same file is often uploaded again (retries, duplicate applications, the
+create-employee form reopened). Results are stored in ResumeParseCache under
+the SHA-256 of the file bytes and PARSER_VERSION, so a repeat upload skips
+text extraction and every extract_* call, and bumping PARSER_VERSION makes
+all older entries misses (they are deleted on the next store). Each hit
+refreshes last_used_at; past RESUME_CACHE_MAX_ENTRIES the least recently
+used entries are evicted. Failed parses are not cached, and the cache is
+best-effort: a failed cache write is logged and never fails the parse.
+"""
+import hashlib
+import logging
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ResumeParseCache
+from .resume_parser import PARSER_VERSION, parse_resume_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_cached(digest: str) -> Optional[Dict]:
+    """The cached result for a file digest, marking it recently used"""
+    entry = ResumeParseCache.objects.filter(sha256=digest, parser_version=PARSER_VERSION).values('id', 'result').first()
+    if entry is None:
+        return None
+    ResumeParseCache.objects.filter(id=entry['id']).update(hits=F('hits') + 1, last_used_at=timezone.now())
+    return entry['result']
+
+
+def evict():
+    """Drop entries of other parser versions and the least recently used beyond the limit"""
+    ResumeParseCache.objects.exclude(parser_version=PARSER_VERSION).delete()
+    excess = ResumeParseCache.objects.count() - settings.RESUME_CACHE_MAX_ENTRIES
+    if excess > 0:
+        oldest = ResumeParseCache.objects.order_by('last_used_at').values_list('id', flat=True)[:excess]
+        ResumeParseCache.objects.filter(id__in=list(oldest)).delete()
+
+
+def store(digest: str, result: Dict):
+    """Cache a successful result; errors (e.g. two workers storing the same file) are only logged"""
+    if result.get('error'):
+        return
+    try:
+        # Savepoint: a failed write must not break the caller's transaction
+        with transaction.atomic():
+            ResumeParseCache.objects.update_or_create(
+                sha256=digest,
+                parser_version=PARSER_VERSION,
+                defaults={'result': result, 'last_used_at': timezone.now()}
+            )
+        evict()
+    except DatabaseError as e:
+        logger.warning(f"Could not cache parsed resume {digest}: {e}")
+
+
+def parse_resume_cached(data: bytes, filename: str) -> Tuple[Dict, bool]:
+    """parse_resume_bytes through the cache; returns (result, whether it was cached)"""
+    digest = file_digest(data)
+    result = get_cached(digest)
+    if result is not None:
+        return result, True
+    result = parse_resume_bytes(data, filename)
+    store(digest, result)
+    return result, False
@@ -0,0 +1,207 @@
+"""
+Batch resume parsing
+parse_resume_batch_api stores the uploads (resume files, or the resumes in a
+zip) as the ResumeParseFile rows of a pending ResumeParseJob and returns the
+job at once. The process_resume_jobs worker claims jobs and parses their
+files in a ProcessPoolExecutor of RESUME_PARSE_WORKERS processes, saving
+each result and the job's progress as files complete, so clients poll the
+job for per-file results and throughput instead of holding a web worker.
+Files already in the parse cache (resume_cache.py) never reach the pool;
+the worker reads and fills the cache itself, the pool stays Django-free.
+"""
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import ResumeParseFile, ResumeParseJob
+from .resume_cache import file_digest, get_cached, store
+from .resume_parser import SUPPORTED_EXTENSIONS, timed_parse_resume_bytes
+
+
+def _max_bytes() -> int:
+    return settings.RESUME_BATCH_MAX_FILE_MB * 1024 * 1024
+
+
+def _supported(filename: str) -> bool:
+    return os.path.splitext(filename)[1].lower() in SUPPORTED_EXTENSIONS
+
+
+def collect_uploads(files: Iterable, archives: Iterable = ()) -> List[Tuple[str, Optional[bytes], str]]:
+    """
+    (filename, contents, error) for every resume uploaded directly or inside
+    a zip; unsupported or oversized files get an error instead of contents.
+    Raises ValueError for a bad zip or too many files.
+    """
+    uploads = []
+    for upload in files:
+        if not _supported(upload.name):
+            uploads.append((upload.name, None, 'Unsupported file type'))
+        elif upload.size > _max_bytes():
+            uploads.append((upload.name, None, f'Larger than {settings.RESUME_BATCH_MAX_FILE_MB} MB'))
+        else:
+            uploads.append((upload.name, upload.read(), ''))
+
+    for archive in archives:
+        try:
+            with zipfile.ZipFile(archive) as zipped:
+                for entry in zipped.infolist():
+                    name = os.path.basename(entry.filename)
+                    # Folders and the metadata macOS adds to zips are not resumes
+                    if entry.is_dir() or not name or entry.filename.startswith('__MACOSX/') or name.startswith('.'):
+                        continue
+                    if not _supported(name):
+                        uploads.append((name, None, 'Unsupported file type'))
+                    elif entry.file_size > _max_bytes():
+                        uploads.append((name, None, f'Larger than {settings.RESUME_BATCH_MAX_FILE_MB} MB'))
+                    else:
+                        uploads.append((name, zipped.read(entry), ''))
+                    if len(uploads) > settings.RESUME_BATCH_MAX_FILES:
+                        break
+        except zipfile.BadZipFile:
+            raise ValueError(f'{archive.name} is not a valid zip file')
+
+    if not uploads:
+        raise ValueError('No resume files provided')
+    if len(uploads) > settings.RESUME_BATCH_MAX_FILES:
+        raise ValueError(f'At most {settings.RESUME_BATCH_MAX_FILES} resumes per batch')
+    return uploads
+
+
+@transaction.atomic
+def create_job(user, uploads: List[Tuple[str, Optional[bytes], str]]) -> ResumeParseJob:
+    """A pending job with one file row per upload; rejected uploads are failed right away"""
+    rejected = sum(1 for _, _, error in uploads if error)
+    job = ResumeParseJob.objects.create(
+        created_by=user,
+        total=len(uploads),
+        processed=rejected,
+        failed=rejected,
+        status='pending' if rejected < len(uploads) else 'done',
+        finished_at=None if rejected < len(uploads) else timezone.now()
+    )
+    for filename, data, error in uploads:
+        item = ResumeParseFile(job=job, filename=filename[:255])
+        if error:
+            item.status = 'failed'
+            item.error = error
+            item.save()
+        else:
+            item.upload.save(filename, ContentFile(data), save=True)
+    return job
+
+
+def claim_job() -> Optional[ResumeParseJob]:
+    """The oldest pending job, or a running one whose worker stopped making progress"""
+    stale = timezone.now() - timedelta(seconds=settings.RESUME_JOB_STALE_SECONDS)
+    with transaction.atomic():
+        queryset = ResumeParseJob.objects.filter(
+            Q(status='pending') | Q(status='running', updated_at__lt=stale)
+        ).order_by('created_at')
+        if connection.features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        job = queryset.first()
+        if job is None:
+            return None
+        job.status = 'running'
+        job.started_at = job.started_at or timezone.now()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
+    return job
+
+
+def new_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    # spawn, not fork: forked children would share the parent's database connections
+    return ProcessPoolExecutor(
+        max_workers=workers or settings.RESUME_PARSE_WORKERS,
+        mp_context=multiprocessing.get_context('spawn')
+    )
+
+
+def _read(item: ResumeParseFile) -> bytes:
+    with item.upload.open('rb') as upload:
+        return upload.read()
+
+
+def _record(job: ResumeParseJob, item: ResumeParseFile, result=None, seconds=None, error: str = '',
+            cached: bool = False):
+    """Save one file's outcome, count it on the job and drop the stored upload"""
+    error = error or (result or {}).get('error') or ''
+    item.status = 'failed' if error else 'done'
+    item.result = result
+    item.error = error
+    item.seconds = round(seconds, 3) if seconds is not None else None
+    item.cached = cached
+    if item.upload:
+        item.upload.delete(save=False)
+    with transaction.atomic():
+        item.save(update_fields=['status', 'result', 'error', 'seconds', 'cached', 'upload'])
+        ResumeParseJob.objects.filter(pk=job.pk).update(
+            processed=F('processed') + 1,
+            failed=F('failed') + (1 if error else 0),
+            updated_at=timezone.now()
+        )
+
+
+def run_job(job: ResumeParseJob, executor: ProcessPoolExecutor, workers: Optional[int] = None) -> ResumeParseJob:
+    """
+    Parse the job's pending files in the pool, at most two per worker process
+    in flight so only a few uploads are held in memory. Raises BrokenProcessPool
+    (after failing the files in flight) if a parser process dies; the caller
+    starts a new pool and runs the job again for the files left.
+    """
+    pending = iter(list(job.files.filter(status='pending').order_by('id')))
+    max_in_flight = 2 * (workers or settings.RESUME_PARSE_WORKERS)
+    in_flight = {}
+    broken = None
+
+    def fill():
+        while broken is None and len(in_flight) < max_in_flight:
+            item = next(pending, None)
+            if item is None:
+                return
+            try:
+                data = _read(item)
+            except OSError as e:
+                _record(job, item, error=f'Upload unavailable: {e}')
+                continue
+            digest = file_digest(data)
+            result = get_cached(digest)
+            if result is not None:
+                _record(job, item, result, 0.0, cached=True)
+                continue
+            in_flight[executor.submit(timed_parse_resume_bytes, data, item.filename)] = (item, digest)
+
+    fill()
+    while in_flight:
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            item, digest = in_flight.pop(future)
+            try:
+                result, seconds = future.result()
+                _record(job, item, result, seconds)
+            except BrokenProcessPool as e:
+                broken = e
+                _record(job, item, error='Parser process crashed')
+            except Exception as e:
+                _record(job, item, error=f'{type(e).__name__}: {e}')
+            else:
+                store(digest, result)
+        fill()
+    if broken is not None:
+        raise broken
+
+    job.refresh_from_db()
+    if not job.files.filter(status='pending').exists():
+        job.status = 'done'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'finished_at', 'updated_at'])
+    return job
@@ -37,7 +37,10 @@ This module uses a multi-strategy approach with comprehensive edge case handling
    - Multiple phone number formats
 """
 
+import os
 import re
+import tempfile
+import time
 import pdfplumber
 from docx import Document
 import docx2txt
@@ -676,6 +679,38 @@ def parse_resume(file_path: str) -> Dict:
     return result
 
 
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+# Part of the parse cache key (see resume_cache.py): bump it whenever a change
+# here alters what parse_resume returns, and every cached result is ignored
+PARSER_VERSION = '1'
+
+
+def parse_resume_bytes(data: bytes, filename: str) -> Dict:
+    """
+    Parse resume file contents (an upload); the extension of filename picks
+    the text extractor.
+    """
+    suffix = os.path.splitext(filename)[1].lower()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_file.write(data)
+        tmp_path = tmp_file.name
+    try:
+        return parse_resume(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+
+
+def timed_parse_resume_bytes(data: bytes, filename: str) -> Tuple[Dict, float]:
+    """
+    parse_resume_bytes and the seconds it took. Runs in the batch job process
+    pool (see employee/resume_jobs.py), so this module must not import Django.
+    """
+    started = time.perf_counter()
+    result = parse_resume_bytes(data, filename)
+    return result, time.perf_counter() - started
+
+
 if __name__ == "__main__":
     # Test the parser
     import sys
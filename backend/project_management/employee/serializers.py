@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from .models import Address, BankDetails, Documents, Employee, UserProfile
+from .models import Address, BankDetails, Documents, Employee, ResumeParseFile, ResumeParseJob, UserProfile
 
 
 class AddressSerializer(serializers.ModelSerializer):
@@ -167,3 +167,26 @@ class UserProfileSerializer(serializers.ModelSerializer):
         model = UserProfile
         fields = ['designation', 'department', 'organization']
 
+
+class ResumeParseFileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ResumeParseFile
+        fields = ['id', 'filename', 'status', 'result', 'error', 'seconds', 'cached']
+
+
+class ResumeParseJobSerializer(serializers.ModelSerializer):
+    """Batch resume job with its progress, throughput and per-file results"""
+    progress = serializers.SerializerMethodField()
+    files_per_second = serializers.FloatField(read_only=True)
+    files = ResumeParseFileSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ResumeParseJob
+        fields = [
+            'id', 'status', 'total', 'processed', 'failed', 'progress', 'files_per_second',
+            'created_at', 'started_at', 'finished_at', 'files'
+        ]
+
+    def get_progress(self, obj):
+        """Percentage of files processed"""
+        return round(100 * obj.processed / obj.total, 1) if obj.total else 100.0
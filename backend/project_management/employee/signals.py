@@ -0,0 +1,83 @@
+"""
+Signal handlers for the employee app
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from clients.models import Client
+from finance.models import Income, Expense
+from invoices.models import Invoice
+from projects.models import Project
+from sprint.models import SprintTask
+from tasks.models import Task
+from tickets.models import Ticket
+from todo.models import ToDo
+from . import workload
+from .dashboard_cache import invalidate_dashboards
+from .display_names import invalidate_display_name
+from .models import Employee
+
+
+# Models whose changes affect dashboard figures
+DASHBOARD_SOURCES = [Task, Project, Invoice, Income, Expense, Employee, Client, SprintTask, Ticket, ToDo]
+
+for model in DASHBOARD_SOURCES:
+    post_save.connect(invalidate_dashboards, sender=model, dispatch_uid=f'dashboard_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_dashboards, sender=model, dispatch_uid=f'dashboard_cache_delete_{model.__name__}')
+
+
+# Task model -> (fields the workload index depends on, contribution function)
+WORKLOAD_SOURCES = {
+    Task: (('assigned_to_id', 'status'), workload.task_contribution),
+    SprintTask: (('assigned_to_id', 'status'), workload.sprint_task_contribution),
+}
+
+
+def _assignment(sender, instance):
+    fields, contribution = WORKLOAD_SOURCES[sender]
+    return tuple(getattr(instance, field) for field in fields)
+
+
+def remember_previous_assignment(sender, instance, **kwargs):
+    """Load the stored assignee and status before an update so the old counts can be removed"""
+    instance._workload_previous = None
+    if instance.pk is None:
+        return
+    fields, contribution = WORKLOAD_SOURCES[sender]
+    previous = sender.objects.filter(pk=instance.pk).only(*fields).first()
+    if previous is not None:
+        instance._workload_previous = previous
+
+
+def apply_saved_assignment(sender, instance, **kwargs):
+    fields, contribution = WORKLOAD_SOURCES[sender]
+    previous = getattr(instance, '_workload_previous', None)
+    if previous is not None and _assignment(sender, previous) == _assignment(sender, instance):
+        return
+    if previous is not None:
+        workload.apply_contribution(contribution(previous), -1)
+    workload.apply_contribution(contribution(instance), 1)
+
+
+def remove_deleted_assignment(sender, instance, **kwargs):
+    fields, contribution = WORKLOAD_SOURCES[sender]
+    workload.apply_contribution(contribution(instance), -1)
+
+
+for model in WORKLOAD_SOURCES:
+    pre_save.connect(remember_previous_assignment, sender=model, dispatch_uid=f'workload_pre_save_{model.__name__}')
+    post_save.connect(apply_saved_assignment, sender=model, dispatch_uid=f'workload_post_save_{model.__name__}')
+    post_delete.connect(remove_deleted_assignment, sender=model, dispatch_uid=f'workload_post_delete_{model.__name__}')
+
+
+def employee_name_changed(sender, instance, **kwargs):
+    invalidate_display_name(instance.user_id)
+
+
+def user_name_changed(sender, instance, **kwargs):
+    invalidate_display_name(instance.pk)
+
+
+post_save.connect(employee_name_changed, sender=Employee, dispatch_uid='display_name_employee_save')
+post_delete.connect(employee_name_changed, sender=Employee, dispatch_uid='display_name_employee_delete')
+post_save.connect(user_name_changed, sender=User, dispatch_uid='display_name_user_save')
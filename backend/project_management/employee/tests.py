@@ -1,3 +1,217 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tasks.models import Task
+
+from . import dashboard_widgets
+from .nl_query import compile_query
+from .models import ResumeParseCache
+from .resume_cache import file_digest, parse_resume_cached, store
+from .resume_jobs import claim_job, collect_uploads, create_job, run_job
+from .timeseries import time_series
+
+
+class TimeSeriesTests(TestCase):
+    today = date(2026, 3, 11)
+
+    def add_task(self, day, status='todo'):
+        task = Task.objects.create(task_name='Task', status=status, start_date=day, end_date=day)
+        created_at = timezone.make_aware(datetime.combine(day, time(12)))
+        Task.objects.filter(pk=task.pk).update(created_at=created_at)
+
+    def test_daily_buckets_count_created_and_completed(self):
+        self.add_task(self.today - timedelta(days=20))
+        self.add_task(self.today - timedelta(days=2))
+        self.add_task(self.today - timedelta(days=2), status='completed')
+        self.add_task(self.today, status='completed')
+
+        series = time_series('tasks', 7, 'day', today=self.today)
+
+        self.assertEqual(len(series), 7)
+        by_day = {row['period']: row for row in series}
+        self.assertEqual(by_day[self.today - timedelta(days=2)]['created'], 2)
+        self.assertEqual(by_day[self.today - timedelta(days=2)]['completed'], 1)
+        self.assertEqual(by_day[self.today]['created'], 1)
+        # The task from before the range seeds the running totals
+        self.assertEqual(series[0]['total'], 1)
+        self.assertEqual(series[-1]['total'], 4)
+        self.assertEqual(series[-1]['total_completed'], 2)
+        self.assertEqual(series[-1]['progress'], 50)
+
+    def test_weekly_buckets_start_on_monday(self):
+        self.add_task(self.today)
+        self.add_task(self.today - timedelta(days=7), status='completed')
+
+        series = time_series('tasks', 14, 'week', today=self.today)
+
+        self.assertTrue(all(row['period'].weekday() == 0 for row in series))
+        self.assertEqual([row['created'] for row in series[-2:]], [1, 1])
+        self.assertEqual(series[-1]['total_completed'], 1)
+
+
+class NaturalLanguageQueryTests(TestCase):
+    today = date(2026, 3, 11)
+
+    def compile(self, query):
+        return compile_query(query, today=self.today)
+
+    def test_department_in_context(self):
+        compiled = self.compile('active backend developers in Development who joined after 2023')
+        self.assertEqual(compiled['filters'], {
+            'joined': ['after 2023'],
+            'department': 'Development',
+            'status': 'active',
+            'designation': ['backend', 'developer'],
+        })
+        self.assertEqual(compiled['unparsed'], [])
+
+    def test_role_word_alone_is_a_department(self):
+        self.assertEqual(self.compile('qa engineers')['filters'], {'department': 'QA', 'designation': ['engineer']})
+
+    def test_explicit_department_phrase_wins_over_leading_role_word(self):
+        compiled = self.compile('qa engineers in it department')
+        self.assertEqual(compiled['filters'], {'department': 'IT', 'designation': ['qa', 'engineer']})
+        self.assertEqual(compiled['unparsed'], [])
+
+    def test_top_newest_with_period(self):
+        compiled = self.compile('top 5 newest designers from the last 6 months')
+        self.assertEqual(compiled['limit'], 5)
+        self.assertEqual(compiled['ordering'], ['-joining_date', '-id'])
+        self.assertEqual(compiled['filters'], {'joined': ['last 6 months'], 'designation': ['designer']})
+
+
+@override_settings(DASHBOARD_CACHE_TIMEOUT=300)
+class DashboardCacheTests(TestCase):
+    url = '/api/peoples/dashboard/batch/?widgets=summary'
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('viewer', password='x'))
+
+    def test_successful_batch_is_cached(self):
+        self.assertEqual(self.client.get(self.url)['X-Dashboard-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.url)['X-Dashboard-Cache'], 'HIT')
+
+    def test_batch_with_failed_widget_is_not_cached(self):
+        def broken(metrics, params):
+            raise RuntimeError('database unavailable')
+
+        with mock.patch.dict(dashboard_widgets.WIDGETS, {'summary': broken}):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['errors'], {'summary': 'database unavailable'})
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Dashboard-Cache'], 'MISS')
+        self.assertEqual(response.data['errors'], {})
+
+
+def fake_parse(data, filename):
+    """Stands in for the parser process: bytes starting with 'bad' fail"""
+    if data.startswith(b'bad'):
+        raise RuntimeError('unreadable')
+    return {'name': data.decode(), 'email': ''}, 0.01
+
+
+@override_settings(RESUME_BATCH_MAX_FILES=5, RESUME_BATCH_MAX_FILE_MB=1)
+class ResumeBatchJobTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user('recruiter')
+
+    def archive(self, files):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as zipped:
+            for name, data in files.items():
+                zipped.writestr(name, data)
+        return SimpleUploadedFile('resumes.zip', buffer.getvalue())
+
+    def test_collect_uploads_reads_files_and_zips(self):
+        uploads = collect_uploads(
+            [SimpleUploadedFile('alice.pdf', b'Alice'), SimpleUploadedFile('notes.txt', b'x')],
+            [self.archive({'bob.docx': b'Bob', '__MACOSX/._bob.docx': b'', 'big.pdf': b'x' * (1024 * 1024 + 1)})],
+        )
+        self.assertEqual(uploads, [
+            ('alice.pdf', b'Alice', ''),
+            ('notes.txt', None, 'Unsupported file type'),
+            ('bob.docx', b'Bob', ''),
+            ('big.pdf', None, 'Larger than 1 MB'),
+        ])
+
+        with self.assertRaisesMessage(ValueError, 'not a valid zip file'):
+            collect_uploads([], [SimpleUploadedFile('broken.zip', b'not a zip')])
+        with self.assertRaisesMessage(ValueError, 'At most 5 resumes'):
+            collect_uploads([SimpleUploadedFile(f'r{i}.pdf', b'x') for i in range(6)])
+
+    def test_worker_parses_pending_files_and_reuses_the_cache(self):
+        store(file_digest(b'Carol'), {'name': 'Carol (cached)'})
+        job = create_job(self.user, [
+            ('alice.pdf', b'Alice', ''),
+            ('broken.pdf', b'bad bytes', ''),
+            ('carol.pdf', b'Carol', ''),
+            ('notes.txt', None, 'Unsupported file type'),
+        ])
+        self.assertEqual((job.status, job.total, job.processed, job.failed), ('pending', 4, 1, 1))
+        self.assertEqual(claim_job(), job)
+        self.assertIsNone(claim_job())
+
+        with mock.patch('employee.resume_jobs.timed_parse_resume_bytes', fake_parse), \
+                ThreadPoolExecutor(max_workers=2) as executor:
+            job = run_job(job, executor, workers=1)
+
+        self.assertEqual((job.status, job.processed, job.failed), ('done', 4, 2))
+        files = {item.filename: item for item in job.files.all()}
+        self.assertEqual(files['alice.pdf'].result['name'], 'Alice')
+        self.assertEqual((files['carol.pdf'].result['name'], files['carol.pdf'].cached), ('Carol (cached)', True))
+        self.assertEqual(files['broken.pdf'].error, 'RuntimeError: unreadable')
+        # Parsed uploads are not kept
+        self.assertFalse(any(item.upload for item in files.values()))
+
+
+@mock.patch('employee.resume_cache.parse_resume_bytes', side_effect=lambda data, filename: {'name': data.decode()})
+class ResumeCacheTests(TestCase):
+    def test_same_content_hits_and_new_content_misses(self, parse):
+        self.assertEqual(parse_resume_cached(b'Alice', 'alice.pdf'), ({'name': 'Alice'}, False))
+        # The key is the content, not the filename
+        self.assertEqual(parse_resume_cached(b'Alice', 'renamed.pdf'), ({'name': 'Alice'}, True))
+        self.assertEqual(parse_resume_cached(b'Alice v2', 'alice.pdf'), ({'name': 'Alice v2'}, False))
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual(ResumeParseCache.objects.get(sha256=file_digest(b'Alice')).hits, 1)
+
+    def test_parser_version_bump_misses_and_drops_old_entries(self, parse):
+        parse_resume_cached(b'Alice', 'alice.pdf')
+        with mock.patch('employee.resume_cache.PARSER_VERSION', '2'):
+            self.assertEqual(parse_resume_cached(b'Alice', 'alice.pdf')[1], False)
+        self.assertEqual(list(ResumeParseCache.objects.values_list('parser_version', flat=True)), ['2'])
+
+    def test_failures_are_not_cached(self, parse):
+        parse.side_effect = lambda data, filename: {'error': 'Could not read file'}
+        parse_resume_cached(b'Alice', 'alice.pdf')
+        self.assertEqual(parse_resume_cached(b'Alice', 'alice.pdf')[1], False)
+        self.assertFalse(ResumeParseCache.objects.exists())
+
+    @override_settings(RESUME_CACHE_MAX_ENTRIES=2)
+    def test_least_recently_used_entries_are_evicted(self, parse):
+        parse_resume_cached(b'Alice', 'alice.pdf')
+        parse_resume_cached(b'Bob', 'bob.pdf')
+        parse_resume_cached(b'Alice', 'alice.pdf')
+        parse_resume_cached(b'Carol', 'carol.pdf')
+
+        cached = set(ResumeParseCache.objects.values_list('result__name', flat=True))
+        self.assertEqual(cached, {'Alice', 'Carol'})
@@ -0,0 +1,123 @@
+"""
+Created/completed time series for the dashboard charts
+A series is produced by one query: rows are grouped by a truncated created_at
+and a running total window over the grouped counts gives the cumulative
+figures, so a yearly chart costs the same as a weekly one. Rows created before
+the range are folded into the first period to seed the running totals.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from django.db.models import Count, DateField, F, Func, IntegerField, Q, Value
+from django.db.models.functions import Cast, Greatest, Trunc
+from django.utils import timezone
+
+from finance.rollups import add_months, month_start
+from sprint.models import SprintTask
+from tasks.models import Task
+from tickets.models import Ticket
+from todo.models import ToDo
+
+
+# Series name -> (model, statuses counted as completed)
+SOURCES = {
+    'tasks': (Task, ['completed']),
+    'sprint_tasks': (SprintTask, ['done']),
+    'tickets': (Ticket, ['close']),
+    'todos': (ToDo, ['completed']),
+}
+
+GRANULARITIES = ['day', 'week', 'month']
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 3660
+
+
+class RunningTotal(Func):
+    """SUM(<aggregate>) OVER (ORDER BY <expression>) over a grouped query"""
+    template = 'SUM(%(aggregate)s) OVER (ORDER BY %(order_by)s)'
+    contains_over_clause = True
+
+    def __init__(self, aggregate, order_by):
+        super().__init__(aggregate, order_by, output_field=IntegerField())
+
+    def as_sql(self, compiler, connection, **extra_context):
+        aggregate, order_by = self.get_source_expressions()
+        aggregate_sql, aggregate_params = compiler.compile(aggregate)
+        order_by_sql, order_by_params = compiler.compile(order_by)
+        sql = self.template % {'aggregate': aggregate_sql, 'order_by': order_by_sql}
+        return sql, (*aggregate_params, *order_by_params)
+
+
+def period_start(day: date, granularity: str) -> date:
+    """First day of the period containing day (weeks start on Monday)"""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return month_start(day)
+    return day
+
+
+def next_period(period: date, granularity: str) -> date:
+    if granularity == 'week':
+        return period + timedelta(days=7)
+    if granularity == 'month':
+        return add_months(period, 1)
+    return period + timedelta(days=1)
+
+
+def time_series(source: str, days: int = DEFAULT_DAYS, granularity: str = 'day',
+                today: Optional[date] = None) -> List[Dict]:
+    """
+    Items created and completed per period over the last `days` days, with
+    cumulative totals and the completion percentage at the end of each period
+    """
+    if source not in SOURCES:
+        raise ValueError(f"Unknown source '{source}'. Choose from: {', '.join(SOURCES)}")
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity '{granularity}'. Choose from: {', '.join(GRANULARITIES)}")
+    days = min(max(int(days), 1), MAX_DAYS)
+
+    model, completed_statuses = SOURCES[source]
+    end_date = today or timezone.now().date()
+    first_period = period_start(end_date - timedelta(days=days - 1), granularity)
+
+    in_range = Q(created_at__date__gte=first_period)
+    completed = Q(status__in=completed_statuses)
+    rows = (
+        model.objects.filter(created_at__date__lte=end_date)
+        # Trunc's conversion to a date is skipped inside Greatest, so PostgreSQL
+        # would return timestamps here; the cast keeps the keys dates
+        .annotate(period=Greatest(
+            Cast(Trunc('created_at', granularity, output_field=DateField()), DateField()),
+            Value(first_period, output_field=DateField())
+        ))
+        .values('period')
+        .annotate(
+            created=Count('id', filter=in_range),
+            completed=Count('id', filter=in_range & completed),
+            total=RunningTotal(Count('id'), F('period')),
+            total_completed=RunningTotal(Count('id', filter=completed), F('period')),
+        )
+        .order_by('period')
+    )
+    rows = {row['period']: row for row in rows}
+
+    # Fill periods without rows, carrying the running totals forward
+    series = []
+    total = total_completed = 0
+    period = first_period
+    while period <= end_date:
+        row = rows.get(period)
+        if row:
+            total, total_completed = row['total'], row['total_completed']
+        series.append({
+            'period': period,
+            'created': row['created'] if row else 0,
+            'completed': row['completed'] if row else 0,
+            'total': total,
+            'total_completed': total_completed,
+            'progress': int((total_completed / total) * 100) if total > 0 else 0,
+        })
+        period = next_period(period, granularity)
+    return series
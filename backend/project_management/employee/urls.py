@@ -14,14 +14,20 @@ urlpatterns = [
     
     # Resume parsing
     path('parse-resume/', views.parse_resume_api, name='parse-resume'),
+    path('parse-resume/batch/', views.parse_resume_batch_api, name='parse-resume-batch'),
+    path('parse-resume/batch/<int:job_id>/', views.resume_batch_job, name='parse-resume-batch-job'),
     
     # Dashboard summary
     path('dashboard-summary/', views.dashboard_summary, name='dashboard-summary'),
     path('dashboard/project-progress/', views.dashboard_project_progress, name='dashboard-project-progress'),
     path('dashboard/weekly-progress/', views.dashboard_weekly_progress, name='dashboard-weekly-progress'),
+    path('dashboard/time-series/', views.dashboard_time_series, name='dashboard-time-series'),
     path('dashboard/status-percentage/', views.dashboard_status_percentage, name='dashboard-status-percentage'),
     path('dashboard/ai-insights/', views.dashboard_ai_insights, name='dashboard-ai-insights'),
     path('dashboard/kanban-data/', views.dashboard_kanban_data, name='dashboard-kanban-data'),
+    path('dashboard/workload/', views.dashboard_employee_workload, name='dashboard-employee-workload'),
+    path('dashboard/batch/', views.dashboard_batch, name='dashboard-batch'),
+    path('dashboard/cache-stats/', views.dashboard_cache_stats, name='dashboard-cache-stats'),
     
     # AI endpoints
     path('ai/insights/', views.ai_employee_insights, name='ai-employee-insights'),
@@ -1,25 +1,23 @@
-from rest_framework import viewsets, status
+from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import transaction, models, models
-from django.utils import timezone
-from datetime import date, datetime, timedelta
-from .models import Employee, Address, BankDetails, Documents
-from .ai_services import DashboardAIService
+from django.db import transaction
+from .models import Employee, Address, BankDetails, Documents, ResumeParseJob
+from .dashboard_cache import cached_dashboard, cache_stats, reset_cache_stats
+from .dashboard_metrics import DashboardMetrics
+from . import dashboard_widgets
 from .serializers import (
-    EmployeeListSerializer, EmployeeDetailSerializer, EmployeeCreateSerializer
+    EmployeeListSerializer, EmployeeDetailSerializer, ResumeParseJobSerializer
 )
-from .resume_parser import parse_resume
+from .resume_cache import parse_resume_cached
+from .resume_jobs import collect_uploads, create_job
 from .ai_services import EmployeeAIService
 from notifications.utils import notify_employee_added
 import random
 import string
-import os
-import tempfile
-from datetime import datetime, timedelta
-from django.utils import timezone
 
 
 def generate_random_password(length=8):
@@ -51,7 +49,7 @@ def employee_names_list(request):
                     'email': email,
                     'designation': getattr(emp, 'designation', '') or ''
                 })
-            except Exception as row_error:
+            except Exception:
                 # Skip bad rows but report minimal info for observability
                 data.append({
                     'id': getattr(emp, 'id', None),
@@ -243,18 +241,12 @@ def create_employee(request):
             documents=documents,
         )
         
-        # Send notification to admin users about new employee
-        try:
-            admin_users = User.objects.filter(is_staff=True, is_active=True)
-            for admin_user in admin_users:
-                notify_employee_added(
-                    user=admin_user,
-                    employee_name=employee.name or 'New Employee',
-                    employee_id=employee.id
-                )
-        except Exception as notify_error:
-            # Don't fail employee creation if notification fails
-            print(f"Notification error: {notify_error}")
+        # Notify admin users (an outbox row in this transaction when the outbox is enabled)
+        notify_employee_added(
+            recipients=User.objects.filter(is_staff=True, is_active=True),
+            employee_name=employee.name or 'New Employee',
+            employee_id=employee.id
+        )
         
         # Return created employee data
         serializer = EmployeeDetailSerializer(employee)
@@ -520,52 +512,13 @@ def employee_list(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('summary')
 def dashboard_summary(request):
     """Get dashboard summary statistics"""
     try:
-        # Count employees
-        total_employees = Employee.objects.count()
-        active_employees = Employee.objects.filter(is_active=True).count()
-        
-        # Live counts for projects and clients
-        try:
-            from projects.models import Project
-            projects_count = Project.objects.count()
-            ongoing_projects = Project.objects.filter(status='in_progress').count()
-        except Exception:
-            projects_count = 0
-            ongoing_projects = 0
-            
-        try:
-            from clients.models import Client
-            clients_count = Client.objects.count()
-        except Exception:
-            clients_count = 0
-
-        # Task statistics
-        try:
-            from tasks.models import Task
-            total_tasks = Task.objects.count()
-            completed_tasks = Task.objects.filter(status='completed').count()
-            pending_tasks = Task.objects.filter(status__in=['todo', 'in_progress', 'review', 'testing']).count()
-        except Exception:
-            total_tasks = 0
-            completed_tasks = 0
-            pending_tasks = 0
-
-        summary_data = {
-            'employees': total_employees,
-            'projects': projects_count,
-            'ongoing_projects': ongoing_projects,
-            'tasks': total_tasks,
-            'completed_tasks': completed_tasks,
-            'pending_tasks': pending_tasks,
-            'clients': clients_count,
-            'active_employees': active_employees,
-            'inactive_employees': total_employees - active_employees,
-        }
-        
-        return Response(summary_data, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.summary(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -582,50 +535,14 @@ def dashboard_summary(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('project_progress')
 def dashboard_project_progress(request):
     """Get project progress data for dashboard"""
     try:
-        from projects.models import Project
-        from tasks.models import Task
-        
-        projects = Project.objects.all()[:10]  # Get top 10 projects
-        project_progress = []
-        
-        for project in projects:
-            # Calculate progress based on tasks
-            project_tasks = Task.objects.filter(project=project)
-            total_tasks = project_tasks.count()
-            
-            if total_tasks > 0:
-                completed_tasks = project_tasks.filter(status='completed').count()
-                progress_percentage = int((completed_tasks / total_tasks) * 100)
-            else:
-                # If no tasks, calculate based on dates
-                if project.start_date and project.end_date:
-                    today = timezone.now().date()
-                    total_days = (project.end_date - project.start_date).days
-                    if total_days > 0:
-                        elapsed_days = (today - project.start_date).days
-                        progress_percentage = min(100, max(0, int((elapsed_days / total_days) * 100)))
-                    else:
-                        progress_percentage = 0
-                else:
-                    progress_percentage = 0
-            
-            project_progress.append({
-                'id': project.id,
-                'name': project.title,
-                'progress': progress_percentage,
-                'status': project.status,
-            })
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.project_progress(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
-        # Sort by progress descending
-        project_progress.sort(key=lambda x: x['progress'], reverse=True)
-
-        return Response({
-            'projects': project_progress
-        }, status=status.HTTP_200_OK)
-    
     except Exception as e:
         return Response({
             'error': f'Error fetching project progress: {str(e)}',
@@ -635,39 +552,13 @@ def dashboard_project_progress(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('weekly_progress')
 def dashboard_weekly_progress(request):
     """Get weekly progress data for line chart"""
     try:
-        from tasks.models import Task
-        from datetime import datetime, timedelta
-        
-        # Get last 7 days
-        today = timezone.now().date()
-        week_data = []
-        
-        for i in range(6, -1, -1):  # Last 7 days including today
-            date = today - timedelta(days=i)
-            day_name = date.strftime('%a')  # Mon, Tue, etc.
-            
-            # Count tasks created up to this date
-            tasks_until_date = Task.objects.filter(created_at__date__lte=date)
-            total_tasks = tasks_until_date.count()
-            completed_tasks = tasks_until_date.filter(status='completed').count()
-            
-            # Calculate progress percentage
-            if total_tasks > 0:
-                progress = int((completed_tasks / total_tasks) * 100)
-            else:
-                progress = 0
-            
-            week_data.append({
-                'week': day_name,
-                'progress': progress
-            })
-        
-        return Response({
-            'data': week_data
-        }, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.weekly_progress(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -678,27 +569,37 @@ def dashboard_weekly_progress(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('time_series')
+def dashboard_time_series(request):
+    """
+    Get created/completed counts per period with cumulative totals
+    Usage: ?source=tasks|sprint_tasks|tickets|todos&days=90&granularity=day|week|month
+    """
+    try:
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.time_series(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
+    
+    except ValueError as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({
+            'error': f'Error fetching time series: {str(e)}',
+            'data': []
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cached_dashboard('status_percentage')
 def dashboard_status_percentage(request):
     """Get overall status percentage for donut chart"""
     try:
-        from tasks.models import Task
-        
-        total_tasks = Task.objects.count()
-        completed_tasks = Task.objects.filter(status='completed').count()
-        
-        if total_tasks > 0:
-            completion_percentage = int((completed_tasks / total_tasks) * 100)
-            remaining_percentage = 100 - completion_percentage
-        else:
-            completion_percentage = 0
-            remaining_percentage = 100
-        
-        return Response({
-            'completion_percentage': completion_percentage,
-            'remaining_percentage': remaining_percentage,
-            'total_tasks': total_tasks,
-            'completed_tasks': completed_tasks
-        }, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.status_percentage(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -710,258 +611,13 @@ def dashboard_status_percentage(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('kanban_data')
 def dashboard_kanban_data(request):
     """Get comprehensive Kanban dashboard data"""
     try:
-        from projects.models import Project
-        from tasks.models import Task
-        from django.contrib.auth.models import User
-        from datetime import date, timedelta
-        
-        today = timezone.now().date()
-        
-        # Project by Status
-        project_status_data = {
-            'in_progress': Project.objects.filter(status='in_progress').count(),
-            'completed': Project.objects.filter(status='completed').count(),
-            'planning': Project.objects.filter(status='planning').count(),
-            'paused': Project.objects.filter(status='paused').count(),
-            'cancelled': Project.objects.filter(status='cancelled').count(),
-            'not_started': Project.objects.filter(status='not_started').count(),
-        }
-        
-        # Project by Due Date
-        projects = Project.objects.all()
-        on_time = 0
-        due = 0
-        over_due = 0
-        due_projects = []
-        over_due_projects = []
-        
-        for project in projects:
-            if project.end_date:
-                days_remaining = (project.end_date - today).days
-                if days_remaining < 0:
-                    over_due += 1
-                    if len(over_due_projects) < 6:
-                        over_due_projects.append({'id': project.id, 'name': project.title})
-                elif days_remaining <= 7:
-                    due += 1
-                    if len(due_projects) < 6:
-                        due_projects.append({'id': project.id, 'name': project.title})
-                else:
-                    on_time += 1
-        
-        # Combine due and over due projects for display (prioritize over due)
-        all_due_projects = over_due_projects + due_projects
-        
-        # Workload calculation (based on tasks per employee)
-        employees = Employee.objects.filter(is_active=True)
-        total_tasks = Task.objects.count()
-        active_employees = employees.count()
-        
-        if active_employees > 0:
-            # Count employees in each category based on their task count
-            # Healthy range: 5-15 tasks per employee
-            healthy_count = 0
-            underutilised_count = 0
-            overutilised_count = 0
-            
-            for emp in employees:
-                task_count = Task.objects.filter(assigned_to=emp).count()
-                if task_count < 5:
-                    underutilised_count += 1
-                elif task_count > 15:
-                    overutilised_count += 1
-                else:
-                    healthy_count += 1
-            
-            total_workload = healthy_count + underutilised_count + overutilised_count
-            
-            if total_workload > 0:
-                # Calculate percentages with proper rounding to ensure they add up to 100%
-                healthy_percent = round((healthy_count / total_workload) * 100)
-                underutilised_percent = round((underutilised_count / total_workload) * 100)
-                overutilised_percent = 100 - healthy_percent - underutilised_percent
-                
-                # Ensure no negative values
-                if overutilised_percent < 0:
-                    overutilised_percent = 0
-            else:
-                # Default values when no employees have tasks
-                healthy_percent = 0
-                underutilised_percent = 100
-                overutilised_percent = 0
-        else:
-            # Default values when no active employees
-            healthy_percent = 0
-            underutilised_percent = 0
-            overutilised_percent = 0
-        
-        # Project by Project Manager
-        # Group by email (unique identifier) but display name
-        project_managers = {}
-        for project in projects:
-            if project.assigned_to:
-                user = project.assigned_to
-                # Use email as unique key for counting
-                user_email = user.email if user.email else user.username
-                
-                # Get proper name for display - prefer Employee model name, then User full name, then first name, then formatted username
-                pm_name = None
-                
-                # First priority: Check if user has Employee profile with name
-                try:
-                    if hasattr(user, 'employee_profile'):
-                        employee = user.employee_profile
-                        if employee and employee.name:
-                            pm_name = employee.name
-                except Exception:
-                    pass
-                
-                # Second priority: User's full name
-                if not pm_name and user.get_full_name():
-                    pm_name = user.get_full_name()
-                
-                # Third priority: User's first name
-                if not pm_name and user.first_name:
-                    pm_name = user.first_name
-                
-                # Last resort: Format username
-                if not pm_name:
-                    username = user.username
-                    if '@' in username:
-                        # Remove email domain and format
-                        pm_name = username.split('@')[0].replace('.', ' ').replace('_', ' ').title()
-                    else:
-                        # Format username by replacing dots and underscores with spaces
-                        pm_name = username.replace('.', ' ').replace('_', ' ').title()
-                
-                # Use email as key for counting (unique identifier)
-                # Store name for display (will use the first/latest name found)
-                if user_email:
-                    if user_email not in project_managers:
-                        project_managers[user_email] = {
-                            'name': pm_name or user_email,
-                            'count': 0
-                        }
-                    # Increment count for this email
-                    project_managers[user_email]['count'] += 1
-        
-        # Convert to list format and sort by count
-        manager_data = [
-            {'name': data['name'], 'count': data['count']} 
-            for email, data in project_managers.items()
-        ]
-        # Sort by count descending and get top 5
-        sorted_managers = sorted(manager_data, key=lambda x: x['count'], reverse=True)[:5]
-        manager_data = sorted_managers
-        
-        # Financial data - Calculate from actual Income, Expense, and Invoice models
-        try:
-            from finance.models import Income, Expense
-            from invoices.models import Invoice
-            
-            # Actual Revenue: Sum of all income amounts
-            total_revenue = float(Income.objects.aggregate(
-                total=models.Sum('amount')
-            )['total'] or 0)
-            
-            # Planned Revenue: Sum of all invoice amounts (what we expect to receive)
-            # This is dynamic - based on actual invoices created
-            planned_revenue = float(Invoice.objects.aggregate(
-                total=models.Sum('amount')
-            )['total'] or 0)
-            
-            # If no invoices, use project budgets as planned revenue (also dynamic)
-            if planned_revenue == 0:
-                planned_revenue = sum(float(p.budget) for p in projects if p.budget) if projects.exists() else 0
-            
-            # Only use estimate if we have NO data at all (both invoices and budgets are 0)
-            # This means: if we have actual revenue but no planned data, estimate 20% growth
-            if planned_revenue == 0 and total_revenue > 0:
-                # Estimate: Assume 20% growth target (more realistic than 33%)
-                planned_revenue = total_revenue * 1.20
-            elif planned_revenue == 0:
-                # No data at all - set to 0 instead of random estimate
-                planned_revenue = 0
-            
-            # Actual Cost: Sum of all expense amounts
-            total_cost = float(Expense.objects.aggregate(
-                total=models.Sum('amount')
-            )['total'] or 0)
-            
-            # Planned Cost: Calculate from actual expenses with realistic growth
-            # If we have actual expenses, plan for 10% increase (more realistic)
-            if total_cost > 0:
-                # Dynamic: Based on actual expenses, plan for 10% increase
-                planned_cost = total_cost * 1.10
-            elif planned_revenue > 0:
-                # If no expenses but we have planned revenue, estimate cost as 25% of revenue
-                # This is a standard business ratio (cost should be 20-30% of revenue)
-                planned_cost = planned_revenue * 0.25
-            else:
-                # No data - set to 0
-                planned_cost = 0
-            
-            # Calculate margins
-            total_margin = total_revenue - total_cost
-            planned_margin = planned_revenue - planned_cost
-            
-        except ImportError:
-            # Fallback if models don't exist
-            total_revenue = sum(float(p.budget) for p in projects if p.budget) if projects.exists() else 0
-            planned_revenue = total_revenue * 1.33 if total_revenue > 0 else 0
-            total_cost = total_revenue * 0.27 if total_revenue > 0 else 0
-            planned_cost = total_revenue * 1.13 if total_revenue > 0 else 0
-            total_margin = total_revenue - total_cost
-            planned_margin = planned_revenue - planned_cost
-        except Exception as e:
-            # Error handling
-            total_revenue = sum(float(p.budget) for p in projects if p.budget) if projects.exists() else 0
-            planned_revenue = total_revenue * 1.33 if total_revenue > 0 else 0
-            total_cost = total_revenue * 0.27 if total_revenue > 0 else 0
-            planned_cost = total_revenue * 1.13 if total_revenue > 0 else 0
-            total_margin = total_revenue - total_cost
-            planned_margin = planned_revenue - planned_cost
-        
-        return Response({
-            'project_status': project_status_data,
-            'project_due_date': {
-                'on_time': on_time,
-                'due': due,
-                'over_due': over_due,
-                'due_projects': all_due_projects[:6],  # Show up to 6 projects (over due first, then due)
-                'over_due_projects': over_due_projects[:3],  # Top 3 over due projects
-                'due_soon_projects': due_projects[:3]  # Top 3 due soon projects
-            },
-            'workload': {
-                'healthy': healthy_percent,
-                'underutilised': underutilised_percent,
-                'overutilised': overutilised_percent
-            },
-            'project_managers': manager_data,
-            'financial': {
-                'total_projects': {
-                    'actual': projects.count(),
-                    # Planned: If we have projects, calculate based on active/in-progress projects
-                    # Assume we plan to complete current projects + add 50% more
-                    'planned': int(projects.filter(status__in=['in_progress', 'planning', 'not_started']).count() * 1.5) + projects.filter(status='completed').count() if projects.exists() else 0
-                },
-                'total_revenue': {
-                    'actual': round(total_revenue, 2),
-                    'planned': round(planned_revenue, 2)
-                },
-                'total_cost': {
-                    'actual': round(total_cost, 2),
-                    'planned': round(planned_cost, 2)
-                },
-                'total_margin': {
-                    'actual': round(total_margin, 2),
-                    'planned': round(planned_margin, 2)
-                }
-            }
-        }, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.kanban_data(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -976,65 +632,13 @@ def dashboard_kanban_data(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('ai_insights')
 def dashboard_ai_insights(request):
     """Get AI-powered dashboard insights"""
     try:
-        from projects.models import Project
-        from tasks.models import Task
-        from employee.models import Employee
-        
-        # Get recent projects
-        recent_projects = Project.objects.filter(status='in_progress').order_by('-start_date')[:5]
-        
-        insights = []
-        
-        for project in recent_projects:
-            project_tasks = Task.objects.filter(project=project)
-            total_tasks = project_tasks.count()
-            completed_tasks = project_tasks.filter(status='completed').count()
-            
-            if total_tasks > 0:
-                progress = int((completed_tasks / total_tasks) * 100)
-                
-                # Calculate days ahead/behind
-                if project.end_date:
-                    today = timezone.now().date()
-                    days_remaining = (project.end_date - today).days
-                    
-                    # Estimate completion based on current progress
-                    if progress > 0:
-                        days_elapsed = (today - project.start_date).days if project.start_date else 0
-                        if days_elapsed > 0:
-                            rate = progress / days_elapsed
-                            estimated_days_needed = (100 - progress) / rate if rate > 0 else days_remaining
-                            days_ahead = days_remaining - estimated_days_needed
-                            
-                            if days_ahead > 0:
-                                insights.append({
-                                    'project_name': project.title,
-                                    'progress': progress,
-                                    'days_ahead': int(days_ahead),
-                                    'message': f"{project.title} is {progress}% complete — expected to finish {int(days_ahead)} day{'s' if days_ahead > 1 else ''} ahead."
-                                })
-                            elif days_ahead < -1:
-                                insights.append({
-                                    'project_name': project.title,
-                                    'progress': progress,
-                                    'days_behind': int(abs(days_ahead)),
-                                    'message': f"{project.title} is {progress}% complete — may finish {int(abs(days_ahead))} day{'s' if abs(days_ahead) > 1 else ''} behind schedule."
-                                })
-        
-        # If no insights, provide default
-        if not insights:
-            insights.append({
-                'project_name': 'General',
-                'progress': 0,
-                'message': 'No active projects to analyze. Create projects to get AI insights.'
-            })
-        
-        return Response({
-            'insights': insights[:3]  # Return top 3 insights
-        }, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.ai_insights(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -1048,7 +652,10 @@ def dashboard_ai_insights(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def parse_resume_api(request):
-    """Parse resume file and extract employee information"""
+    """
+    Parse resume file and extract employee information
+    A file parsed before is answered from the cache (X-Resume-Cache: hit).
+    """
     try:
         if 'resume' not in request.FILES:
             return Response(
@@ -1057,22 +664,13 @@ def parse_resume_api(request):
             )
         
         resume_file = request.FILES['resume']
+        parsed_data, cached = parse_resume_cached(resume_file.read(), resume_file.name)
+        return Response(
+            parsed_data,
+            status=status.HTTP_200_OK,
+            headers={'X-Resume-Cache': 'hit' if cached else 'miss'}
+        )
         
-        # Save file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(resume_file.name)[1]) as tmp_file:
-            for chunk in resume_file.chunks():
-                tmp_file.write(chunk)
-            tmp_path = tmp_file.name
-        
-        try:
-            # Parse resume
-            parsed_data = parse_resume(tmp_path)
-            return Response(parsed_data, status=status.HTTP_200_OK)
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-                
     except Exception as e:
         return Response(
             {'error': f'Error parsing resume: {str(e)}'},
@@ -1080,6 +678,60 @@ def parse_resume_api(request):
         )
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def parse_resume_batch_api(request):
+    """
+    Queue many resumes for parsing and return the job at once
+    Upload files as "resumes" (repeatable) and/or zip files as "archive";
+    poll parse-resume/batch/<job_id>/ for progress and results.
+    Answers 503 unless RESUME_BATCH_ENABLED (a worker is deployed).
+    """
+    if not settings.RESUME_BATCH_ENABLED:
+        return Response(
+            {'error': 'Batch resume parsing is not enabled; upload resumes one at a time'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    try:
+        uploads = collect_uploads(request.FILES.getlist('resumes'), request.FILES.getlist('archive'))
+        job = create_job(request.user, uploads)
+        return Response(ResumeParseJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+        
+    except ValueError as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        return Response(
+            {'error': f'Error queueing resumes: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def resume_batch_job(request, job_id):
+    """Progress, throughput (files/second) and per-file results of a batch resume job"""
+    try:
+        jobs = ResumeParseJob.objects.prefetch_related('files')
+        if not request.user.is_staff:
+            jobs = jobs.filter(created_by=request.user)
+        job = jobs.get(id=job_id)
+        return Response(ResumeParseJobSerializer(job).data, status=status.HTTP_200_OK)
+        
+    except ResumeParseJob.DoesNotExist:
+        return Response(
+            {'error': 'Job not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except Exception as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def ai_employee_insights(request):
@@ -1145,7 +797,10 @@ def ai_churn_prediction(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def ai_natural_language_search(request):
-    """Natural language search for employees"""
+    """
+    Natural language search for employees
+    Usage: {"query": "active backend developers in Development who joined after 2023", "page": 1, "page_size": 25}
+    """
     try:
         query = request.data.get('query', '')
         if not query:
@@ -1154,8 +809,17 @@ def ai_natural_language_search(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        results = EmployeeAIService.natural_language_search(query)
+        results = EmployeeAIService.natural_language_search(
+            query,
+            page=request.data.get('page', request.query_params.get('page', 1)),
+            page_size=request.data.get('page_size', request.query_params.get('page_size', 25)),
+        )
         return Response(results, status=status.HTTP_200_OK)
+    except ValueError as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     except Exception as e:
             return Response(
                 {'error': f'Error performing search: {str(e)}'},
@@ -1166,65 +830,13 @@ def ai_natural_language_search(request):
 # Dashboard AI Endpoints
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('ai_insights_comprehensive')
 def dashboard_ai_insights_comprehensive(request):
     """Get comprehensive AI-powered dashboard insights"""
     try:
-        from projects.models import Project
-        from tasks.models import Task
-        from finance.models import Income, Expense
-        from invoices.models import Invoice
-        
-        # Get project data
-        projects = Project.objects.all()
-        projects_data = {
-            'total': projects.count(),
-            'in_progress': projects.filter(status='in_progress').count(),
-            'completed': projects.filter(status='completed').count(),
-            'over_due': projects.filter(end_date__lt=timezone.now().date(), status__in=['in_progress', 'planning']).count()
-        }
-        
-        # Get financial data
-        total_revenue = sum([inv.amount for inv in Invoice.objects.filter(status='paid')])
-        total_cost = sum([exp.amount for exp in Expense.objects.all()])
-        planned_revenue = sum([inv.amount for inv in Invoice.objects.all()])
-        
-        financial_data = {
-            'total_revenue': float(total_revenue),
-            'total_cost': float(total_cost),
-            'planned_revenue': float(planned_revenue),
-            'current_month_revenue': float(sum([inv.amount for inv in Invoice.objects.filter(
-                status='paid',
-                created_at__month=timezone.now().month,
-                created_at__year=timezone.now().year
-            )]))
-        }
-        
-        # Get workload data
-        employees = Employee.objects.filter(is_active=True)
-        employee_task_counts = {}
-        for emp in employees:
-            employee_task_counts[emp.id] = Task.objects.filter(assigned_to=emp).count()
-        
-        healthy = sum(1 for count in employee_task_counts.values() if 5 <= count <= 15)
-        underutilised = sum(1 for count in employee_task_counts.values() if count < 5)
-        overutilised = sum(1 for count in employee_task_counts.values() if count > 15)
-        total = healthy + underutilised + overutilised
-        
-        workload_data = {
-            'healthy': round((healthy / total * 100) if total > 0 else 0),
-            'underutilised': round((underutilised / total * 100) if total > 0 else 0),
-            'overutilised': round((overutilised / total * 100) if total > 0 else 0)
-        }
-        
-        # Generate insights
-        insights = DashboardAIService.generate_dashboard_insights(
-            projects_data, financial_data, workload_data
-        )
-        
-        return Response({
-            'insights': insights,
-            'generated_at': timezone.now().isoformat()
-        }, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.ai_insights_comprehensive(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -1235,17 +847,13 @@ def dashboard_ai_insights_comprehensive(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('revenue_forecast')
 def dashboard_revenue_forecast(request):
     """Get revenue forecast for next N months"""
     try:
-        from invoices.models import Invoice
-        
-        months = int(request.GET.get('months', 3))
-        current_revenue = float(sum([inv.amount for inv in Invoice.objects.filter(status='paid')]))
-        
-        forecast = DashboardAIService.predict_revenue_forecast(current_revenue, months)
-        
-        return Response(forecast, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.revenue_forecast(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -1256,51 +864,13 @@ def dashboard_revenue_forecast(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('project_health_scores')
 def dashboard_project_health_scores(request):
     """Get health scores for all projects"""
     try:
-        from projects.models import Project
-        from tasks.models import Task
-        
-        projects = Project.objects.all()
-        health_scores = []
-        
-        for project in projects:
-            # Get project tasks
-            tasks = Task.objects.filter(project=project)
-            total_tasks = tasks.count()
-            completed_tasks = tasks.filter(status='completed').count()
-            
-            # Calculate spent (simplified - use actual expense tracking in production)
-            from finance.models import Expense
-            # Expense model doesn't have project field
-            spent = 0.0  # float(sum([exp.amount for exp in Expense.objects.filter(project=project)]))
-            
-            project_data = {
-                'id': project.id,
-                'title': project.title,
-                'end_date': project.end_date,
-                'start_date': project.start_date,
-                'budget': float(project.budget),
-                'spent': spent,
-                'progress': int((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0),
-                'total_tasks': total_tasks,
-                'completed_tasks': completed_tasks,
-                'status': project.status,
-                'team_workload': 0.5  # Simplified - calculate actual workload
-            }
-            
-            health = DashboardAIService.calculate_project_health_score(project_data)
-            health_scores.append({
-                'project_id': project.id,
-                'project_name': project.title,
-                **health
-            })
-        
-        return Response({
-            'health_scores': sorted(health_scores, key=lambda x: x['score']),
-            'average_score': sum([h['score'] for h in health_scores]) / len(health_scores) if health_scores else 0
-        }, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.project_health_scores(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -1311,46 +881,13 @@ def dashboard_project_health_scores(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('anomaly_detection')
 def dashboard_anomaly_detection(request):
     """Detect anomalies in projects and financial data"""
     try:
-        from projects.models import Project
-        from finance.models import Expense
-        from invoices.models import Invoice
-        
-        # Get projects with budget data
-        projects = []
-        for project in Project.objects.all():
-            # Expense model doesn't have project field
-            spent = 0.0  # float(sum([exp.amount for exp in Expense.objects.filter(project=project)]))
-            projects.append({
-                'id': project.id,
-                'title': project.title,
-                'budget': float(project.budget),
-                'spent': spent,
-                'end_date': project.end_date,
-                'status': project.status
-            })
-        
-        # Get financial data
-        total_revenue = float(sum([inv.amount for inv in Invoice.objects.filter(status='paid')]))
-        current_month_revenue = float(sum([inv.amount for inv in Invoice.objects.filter(
-            status='paid',
-            created_at__month=timezone.now().month,
-            created_at__year=timezone.now().year
-        )]))
-        
-        financial_data = {
-            'total_revenue': total_revenue,
-            'current_month_revenue': current_month_revenue
-        }
-        
-        anomalies = DashboardAIService.detect_anomalies(projects, financial_data)
-        
-        return Response({
-            'anomalies': anomalies,
-            'count': len(anomalies)
-        }, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.anomaly_detection(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -1361,71 +898,13 @@ def dashboard_anomaly_detection(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('smart_recommendations')
 def dashboard_smart_recommendations(request):
     """Get smart recommendations for resource allocation and optimization"""
     try:
-        from projects.models import Project
-        from tasks.models import Task
-        from finance.models import Expense
-        from invoices.models import Invoice
-        
-        # Get projects with health scores
-        projects = []
-        for project in Project.objects.all():
-            tasks = Task.objects.filter(project=project)
-            total_tasks = tasks.count()
-            completed_tasks = tasks.filter(status='completed').count()
-            
-            # Expense model doesn't have project field
-            spent = 0.0  # float(sum([exp.amount for exp in Expense.objects.filter(project=project)]))
-            
-            health = DashboardAIService.calculate_project_health_score({
-                'id': project.id,
-                'title': project.title,
-                'end_date': project.end_date,
-                'start_date': project.start_date,
-                'budget': float(project.budget),
-                'spent': spent,
-                'progress': int((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0),
-                'total_tasks': total_tasks,
-                'completed_tasks': completed_tasks,
-                'team_workload': 0.5
-            })
-            projects.append({
-                'id': project.id,
-                'title': project.title,
-                'health_score': health.get('score', 50)
-            })
-        
-        # Get employees with task counts
-        employees = []
-        for emp in Employee.objects.filter(is_active=True):
-            task_count = Task.objects.filter(assigned_to=emp).count()
-            employees.append({
-                'id': emp.id,
-                'name': emp.name,
-                'task_count': task_count,
-                'department': emp.department.title if emp.department else None,
-                'designation': emp.designation.title if emp.designation else None
-            })
-        
-        # Get financial data
-        total_revenue = float(sum([inv.amount for inv in Invoice.objects.filter(status='paid')]))
-        total_cost = float(sum([exp.amount for exp in Expense.objects.all()]))
-        
-        financial_data = {
-            'total_revenue': total_revenue,
-            'total_cost': total_cost
-        }
-        
-        recommendations = DashboardAIService.generate_smart_recommendations(
-            projects, employees, financial_data
-        )
-        
-        return Response({
-            'recommendations': recommendations,
-            'count': len(recommendations)
-        }, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.smart_recommendations(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -1436,88 +915,13 @@ def dashboard_smart_recommendations(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('risk_assessment')
 def dashboard_risk_assessment(request):
     """Get risk assessment for projects and employees"""
     try:
-        from projects.models import Project
-        from tasks.models import Task
-        from finance.models import Expense
-        
-        # Get projects with health data
-        projects = []
-        for project in Project.objects.all():
-            tasks = Task.objects.filter(project=project)
-            total_tasks = tasks.count()
-            completed_tasks = tasks.filter(status='completed').count()
-            
-            # Expense model doesn't have project field, so we'll use 0 for now
-            # In production, link expenses to projects or use a different calculation
-            spent = 0.0  # float(sum([exp.amount for exp in Expense.objects.filter(project=project)]))
-            
-            # Get assigned team members for this project
-            # Get unique employees assigned to tasks in this project
-            assigned_employees = []
-            assigned_employee_ids = set()
-            try:
-                for task in tasks.filter(assigned_to__isnull=False):
-                    if task.assigned_to and task.assigned_to.id not in assigned_employee_ids:
-                        assigned_employee_ids.add(task.assigned_to.id)
-                        try:
-                            assigned_employees.append({
-                                'id': task.assigned_to.id,
-                                'name': task.assigned_to.name or 'Unknown',
-                                'email': task.assigned_to.user.email if task.assigned_to.user else None,
-                                'designation': task.assigned_to.designation if task.assigned_to.designation else None,
-                                'department': task.assigned_to.department if task.assigned_to.department else None,
-                            })
-                        except Exception as e:
-                            # Skip this employee if there's an error accessing their data
-                            continue
-            except Exception as e:
-                # If there's an error, just continue with empty list
-                assigned_employees = []
-            
-            # Prepare full project data for risk calculation
-            project_data = {
-                'id': project.id,
-                'title': project.title,
-                'end_date': project.end_date,
-                'start_date': project.start_date,
-                'budget': float(project.budget),
-                'spent': spent,
-                'progress': int((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0),
-                'total_tasks': total_tasks,
-                'completed_tasks': completed_tasks,
-                'team_workload': 0.5,
-                'status': project.status,
-                'assigned_team_members': assigned_employees,
-            }
-            
-            projects.append(project_data)
-        
-        # Get employees with task counts
-        employees = []
-        for emp in Employee.objects.filter(is_active=True):
-            task_count = Task.objects.filter(assigned_to=emp).count()
-            # Calculate tenure
-            if emp.joining_date:
-                tenure_days = (timezone.now().date() - emp.joining_date).days
-            else:
-                tenure_days = 0
-            
-            employees.append({
-                'id': emp.id,
-                'name': emp.name,
-                'task_count': task_count,
-                'department': emp.department.title if emp.department else None,
-                'designation': emp.designation.title if emp.designation else None,
-                'is_active': emp.is_active,
-                'tenure_days': tenure_days
-            })
-        
-        risk_scores = DashboardAIService.calculate_risk_scores(projects, employees)
-        
-        return Response(risk_scores, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.risk_assessment(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -1529,62 +933,13 @@ def dashboard_risk_assessment(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('trend_predictions')
 def dashboard_trend_predictions(request):
     """Get trend predictions for revenue, projects, and costs"""
     try:
-        from invoices.models import Invoice
-        from finance.models import Expense
-        from projects.models import Project
-        
-        months = int(request.GET.get('months', 6))
-        
-        # Get actual total revenue and cost from all time
-        total_revenue = float(sum([inv.amount for inv in Invoice.objects.filter(status='paid')]))
-        total_cost = float(sum([exp.amount for exp in Expense.objects.all()]))
-        
-        # Get financial data (last 12 months) for trend analysis
-        financial_data = []
-        for i in range(12):
-            month_date = timezone.now() - timedelta(days=30 * i)
-            month_revenue = float(sum([inv.amount for inv in Invoice.objects.filter(
-                status='paid',
-                created_at__month=month_date.month,
-                created_at__year=month_date.year
-            )]))
-            month_cost = float(sum([exp.amount for exp in Expense.objects.filter(
-                date__month=month_date.month,
-                date__year=month_date.year
-            )]))
-            financial_data.append({
-                'revenue': month_revenue,
-                'cost': month_cost
-            })
-        
-        # If no monthly data, use average of total revenue/cost
-        if all(d['revenue'] == 0 for d in financial_data) and total_revenue > 0:
-            avg_monthly_revenue = total_revenue / 12
-            for d in financial_data:
-                d['revenue'] = avg_monthly_revenue
-        
-        if all(d['cost'] == 0 for d in financial_data) and total_cost > 0:
-            avg_monthly_cost = total_cost / 12
-            for d in financial_data:
-                d['cost'] = avg_monthly_cost
-        
-        # Get project data
-        project_data = []
-        for project in Project.objects.all():
-            project_data.append({
-                'id': project.id,
-                'title': project.title,
-                'status': project.status
-            })
-        
-        predictions = DashboardAIService.generate_trend_predictions(
-            financial_data, project_data, months
-        )
-        
-        return Response(predictions, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.trend_predictions(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -1597,70 +952,13 @@ def dashboard_trend_predictions(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('performance_benchmark')
 def dashboard_performance_benchmark(request):
     """Get performance benchmarks comparing current vs historical"""
     try:
-        from invoices.models import Invoice
-        from projects.models import Project
-        
-        # Get current month data
-        current_month = timezone.now()
-        current_revenue = float(sum([inv.amount for inv in Invoice.objects.filter(
-            status='paid',
-            created_at__month=current_month.month,
-            created_at__year=current_month.year
-        )]))
-        current_completed = Project.objects.filter(
-            status='completed',
-            end_date__month=current_month.month,
-            end_date__year=current_month.year
-        ).count()
-        
-        # Get historical data (last 6 months, excluding current month)
-        historical_data = []
-        for i in range(1, 7):  # Start from 1 to exclude current month
-            month_date = timezone.now() - timedelta(days=30 * i)
-            month_revenue = float(sum([inv.amount for inv in Invoice.objects.filter(
-                status='paid',
-                created_at__month=month_date.month,
-                created_at__year=month_date.year
-            )]))
-            month_completed = Project.objects.filter(
-                status='completed',
-                end_date__month=month_date.month,
-                end_date__year=month_date.year
-            ).count()
-            historical_data.append({
-                'revenue': month_revenue,
-                'completed_projects': month_completed
-            })
-        
-        # If no historical data, use total averages as fallback
-        if all(d['revenue'] == 0 for d in historical_data):
-            total_revenue = float(sum([inv.amount for inv in Invoice.objects.filter(status='paid')]))
-            total_completed = Project.objects.filter(status='completed').count()
-            if total_revenue > 0:
-                avg_monthly_revenue = total_revenue / max(1, len([d for d in historical_data if d['revenue'] > 0] or [1]))
-                for d in historical_data:
-                    if d['revenue'] == 0:
-                        d['revenue'] = avg_monthly_revenue
-        
-        if all(d['completed_projects'] == 0 for d in historical_data):
-            total_completed = Project.objects.filter(status='completed').count()
-            if total_completed > 0:
-                avg_monthly_completed = total_completed / max(1, len([d for d in historical_data if d['completed_projects'] > 0] or [1]))
-                for d in historical_data:
-                    if d['completed_projects'] == 0:
-                        d['completed_projects'] = avg_monthly_completed
-        
-        current_data = {
-            'revenue': current_revenue,
-            'completed_projects': current_completed
-        }
-        
-        benchmarks = DashboardAIService.benchmark_performance(current_data, historical_data)
-        
-        return Response(benchmarks, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.performance_benchmark(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -1672,69 +970,19 @@ def dashboard_performance_benchmark(request):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@cached_dashboard('natural_language_query')
 def dashboard_natural_language_query(request):
     """Process natural language queries for dashboard"""
+    query = request.data.get('query', '')
     try:
-        from invoices.models import Invoice
-        from projects.models import Project
-        from tasks.models import Task
-        
-        query = request.data.get('query', '')
         if not query:
             return Response({
                 'error': 'Query is required'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Prepare available data
-        current_revenue = float(sum([inv.amount for inv in Invoice.objects.filter(status='paid')]))
-        
-        projects = []
-        for project in Project.objects.all():
-            tasks = Task.objects.filter(project=project)
-            health = DashboardAIService.calculate_project_health_score({
-                'id': project.id,
-                'title': project.title,
-                'end_date': project.end_date,
-                'budget': float(project.budget),
-                'spent': 0,
-                'progress': 0,
-                'total_tasks': tasks.count(),
-                'completed_tasks': tasks.filter(status='completed').count(),
-                'team_workload': 0.5
-            })
-            projects.append({
-                'id': project.id,
-                'title': project.title,
-                'status': project.status,
-                'health_score': health.get('score', 50)
-            })
-        
-        # Get workload data
-        employees = Employee.objects.filter(is_active=True)
-        employee_task_counts = {}
-        for emp in employees:
-            employee_task_counts[emp.id] = Task.objects.filter(assigned_to=emp).count()
-        
-        healthy = sum(1 for count in employee_task_counts.values() if 5 <= count <= 15)
-        underutilised = sum(1 for count in employee_task_counts.values() if count < 5)
-        overutilised = sum(1 for count in employee_task_counts.values() if count > 15)
-        total = healthy + underutilised + overutilised
-        
-        workload_data = {
-            'healthy': round((healthy / total * 100) if total > 0 else 0),
-            'underutilised': round((underutilised / total * 100) if total > 0 else 0),
-            'overutilised': round((overutilised / total * 100) if total > 0 else 0)
-        }
-        
-        available_data = {
-            'current_revenue': current_revenue,
-            'projects': projects,
-            'workload': workload_data
-        }
-        
-        result = DashboardAIService.process_natural_language_query(query, available_data)
-        
-        return Response(result, status=status.HTTP_200_OK)
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.natural_language_query(metrics, request.data)
+        return Response(data, status=status.HTTP_200_OK)
         
     except Exception as e:
         return Response({
@@ -1743,3 +991,92 @@ def dashboard_natural_language_query(request):
             'intent': 'error',
             'message': 'Unable to process query'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cached_dashboard('employee_workload')
+def dashboard_employee_workload(request):
+    """
+    Get employees with their task counts from the workload index
+    Usage: ?band=underutilised|healthy|overutilised&page=1&page_size=10
+    """
+    try:
+        metrics = DashboardMetrics.for_request(request)
+        data = dashboard_widgets.employee_workload(metrics, request.query_params)
+        return Response(data, status=status.HTTP_200_OK)
+    
+    except ValueError as e:
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({
+            'error': f'Error fetching employee workload: {str(e)}'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cached_dashboard('batch')
+def dashboard_batch(request):
+    """
+    Get several dashboard widgets in one round trip.
+    Usage: ?widgets=summary,kanban_data,revenue_forecast&revenue_forecast.months=6
+    Parameters prefixed with a widget name only apply to that widget.
+    Figures shared between widgets are computed once for the whole request.
+    """
+    widgets = []
+    for value in request.query_params.getlist('widgets'):
+        for name in value.split(','):
+            if name.strip() and name.strip() not in widgets:
+                widgets.append(name.strip())
+    
+    if not widgets:
+        return Response({
+            'error': 'widgets is required',
+            'available_widgets': list(dashboard_widgets.WIDGETS)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    unknown = [name for name in widgets if name not in dashboard_widgets.WIDGETS]
+    if unknown:
+        return Response({
+            'error': f"Unknown widget(s): {', '.join(unknown)}",
+            'available_widgets': list(dashboard_widgets.WIDGETS)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    metrics = DashboardMetrics.for_request(request)
+    results = {}
+    errors = {}
+    for name in widgets:
+        # Shared parameters, overridden by "<widget>.<param>" ones
+        params = {key: request.query_params.get(key) for key in request.query_params if '.' not in key}
+        prefix = f'{name}.'
+        params.update({
+            key[len(prefix):]: request.query_params.get(key)
+            for key in request.query_params if key.startswith(prefix)
+        })
+        try:
+            results[name] = dashboard_widgets.WIDGETS[name](metrics, params)
+        except Exception as e:
+            errors[name] = str(e)
+    
+    return Response({
+        'widgets': results,
+        'errors': errors
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def dashboard_cache_stats(request):
+    """Get (or reset) hit/miss counters of the dashboard response cache"""
+    try:
+        if request.method == 'DELETE':
+            reset_cache_stats()
+        return Response(cache_stats(), status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response(
+            {'error': f'Error fetching cache stats: {str(e)}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
@@ -0,0 +1,129 @@
+"""
+Employee workload index
+EmployeeWorkload keeps total and open Task/SprintTask counts per employee.
+Signals apply +1/-1 deltas with F() updates when a task is created, deleted,
+reassigned or changes status, so dashboards read the counts (and the
+under-utilised/healthy/over-utilised bands) without counting tasks.
+"""
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Employee, EmployeeWorkload
+
+
+# Healthy range: 5-15 tasks per employee
+HEALTHY_MIN = 5
+HEALTHY_MAX = 15
+
+BANDS = ['underutilised', 'healthy', 'overutilised']
+
+TASK_OPEN_STATUSES = ['todo', 'in_progress', 'review', 'testing']
+SPRINT_TASK_OPEN_STATUSES = ['todo', 'pending', 'in_progress', 'in_review']
+
+# Employee counted by the index, column prefix and whether the task is open
+Contribution = Tuple[int, str, bool]
+
+
+def task_contribution(task) -> Optional[Contribution]:
+    if not task.assigned_to_id:
+        return None
+    return task.assigned_to_id, 'task', task.status in TASK_OPEN_STATUSES
+
+
+def sprint_task_contribution(sprint_task) -> Optional[Contribution]:
+    """Sprint tasks are assigned to users; count them for the user's employee profile"""
+    if not sprint_task.assigned_to_id:
+        return None
+    employee_id = (
+        Employee.objects.filter(user_id=sprint_task.assigned_to_id)
+        .values_list('id', flat=True)
+        .first()
+    )
+    if employee_id is None:
+        return None
+    return employee_id, 'sprint_task', sprint_task.status in SPRINT_TASK_OPEN_STATUSES
+
+
+def apply_contribution(contribution: Optional[Contribution], sign: int):
+    """Add (sign=1) or remove (sign=-1) one task from an employee's counts"""
+    if contribution is None:
+        return
+    employee_id, prefix, is_open = contribution
+    EmployeeWorkload.objects.get_or_create(employee_id=employee_id)
+    updates = {
+        f'{prefix}_total': F(f'{prefix}_total') + sign,
+        'updated_at': timezone.now(),
+    }
+    if is_open:
+        updates[f'{prefix}_open'] = F(f'{prefix}_open') + sign
+    EmployeeWorkload.objects.filter(employee_id=employee_id).update(**updates)
+
+
+@transaction.atomic
+def rebuild_workloads() -> int:
+    """Recompute the index for every employee with two grouped queries"""
+    from sprint.models import SprintTask
+    from tasks.models import Task
+
+    counts = defaultdict(lambda: defaultdict(int))
+    task_rows = (
+        Task.objects.filter(assigned_to__isnull=False)
+        .values('assigned_to_id')
+        .annotate(total=Count('id'), open=Count('id', filter=Q(status__in=TASK_OPEN_STATUSES)))
+    )
+    for row in task_rows:
+        counts[row['assigned_to_id']]['task_total'] = row['total']
+        counts[row['assigned_to_id']]['task_open'] = row['open']
+
+    sprint_task_rows = (
+        SprintTask.objects.filter(assigned_to__employee_profile__isnull=False)
+        .values('assigned_to__employee_profile__id')
+        .annotate(total=Count('id'), open=Count('id', filter=Q(status__in=SPRINT_TASK_OPEN_STATUSES)))
+    )
+    for row in sprint_task_rows:
+        employee_id = row['assigned_to__employee_profile__id']
+        counts[employee_id]['sprint_task_total'] = row['total']
+        counts[employee_id]['sprint_task_open'] = row['open']
+
+    employee_ids = Employee.objects.values_list('id', flat=True)
+    EmployeeWorkload.objects.all().delete()
+    EmployeeWorkload.objects.bulk_create([
+        EmployeeWorkload(employee_id=employee_id, **counts.get(employee_id, {}))
+        for employee_id in employee_ids
+    ], batch_size=500)
+    return len(employee_ids)
+
+
+def with_workload(queryset=None):
+    """Employees annotated with their indexed counts (0 when no row exists yet)"""
+    if queryset is None:
+        queryset = Employee.objects.all()
+    return queryset.annotate(**{
+        field: Coalesce(f'workload__{field}', Value(0), output_field=IntegerField())
+        for field in ('task_total', 'task_open', 'sprint_task_total', 'sprint_task_open')
+    })
+
+
+def band_filter(band: str) -> Q:
+    """Filter on an employee queryset annotated by with_workload()"""
+    if band == 'underutilised':
+        return Q(task_total__lt=HEALTHY_MIN)
+    if band == 'healthy':
+        return Q(task_total__gte=HEALTHY_MIN, task_total__lte=HEALTHY_MAX)
+    if band == 'overutilised':
+        return Q(task_total__gt=HEALTHY_MAX)
+    raise ValueError(f"Unknown band '{band}'. Choose from: {', '.join(BANDS)}")
+
+
+def band_counts() -> Dict[str, int]:
+    """Count active employees per workload band in one query"""
+    employees = with_workload(Employee.objects.filter(is_active=True))
+    return employees.aggregate(
+        total=Count('id'),
+        **{band: Count('id', filter=band_filter(band)) for band in BANDS}
+    )
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Income, Expense
+from .models import Income, Expense, MonthlyFinancialRollup
 
 
 @admin.register(Income)
@@ -20,3 +20,10 @@ class ExpenseAdmin(admin.ModelAdmin):
     date_hierarchy = 'date'
     ordering = ['-date', '-created_at']
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(MonthlyFinancialRollup)
+class MonthlyFinancialRollupAdmin(admin.ModelAdmin):
+    list_display = ['month', 'invoice_paid_amount', 'invoice_pending_amount', 'invoice_overdue_amount', 'income_amount', 'expense_amount', 'updated_at']
+    ordering = ['-month']
+    readonly_fields = ['updated_at']
@@ -0,0 +1,16 @@
+"""
+Management command to rebuild the monthly financial rollups from the ledgers
+Usage: python manage.py rebuild_financial_rollups
+"""
+from django.core.management.base import BaseCommand
+from finance.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute MonthlyFinancialRollup rows from all invoices, income and expenses'
+
+    def handle(self, *args, **options):
+        months = rebuild_rollups()
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully rebuilt financial rollups for {months} month(s).')
+        )
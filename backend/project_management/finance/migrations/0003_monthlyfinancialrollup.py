@@ -0,0 +1,75 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:09
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Invoice = apps.get_model('invoices', 'Invoice')
+    Income = apps.get_model('finance', 'Income')
+    Expense = apps.get_model('finance', 'Expense')
+    MonthlyFinancialRollup = apps.get_model('finance', 'MonthlyFinancialRollup')
+
+    rollups = {}
+
+    def add(month, prefix, total, count):
+        if month is None:
+            return
+        if hasattr(month, 'date'):
+            month = month.date()
+        month = month.replace(day=1)
+        rollup = rollups.setdefault(month, MonthlyFinancialRollup(month=month))
+        setattr(rollup, f'{prefix}_amount', total or 0)
+        setattr(rollup, f'{prefix}_count', count)
+
+    invoice_rows = Invoice.objects.annotate(month=TruncMonth('created_at')).values('month', 'status').annotate(
+        total=Sum('amount'), count=Count('id')
+    )
+    for row in invoice_rows:
+        if row['status'] in ('pending', 'paid', 'overdue'):
+            add(row['month'], f"invoice_{row['status']}", row['total'], row['count'])
+
+    for model, date_field, prefix in ((Income, 'income_date', 'income'), (Expense, 'date', 'expense')):
+        rows = model.objects.annotate(month=TruncMonth(date_field)).values('month').annotate(
+            total=Sum('amount'), count=Count('id')
+        )
+        for row in rows:
+            add(row['month'], prefix, row['total'], row['count'])
+
+    MonthlyFinancialRollup.objects.bulk_create(rollups.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0002_expense'),
+        ('invoices', '0002_alter_invoice_invoice_number'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyFinancialRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month these totals belong to', unique=True)),
+                ('invoice_pending_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('invoice_pending_count', models.IntegerField(default=0)),
+                ('invoice_paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('invoice_paid_count', models.IntegerField(default=0)),
+                ('invoice_overdue_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('invoice_overdue_count', models.IntegerField(default=0)),
+                ('income_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('income_count', models.IntegerField(default=0)),
+                ('expense_amount', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('expense_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Monthly Financial Rollup',
+                'verbose_name_plural': 'Monthly Financial Rollups',
+                'ordering': ['-month'],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -133,3 +133,40 @@ class Expense(models.Model):
     
     def __str__(self):
         return f"{self.name} - ₹{self.amount}"
+
+
+class MonthlyFinancialRollup(models.Model):
+    """Per-month totals of invoices (by status), income and expenses.
+
+    Kept up to date by signal handlers in finance.signals and rebuilt with
+    ``python manage.py rebuild_financial_rollups``.
+    """
+    month = models.DateField(
+        unique=True,
+        help_text="First day of the month these totals belong to"
+    )
+    invoice_pending_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    invoice_pending_count = models.IntegerField(default=0)
+    invoice_paid_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    invoice_paid_count = models.IntegerField(default=0)
+    invoice_overdue_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    invoice_overdue_count = models.IntegerField(default=0)
+    income_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    income_count = models.IntegerField(default=0)
+    expense_amount = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    expense_count = models.IntegerField(default=0)
+    
+    # Timestamps
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-month']
+        verbose_name = "Monthly Financial Rollup"
+        verbose_name_plural = "Monthly Financial Rollups"
+    
+    def __str__(self):
+        return f"Rollup {self.month:%Y-%m}"
+    
+    @property
+    def invoice_total_amount(self):
+        return self.invoice_pending_amount + self.invoice_paid_amount + self.invoice_overdue_amount
@@ -0,0 +1,164 @@
+"""
+Monthly financial rollups
+Keeps MonthlyFinancialRollup rows in step with Invoice, Income and Expense
+changes and provides the month-level reads used by the dashboard endpoints,
+so trend widgets read O(months) rows instead of the full ledger.
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Income, Expense, MonthlyFinancialRollup
+
+
+# Invoice status -> rollup column prefix
+INVOICE_STATUS_FIELDS = {
+    'pending': 'invoice_pending',
+    'paid': 'invoice_paid',
+    'overdue': 'invoice_overdue',
+}
+
+# Month a ledger row is booked under, amount it contributes and the column prefix it updates
+Contribution = Tuple[date, str, Decimal]
+
+
+def month_start(value) -> date:
+    """Return the first day of the month for a date, datetime or ISO string"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    return value.replace(day=1)
+
+
+def add_months(month: date, offset: int) -> date:
+    """Shift a first-of-month date by a number of months"""
+    index = month.year * 12 + month.month - 1 + offset
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _amount(value) -> Decimal:
+    return Decimal(str(value or 0))
+
+
+def invoice_contribution(invoice) -> Optional[Contribution]:
+    """Invoices are booked under the month they were created, split by status"""
+    prefix = INVOICE_STATUS_FIELDS.get(invoice.status)
+    if prefix is None or invoice.created_at is None:
+        return None
+    return month_start(invoice.created_at), prefix, _amount(invoice.amount)
+
+
+def income_contribution(income) -> Optional[Contribution]:
+    if not income.income_date:
+        return None
+    return month_start(income.income_date), 'income', _amount(income.amount)
+
+
+def expense_contribution(expense) -> Optional[Contribution]:
+    if not expense.date:
+        return None
+    return month_start(expense.date), 'expense', _amount(expense.amount)
+
+
+def apply_contribution(contribution: Optional[Contribution], sign: int):
+    """Add (sign=1) or remove (sign=-1) a ledger row from its month with an atomic UPDATE"""
+    if contribution is None:
+        return
+    month, prefix, amount = contribution
+    MonthlyFinancialRollup.objects.get_or_create(month=month)
+    MonthlyFinancialRollup.objects.filter(month=month).update(**{
+        f'{prefix}_amount': F(f'{prefix}_amount') + amount * sign,
+        f'{prefix}_count': F(f'{prefix}_count') + sign,
+        'updated_at': timezone.now(),
+    })
+
+
+@transaction.atomic
+def rebuild_rollups() -> int:
+    """Recompute every rollup row from the ledgers with grouped queries"""
+    from invoices.models import Invoice
+
+    rollups = {}
+
+    def bucket(month) -> MonthlyFinancialRollup:
+        month = month_start(month)
+        if month not in rollups:
+            rollups[month] = MonthlyFinancialRollup(month=month)
+        return rollups[month]
+
+    invoice_rows = (
+        Invoice.objects.annotate(month=TruncMonth('created_at'))
+        .values('month', 'status')
+        .annotate(total=Sum('amount'), count=Count('id'))
+    )
+    for row in invoice_rows:
+        prefix = INVOICE_STATUS_FIELDS.get(row['status'])
+        if prefix is None or row['month'] is None:
+            continue
+        rollup = bucket(row['month'])
+        setattr(rollup, f'{prefix}_amount', row['total'] or 0)
+        setattr(rollup, f'{prefix}_count', row['count'])
+
+    ledgers = [
+        (Income.objects, 'income_date', 'income'),
+        (Expense.objects, 'date', 'expense'),
+    ]
+    for manager, date_field, prefix in ledgers:
+        rows = (
+            manager.annotate(month=TruncMonth(date_field))
+            .values('month')
+            .annotate(total=Sum('amount'), count=Count('id'))
+        )
+        for row in rows:
+            if row['month'] is None:
+                continue
+            rollup = bucket(row['month'])
+            setattr(rollup, f'{prefix}_amount', row['total'] or 0)
+            setattr(rollup, f'{prefix}_count', row['count'])
+
+    MonthlyFinancialRollup.objects.all().delete()
+    MonthlyFinancialRollup.objects.bulk_create(rollups.values(), batch_size=500)
+    return len(rollups)
+
+
+def financial_totals() -> Dict[str, float]:
+    """All-time totals summed over the monthly rows"""
+    totals = MonthlyFinancialRollup.objects.aggregate(
+        paid_revenue=Sum('invoice_paid_amount'),
+        pending=Sum('invoice_pending_amount'),
+        overdue=Sum('invoice_overdue_amount'),
+        income=Sum('income_amount'),
+        cost=Sum('expense_amount'),
+    )
+    totals = {key: float(value or 0) for key, value in totals.items()}
+    totals['invoiced'] = totals.pop('pending') + totals.pop('overdue') + totals['paid_revenue']
+    return totals
+
+
+def monthly_series(months: int, end=None) -> List[Dict]:
+    """Totals for the last `months` calendar months, newest month first"""
+    end_month = month_start(end or timezone.now())
+    start_month = add_months(end_month, -(months - 1))
+    rows = {
+        rollup.month: rollup
+        for rollup in MonthlyFinancialRollup.objects.filter(month__gte=start_month, month__lte=end_month)
+    }
+
+    series = []
+    for offset in range(months):
+        month = add_months(end_month, -offset)
+        rollup = rows.get(month)
+        series.append({
+            'month': month,
+            'paid_revenue': float(rollup.invoice_paid_amount) if rollup else 0.0,
+            'invoiced': float(rollup.invoice_total_amount) if rollup else 0.0,
+            'income': float(rollup.income_amount) if rollup else 0.0,
+            'cost': float(rollup.expense_amount) if rollup else 0.0,
+        })
+    return series
@@ -0,0 +1,48 @@
+"""
+Signal handlers keeping the monthly financial rollups up to date
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from invoices.models import Invoice
+from .models import Income, Expense
+from . import rollups
+
+
+# Ledger model -> (fields the rollup depends on, contribution function)
+ROLLUP_SOURCES = {
+    Invoice: (('created_at', 'status', 'amount'), rollups.invoice_contribution),
+    Income: (('income_date', 'amount'), rollups.income_contribution),
+    Expense: (('date', 'amount'), rollups.expense_contribution),
+}
+
+
+def remember_previous_contribution(sender, instance, **kwargs):
+    """Load the stored row before an update so its old month/amount can be removed"""
+    instance._rollup_previous = None
+    if instance.pk is None:
+        return
+    fields, contribution = ROLLUP_SOURCES[sender]
+    previous = sender.objects.filter(pk=instance.pk).only(*fields).first()
+    if previous is not None:
+        instance._rollup_previous = contribution(previous)
+
+
+def apply_saved_contribution(sender, instance, **kwargs):
+    fields, contribution = ROLLUP_SOURCES[sender]
+    previous = getattr(instance, '_rollup_previous', None)
+    current = contribution(instance)
+    if previous == current:
+        return
+    rollups.apply_contribution(previous, -1)
+    rollups.apply_contribution(current, 1)
+
+
+def remove_deleted_contribution(sender, instance, **kwargs):
+    fields, contribution = ROLLUP_SOURCES[sender]
+    rollups.apply_contribution(contribution(instance), -1)
+
+
+for model in ROLLUP_SOURCES:
+    pre_save.connect(remember_previous_contribution, sender=model, dispatch_uid=f'rollup_pre_save_{model.__name__}')
+    post_save.connect(apply_saved_contribution, sender=model, dispatch_uid=f'rollup_post_save_{model.__name__}')
+    post_delete.connect(remove_deleted_contribution, sender=model, dispatch_uid=f'rollup_post_delete_{model.__name__}')
@@ -1,3 +1,66 @@
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
 
-# Create your tests here.
+from invoices.models import Invoice
+
+from .models import Expense, Income, MonthlyFinancialRollup
+from .rollups import rebuild_rollups
+
+
+class MonthlyRollupTests(TestCase):
+    def rollup(self, month):
+        return MonthlyFinancialRollup.objects.get(month=month)
+
+    def rows(self):
+        return list(MonthlyFinancialRollup.objects.order_by('month').values())
+
+    def test_expense_changes_move_between_months(self):
+        expense = Expense.objects.create(name='Laptop', amount=100, date=date(2026, 1, 15), purchased_from='Shop')
+        Expense.objects.create(name='Mouse', amount=20, date=date(2026, 1, 20), purchased_from='Shop')
+        self.assertEqual(self.rollup(date(2026, 1, 1)).expense_amount, Decimal('120'))
+        self.assertEqual(self.rollup(date(2026, 1, 1)).expense_count, 2)
+
+        expense.date = date(2026, 2, 1)
+        expense.amount = 150
+        expense.save()
+        self.assertEqual(self.rollup(date(2026, 1, 1)).expense_amount, Decimal('20'))
+        self.assertEqual(self.rollup(date(2026, 1, 1)).expense_count, 1)
+        self.assertEqual(self.rollup(date(2026, 2, 1)).expense_amount, Decimal('150'))
+
+        expense.delete()
+        self.assertEqual(self.rollup(date(2026, 2, 1)).expense_amount, 0)
+        self.assertEqual(self.rollup(date(2026, 2, 1)).expense_count, 0)
+
+    def test_invoice_status_change_moves_the_amount(self):
+        invoice = Invoice.objects.create(amount=500, status='pending', due_date=date(2026, 3, 1))
+        month = MonthlyFinancialRollup.objects.get()
+        self.assertEqual((month.invoice_pending_amount, month.invoice_paid_amount), (Decimal('500'), 0))
+
+        invoice.status = 'paid'
+        invoice.save()
+        month.refresh_from_db()
+        self.assertEqual((month.invoice_pending_amount, month.invoice_paid_amount), (0, Decimal('500')))
+        self.assertEqual((month.invoice_pending_count, month.invoice_paid_count), (0, 1))
+
+    def test_rebuild_matches_incremental_updates(self):
+        Income.objects.create(amount=300, payment_id='P-1', income_date=date(2026, 1, 5))
+        income = Income.objects.create(amount=200, payment_id='P-2', income_date=date(2026, 1, 6))
+        income.income_date = date(2025, 12, 31)
+        income.save()
+        Expense.objects.create(name='Rent', amount=80, date=date(2026, 1, 1), purchased_from='Landlord')
+        Invoice.objects.create(amount=40, status='overdue', due_date=date(2026, 1, 1))
+        incremental = [
+            {key: value for key, value in row.items() if key not in ('id', 'updated_at')}
+            for row in self.rows()
+        ]
+
+        rebuild_rollups()
+
+        rebuilt = [
+            {key: value for key, value in row.items() if key not in ('id', 'updated_at')}
+            for row in self.rows()
+        ]
+        # The incremental rows may include emptied months; rebuilt ones never do
+        self.assertEqual([row for row in incremental if any(row[key] for key in row if key != 'month')], rebuilt)
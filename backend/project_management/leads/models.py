@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from employee.models import Employee
 
 
@@ -32,6 +33,9 @@ class Lead(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['name'], name='lead_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover - simple representation
         return f"Lead({self.name})"
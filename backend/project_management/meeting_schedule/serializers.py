@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from .models import Meeting
 from employee.models import Employee
+from employee.display_names import DisplayNameListSerializer, resolver_for
 
 
 class UserMiniSerializer(serializers.ModelSerializer):
@@ -28,16 +29,14 @@ class MeetingListSerializer(serializers.ModelSerializer):
             "scheduled_by_employee",
             "attendee_count",
         ]
+        list_serializer_class = DisplayNameListSerializer
+        display_name_fields = ["scheduled_by_id"]
 
     def get_attendee_count(self, obj):
         return obj.attendees.count()
 
     def get_scheduled_by_employee(self, obj):
-        if obj.scheduled_by_id:
-            emp = Employee.objects.filter(user_id=obj.scheduled_by_id).only('id', 'name').first()
-            if emp:
-                return {"id": emp.id, "name": emp.name}
-        return None
+        return resolver_for(self).employee(obj.scheduled_by_id)
 
 
 class MeetingSerializer(serializers.ModelSerializer):
@@ -117,16 +116,12 @@ class MeetingSerializer(serializers.ModelSerializer):
         return meeting
 
     def get_scheduled_by_employee(self, obj):
-        if obj.scheduled_by_id:
-            emp = Employee.objects.filter(user_id=obj.scheduled_by_id).only('id', 'name').first()
-            if emp:
-                return {"id": emp.id, "name": emp.name}
-        return None
+        return resolver_for(self).employee(obj.scheduled_by_id)
 
     def get_attendee_employees(self, obj):
         user_ids = list(obj.attendees.values_list('id', flat=True))
-        if not user_ids:
-            return []
-        employees = Employee.objects.filter(user_id__in=user_ids).only('id', 'name')
-        return [{"id": e.id, "name": e.name} for e in employees]
+        resolver = resolver_for(self)
+        resolver.prime(user_ids)
+        employees = [resolver.employee(user_id) for user_id in user_ids]
+        return [employee for employee in employees if employee]
 
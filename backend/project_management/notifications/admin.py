@@ -1,10 +1,11 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Notification, NotificationOutbox, NotificationPreference
+from .outbox import requeue_dead
 
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ['title', 'user', 'type', 'read', 'created_at']
+    list_display = ['title', 'user', 'type', 'count', 'read', 'created_at']
     list_filter = ['type', 'read', 'created_at']
     search_fields = ['title', 'message', 'user__username', 'user__email']
     readonly_fields = ['created_at', 'read_at']
@@ -15,10 +16,31 @@ class NotificationAdmin(admin.ModelAdmin):
             'fields': ('user', 'type', 'title', 'message')
         }),
         ('Status', {
-            'fields': ('read', 'read_at', 'created_at')
+            'fields': ('read', 'read_at', 'created_at', 'count', 'updated_at')
         }),
         ('Related Object', {
             'fields': ('related_object_type', 'related_object_id', 'action_url'),
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ['title', 'type', 'status', 'attempts', 'available_at', 'created_at', 'processed_at']
+    list_filter = ['status', 'type']
+    search_fields = ['title', 'last_error']
+    readonly_fields = ['created_at', 'processed_at', 'last_error']
+    actions = ['requeue']
+    
+    @admin.action(description='Requeue selected dead letters')
+    def requeue(self, request, queryset):
+        count = requeue_dead(list(queryset.values_list('id', flat=True)))
+        self.message_user(request, f'{count} dead letter(s) requeued.')
+
+
+@admin.register(NotificationPreference)
+class NotificationPreferenceAdmin(admin.ModelAdmin):
+    list_display = ['user', 'digest', 'last_digest_at']
+    list_filter = ['digest']
+    search_fields = ['user__username', 'user__email']
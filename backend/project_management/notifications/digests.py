@@ -0,0 +1,107 @@
+"""
+Notification digests
+A user whose NotificationPreference.digest is hourly or daily does not get a
+row per event: create_for_users counts the event in the user's
+NotificationDigestItem for its type (a counter plus the latest title and
+message). The send_notification_digests command, run from cron, turns each
+due user's items into one 'digest' notification. IMMEDIATE_TYPES are never
+held back.
+"""
+from datetime import timedelta
+from itertools import groupby
+from typing import Dict, Iterable, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Notification, NotificationDigestItem, NotificationPreference
+
+
+IMMEDIATE_TYPES = {'deadline_approaching', 'system', 'warning', 'digest'}
+
+DIGEST_INTERVALS = {
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1),
+}
+
+TYPE_LABELS = dict(Notification.NOTIFICATION_TYPES)
+
+
+def digest_user_ids(user_ids: Iterable[int], notification_type: str) -> Set[int]:
+    """The users among user_ids who get notification_type in their digest"""
+    if notification_type in IMMEDIATE_TYPES or not user_ids:
+        return set()
+    return set(
+        NotificationPreference.objects.filter(user_id__in=user_ids, digest__in=DIGEST_INTERVALS)
+        .values_list('user_id', flat=True)
+    )
+
+
+def add_to_digests(user_ids: Iterable[int], notification_type: str, title: str, message: str):
+    """Count the event in each user's digest item: one INSERT for missing items, one UPDATE"""
+    user_ids = list(user_ids)
+    now = timezone.now()
+    NotificationDigestItem.objects.bulk_create(
+        [
+            NotificationDigestItem(user_id=user_id, type=notification_type, title=title, message=message, last_at=now)
+            for user_id in user_ids
+        ],
+        ignore_conflicts=True
+    )
+    NotificationDigestItem.objects.filter(user_id__in=user_ids, type=notification_type).update(
+        count=F('count') + 1, title=title, message=message, last_at=now
+    )
+
+
+def due_user_ids(now=None):
+    """Users with pending items whose digest interval has passed (or who turned digests off)"""
+    now = now or timezone.now()
+    due = Q(digest='off')
+    for digest, interval in DIGEST_INTERVALS.items():
+        due |= Q(digest=digest) & (Q(last_digest_at__isnull=True) | Q(last_digest_at__lte=now - interval))
+    pending = NotificationDigestItem.objects.filter(count__gt=0).values('user_id')
+    return NotificationPreference.objects.filter(due, user_id__in=pending).values_list('user_id', flat=True)
+
+
+def build_digest(user_id: int, items) -> Notification:
+    total = sum(item.count for item in items)
+    lines = [
+        f"{item.count} x {TYPE_LABELS.get(item.type, item.type)}: {item.message}"
+        for item in sorted(items, key=lambda item: -item.count)
+    ]
+    return Notification(
+        user_id=user_id,
+        type='digest',
+        title=f"{total} update{'s' if total > 1 else ''} since your last digest",
+        message='\n'.join(lines),
+        count=total
+    )
+
+
+def send_digests(now=None, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    One digest notification per due user, batch_size users per transaction.
+    The items are locked while they are read and zeroed, so an event counted
+    concurrently waits and lands in the next digest.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+    user_ids = list(due_user_ids(now))
+    result = {'users': 0, 'events': 0}
+    for start in range(0, len(user_ids), batch_size):
+        chunk = user_ids[start:start + batch_size]
+        with transaction.atomic():
+            items = list(
+                NotificationDigestItem.objects.select_for_update()
+                .filter(user_id__in=chunk, count__gt=0)
+                .order_by('user_id', 'type')
+            )
+            digests = [build_digest(user_id, list(group)) for user_id, group in groupby(items, lambda item: item.user_id)]
+            Notification.insert(digests)
+            NotificationDigestItem.objects.filter(id__in=[item.id for item in items]).update(count=0)
+            NotificationPreference.objects.filter(user_id__in=chunk).update(last_digest_at=now)
+        result['users'] += len(digests)
+        result['events'] += sum(item.count for item in items)
+    return result
@@ -0,0 +1,67 @@
+"""
+Management command for the optional monthly partitioning of notifications (PostgreSQL)
+--convert prints the statements turning the table into monthly range
+partitions (add --apply to run them; the table is locked while rows are
+copied). On a partitioned table, --ensure creates the coming months and
+--keep-months drops whole months older than that, archiving their read
+notifications first.
+Usage: python manage.py partition_notifications --convert [--apply]
+       python manage.py partition_notifications --ensure 3 --keep-months 12
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from notifications import partitions
+
+
+class Command(BaseCommand):
+    help = 'Convert notifications to monthly partitions, create upcoming months and drop old ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert', action='store_true', help='Show (or with --apply, run) the conversion')
+        parser.add_argument('--apply', action='store_true', help='Run the conversion instead of printing it')
+        parser.add_argument('--ensure', type=int, default=None, metavar='MONTHS',
+                            help='Create partitions for this month and the next MONTHS months')
+        parser.add_argument('--keep-months', type=int, default=None, metavar='MONTHS',
+                            help='Drop partitions older than the last MONTHS months (read rows are archived)')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Partitioning needs PostgreSQL.')
+        if not (options['convert'] or options['ensure'] is not None or options['keep_months'] is not None):
+            raise CommandError('Pass --convert, --ensure or --keep-months.')
+
+        if options['convert']:
+            if partitions.is_partitioned():
+                raise CommandError('The notification table is already partitioned.')
+            months_ahead = options['ensure'] if options['ensure'] is not None else 3
+            if not options['apply']:
+                this_month = partitions.month_start(date.today())
+                for statement in partitions.conversion_sql(this_month, partitions.add_months(this_month, months_ahead)):
+                    self.stdout.write(f'{statement};')
+                self.stdout.write(self.style.WARNING(
+                    'Dry run: partitions are created from the oldest notification month when applied. '
+                    'Re-run with --apply to convert.'
+                ))
+                return
+            partitions.convert(months_ahead)
+            self.stdout.write(self.style.SUCCESS('Successfully converted notifications to monthly partitions.'))
+            return
+
+        if not partitions.is_partitioned():
+            raise CommandError('The notification table is not partitioned; run --convert first.')
+
+        if options['ensure'] is not None:
+            created = partitions.ensure_partitions(options['ensure'])
+            self.stdout.write(self.style.SUCCESS(f'Successfully created {len(created)} partition(s).'))
+
+        if options['keep_months'] is not None:
+            if options['keep_months'] < 1:
+                raise CommandError('--keep-months must be positive')
+            cutoff = partitions.add_months(partitions.month_start(date.today()), 1 - options['keep_months'])
+            dropped = partitions.drop_partitions_before(cutoff)
+            self.stdout.write(self.style.SUCCESS(
+                f"Successfully dropped {len(dropped)} partition(s) before {cutoff:%Y-%m}."
+            ))
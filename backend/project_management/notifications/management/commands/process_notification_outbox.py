@@ -0,0 +1,56 @@
+"""
+Management command running the notification outbox worker
+Claims pending outbox rows in batches and writes their notifications;
+failing rows are retried with backoff and dead-lettered after
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS attempts. Several workers can run at once
+on PostgreSQL (rows are claimed with SKIP LOCKED).
+Usage: python manage.py process_notification_outbox [--once] [--batch-size 100] [--sleep 1]
+       python manage.py process_notification_outbox --requeue-dead
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notifications.outbox import outbox_counts, process_batch, requeue_dead
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued notifications from the outbox (runs until interrupted unless --once)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when no due rows are left')
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows claimed per batch')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Seconds to wait when the outbox is empty')
+        parser.add_argument('--requeue-dead', action='store_true', help='Move dead letters back to pending and exit')
+
+    def handle(self, *args, **options):
+        if options['requeue_dead']:
+            count = requeue_dead()
+            self.stdout.write(self.style.SUCCESS(f'Successfully requeued {count} dead letter(s).'))
+            return
+
+        totals = {'delivered': 0, 'notifications': 0, 'retried': 0, 'dead': 0}
+        try:
+            while True:
+                close_old_connections()
+                result = process_batch(options['batch_size'])
+                for key in totals:
+                    totals[key] += result[key]
+                if result['retried'] or result['dead']:
+                    self.stdout.write(self.style.WARNING(
+                        f"{result['retried']} row(s) will be retried, {result['dead']} dead-lettered."
+                    ))
+                if not result['claimed']:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping outbox worker.')
+
+        counts = outbox_counts()
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully delivered {totals['delivered']} outbox row(s) "
+            f"({totals['notifications']} notification(s)); "
+            f"{counts['pending']} pending, {counts['dead']} dead letter(s)."
+        ))
@@ -0,0 +1,50 @@
+"""
+Management command applying the notification retention policy
+Archives read notifications older than NOTIFICATION_RETENTION_DAYS, then
+deletes expired archive rows, delivered outbox rows and delta sync
+tombstones. Work is done in bounded batches, each in its own short
+transaction; run it from cron.
+Usage: python manage.py purge_notifications [--days 90] [--batch-size 1000] [--max-batches N] [--sleep 0.1]
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from notifications.retention import archive_read_notifications, purge_archive, purge_outbox, purge_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Archive old read notifications and purge expired archive, outbox and tombstone rows in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.NOTIFICATION_RETENTION_DAYS,
+                            help='Archive read notifications older than this many days')
+        parser.add_argument('--archive-days', type=int, default=settings.NOTIFICATION_ARCHIVE_RETENTION_DAYS,
+                            help='Delete archived notifications older than this many days (0 keeps them)')
+        parser.add_argument('--outbox-days', type=int, default=settings.NOTIFICATION_OUTBOX_RETENTION_DAYS,
+                            help='Delete delivered outbox rows older than this many days (0 keeps them)')
+        parser.add_argument('--batch-size', type=int, default=settings.NOTIFICATION_PURGE_BATCH_SIZE,
+                            help='Rows per transaction')
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='Stop each step after this many batches (resume on the next run)')
+        parser.add_argument('--sleep', type=float, default=0.0,
+                            help='Seconds to pause between batches to spread the load')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--days and --batch-size must be positive')
+        batches = {
+            'batch_size': options['batch_size'],
+            'max_batches': options['max_batches'],
+            'pause': options['sleep'],
+        }
+
+        archived = archive_read_notifications(options['days'], **batches)
+        expired = purge_archive(options['archive_days'], **batches) if options['archive_days'] > 0 else 0
+        outbox = purge_outbox(options['outbox_days'], **batches) if options['outbox_days'] > 0 else 0
+        tombstones = purge_tombstones(settings.NOTIFICATION_SYNC_TOMBSTONE_DAYS, **batches)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully archived {archived} read notification(s), '
+            f'deleted {expired} expired archive row(s), {outbox} delivered outbox row(s) '
+            f'and {tombstones} sync tombstone(s).'
+        ))
@@ -0,0 +1,28 @@
+"""
+Management command to recount unread notifications and repair the cached counters
+Usage: python manage.py reconcile_unread_counts [--user <id> ...]
+"""
+from django.core.management.base import BaseCommand
+from notifications.unread import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute UnreadCounter rows from the notifications and drop drifted cached counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            action='append',
+            dest='user_ids',
+            help='Only reconcile this user id (repeatable)',
+        )
+
+    def handle(self, *args, **options):
+        result = reconcile_counters(options['user_ids'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully reconciled unread counts for {result['checked']} user(s); "
+                f"{result['corrected']} corrected."
+            )
+        )
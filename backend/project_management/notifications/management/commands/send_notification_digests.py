@@ -0,0 +1,26 @@
+"""
+Management command to send hourly/daily notification digests (run it from cron, e.g. every 15 minutes)
+Usage: python manage.py send_notification_digests [--batch-size 1000]
+"""
+from django.core.management.base import BaseCommand
+from notifications.digests import send_digests
+
+
+class Command(BaseCommand):
+    help = 'Turn the pending digest items of every due user into one digest notification'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Users per transaction (default NOTIFICATION_BATCH_SIZE)',
+        )
+
+    def handle(self, *args, **options):
+        result = send_digests(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Successfully sent {result['users']} digest(s) covering {result['events']} event(s)."
+            )
+        )
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    Notification = apps.get_model('notifications', 'Notification')
+    UnreadCounter = apps.get_model('notifications', 'UnreadCounter')
+
+    rows = Notification.objects.filter(read=False).values('user_id').annotate(count=Count('id'))
+    UnreadCounter.objects.bulk_create([
+        UnreadCounter(user_id=row['user_id'], unread=row['count']) for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='unread_notifications', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
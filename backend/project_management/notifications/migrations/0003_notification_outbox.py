@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_unread_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_ids', models.JSONField(default=list)),
+                ('type', models.CharField(choices=[('task_assigned', 'Task Assigned'), ('task_completed', 'Task Completed'), ('task_updated', 'Task Updated'), ('sprint_created', 'Sprint Created'), ('sprint_updated', 'Sprint Updated'), ('employee_added', 'Employee Added'), ('employee_updated', 'Employee Updated'), ('project_created', 'Project Created'), ('project_updated', 'Project Updated'), ('meeting_scheduled', 'Meeting Scheduled'), ('deadline_approaching', 'Deadline Approaching'), ('comment_added', 'Comment Added'), ('system', 'System Notification'), ('info', 'Info'), ('warning', 'Warning'), ('success', 'Success')], default='info', max_length=50)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('related_object_type', models.CharField(blank=True, max_length=50, null=True)),
+                ('related_object_id', models.IntegerField(blank=True, null=True)),
+                ('action_url', models.CharField(blank=True, max_length=500, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('dead', 'Dead Letter')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'available_at'], name='notificatio_status_a0e682_idx')],
+            },
+        ),
+    ]
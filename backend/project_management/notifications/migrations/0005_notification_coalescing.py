@@ -0,0 +1,84 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:51
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    Notification = apps.get_model('notifications', 'Notification')
+    Notification.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('notifications', '0004_notification_retention'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDigestItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('task_assigned', 'Task Assigned'), ('task_completed', 'Task Completed'), ('task_updated', 'Task Updated'), ('sprint_created', 'Sprint Created'), ('sprint_updated', 'Sprint Updated'), ('employee_added', 'Employee Added'), ('employee_updated', 'Employee Updated'), ('project_created', 'Project Created'), ('project_updated', 'Project Updated'), ('meeting_scheduled', 'Meeting Scheduled'), ('deadline_approaching', 'Deadline Approaching'), ('comment_added', 'Comment Added'), ('system', 'System Notification'), ('info', 'Info'), ('warning', 'Warning'), ('success', 'Success'), ('digest', 'Digest')], max_length=50)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('last_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['user', 'type'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificationPreference',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_preference', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('digest', models.CharField(choices=[('off', 'Immediately'), ('hourly', 'Hourly Digest'), ('daily', 'Daily Digest')], default='off', max_length=20)),
+                ('last_digest_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('task_assigned', 'Task Assigned'), ('task_completed', 'Task Completed'), ('task_updated', 'Task Updated'), ('sprint_created', 'Sprint Created'), ('sprint_updated', 'Sprint Updated'), ('employee_added', 'Employee Added'), ('employee_updated', 'Employee Updated'), ('project_created', 'Project Created'), ('project_updated', 'Project Updated'), ('meeting_scheduled', 'Meeting Scheduled'), ('deadline_approaching', 'Deadline Approaching'), ('comment_added', 'Comment Added'), ('system', 'System Notification'), ('info', 'Info'), ('warning', 'Warning'), ('success', 'Success'), ('digest', 'Digest')], default='info', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='notificationarchive',
+            name='type',
+            field=models.CharField(choices=[('task_assigned', 'Task Assigned'), ('task_completed', 'Task Completed'), ('task_updated', 'Task Updated'), ('sprint_created', 'Sprint Created'), ('sprint_updated', 'Sprint Updated'), ('employee_added', 'Employee Added'), ('employee_updated', 'Employee Updated'), ('project_created', 'Project Created'), ('project_updated', 'Project Updated'), ('meeting_scheduled', 'Meeting Scheduled'), ('deadline_approaching', 'Deadline Approaching'), ('comment_added', 'Comment Added'), ('system', 'System Notification'), ('info', 'Info'), ('warning', 'Warning'), ('success', 'Success'), ('digest', 'Digest')], max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='notificationoutbox',
+            name='type',
+            field=models.CharField(choices=[('task_assigned', 'Task Assigned'), ('task_completed', 'Task Completed'), ('task_updated', 'Task Updated'), ('sprint_created', 'Sprint Created'), ('sprint_updated', 'Sprint Updated'), ('employee_added', 'Employee Added'), ('employee_updated', 'Employee Updated'), ('project_created', 'Project Created'), ('project_updated', 'Project Updated'), ('meeting_scheduled', 'Meeting Scheduled'), ('deadline_approaching', 'Deadline Approaching'), ('comment_added', 'Comment Added'), ('system', 'System Notification'), ('info', 'Info'), ('warning', 'Warning'), ('success', 'Success'), ('digest', 'Digest')], default='info', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('read', False)), fields=['user', 'related_object_type', 'related_object_id'], name='notification_coalesce_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationdigestitem',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_digest_items', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationdigestitem',
+            constraint=models.UniqueConstraint(fields=('user', 'type'), name='notification_digest_item_unique'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0005_notification_coalescing'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['deleted_at'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notification_user_recent_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notification_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='notification_user_sync_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationtombstone',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='notificationtombstone',
+            index=models.Index(fields=['user', 'deleted_at'], name='notif_tombstone_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationtombstone',
+            index=models.Index(fields=['deleted_at'], name='notif_tombstone_deleted_idx'),
+        ),
+    ]
@@ -1,7 +1,14 @@
-from django.db import models
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F, Q
 from django.contrib.auth.models import User
 from django.utils import timezone
 
+from .versions import touch
+
 
 class Notification(models.Model):
     """Notification model for real-time user notifications"""
@@ -23,6 +30,7 @@ class Notification(models.Model):
         ('info', 'Info'),
         ('warning', 'Warning'),
         ('success', 'Success'),
+        ('digest', 'Digest'),
     ]
     
     user = models.ForeignKey(
@@ -43,12 +51,26 @@ class Notification(models.Model):
     related_object_type = models.CharField(max_length=50, blank=True, null=True)
     related_object_id = models.IntegerField(blank=True, null=True)
     action_url = models.CharField(max_length=500, blank=True, null=True)
+    # Events merged into this row (see coalesce); updated_at moves with every
+    # merge and read change, which is what delta sync (sync.py) follows
+    count = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'read']),
             models.Index(fields=['created_at']),
+            # notification_list: one user's notifications, newest first (keyset pages)
+            models.Index(fields=['user', '-created_at', '-id'], name='notification_user_recent_idx'),
+            # notification_sync: one user's changes since a cursor
+            models.Index(fields=['user', 'updated_at', 'id'], name='notification_user_sync_idx'),
+            # coalesce: a user's unread notification about an object
+            models.Index(
+                fields=['user', 'related_object_type', 'related_object_id'],
+                condition=Q(read=False),
+                name='notification_coalesce_idx',
+            ),
         ]
     
     def __str__(self):
@@ -59,7 +81,8 @@ class Notification(models.Model):
         if not self.read:
             self.read = True
             self.read_at = timezone.now()
-            self.save(update_fields=['read', 'read_at'])
+            self.updated_at = self.read_at
+            self.save(update_fields=['read', 'read_at', 'updated_at'])
     
     @classmethod
     def create_notification(cls, user, type, title, message, related_object_type=None, related_object_id=None, action_url=None):
@@ -74,3 +97,218 @@ class Notification(models.Model):
             action_url=action_url
         )
         return notification
+    
+    @classmethod
+    def create_for_users(cls, user_ids, type, title, message, related_object_type=None, related_object_id=None,
+                         action_url=None, batch_size=None):
+        """
+        Deliver the same notification to many users, batch_size users at a
+        time (default NOTIFICATION_BATCH_SIZE). Users in digest mode get it
+        added to their digest (see digests.py), users with a recent unread
+        notification about the same object get that row updated (see
+        coalesce) and everyone else gets a new row, one bulk_create per batch.
+        user_ids may be any iterable, including a lazy values_list iterator.
+        Returns the number of users notified.
+        """
+        from .digests import add_to_digests, digest_user_ids
+
+        batch_size = batch_size or settings.NOTIFICATION_BATCH_SIZE
+        user_ids = iter(user_ids)
+        notified = 0
+        while True:
+            batch = list(islice(user_ids, batch_size))
+            if not batch:
+                return notified
+            notified += len(batch)
+            digest_ids = digest_user_ids(batch, type)
+            if digest_ids:
+                add_to_digests(digest_ids, type, title, message)
+            merged = cls.coalesce(
+                [user_id for user_id in batch if user_id not in digest_ids],
+                type, title, message, related_object_type, related_object_id, action_url
+            )
+            cls.insert([
+                cls(
+                    user_id=user_id,
+                    type=type,
+                    title=title,
+                    message=message,
+                    related_object_type=related_object_type,
+                    related_object_id=related_object_id,
+                    action_url=action_url
+                )
+                for user_id in batch
+                if user_id not in digest_ids and user_id not in merged
+            ])
+    
+    @classmethod
+    def coalesce(cls, user_ids, type, title, message, related_object_type=None, related_object_id=None,
+                 action_url=None):
+        """
+        Merge the event into each user's unread notification of the same type
+        about the same object, if it was updated in the last
+        NOTIFICATION_COALESCE_WINDOW seconds: count + 1, latest title and
+        message. One UPDATE for the whole batch; returns the user ids merged.
+        """
+        window = settings.NOTIFICATION_COALESCE_WINDOW
+        if not window or related_object_id is None or not user_ids:
+            return set()
+        now = timezone.now()
+        recent = cls.objects.filter(
+            user_id__in=user_ids,
+            read=False,
+            type=type,
+            related_object_type=related_object_type,
+            related_object_id=related_object_id,
+            updated_at__gte=now - timedelta(seconds=window)
+        )
+        # Newest row per user (later ids overwrite earlier ones)
+        latest = dict(recent.order_by('user_id', 'id').values_list('user_id', 'id'))
+        if not latest:
+            return set()
+        cls.objects.filter(id__in=latest.values()).update(
+            count=F('count') + 1, title=title, message=message, action_url=action_url, updated_at=now
+        )
+        # update() sends no signals; the row stays unread, so only the streams need to know
+        merged_ids = list(latest)
+        transaction.on_commit(lambda: touch(merged_ids))
+        return set(latest)
+    
+    @classmethod
+    def insert(cls, notifications):
+        """bulk_create new notifications, counting them as unread and waking the users' streams"""
+        from .unread import add_unread
+
+        if not notifications:
+            return 0
+        cls.objects.bulk_create(notifications, batch_size=settings.NOTIFICATION_BATCH_SIZE)
+        # bulk_create sends no post_save, so count the unread rows and bump the streams' versions here
+        user_ids = [notification.user_id for notification in notifications]
+        add_unread(notification.user_id for notification in notifications if not notification.read)
+        transaction.on_commit(lambda: touch(user_ids))
+        return len(notifications)
+
+
+class UnreadCounter(models.Model):
+    """Unread notifications per user, maintained by signals (see unread.py); the cache mirrors it."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='unread_notifications')
+    unread = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.unread} unread for {self.user.username}"
+
+
+class NotificationOutbox(models.Model):
+    """
+    Notifications waiting to be written, saved in the same transaction as the
+    change that caused them and materialized by the process_notification_outbox
+    worker (see outbox.py).
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('dead', 'Dead Letter'),
+    ]
+    
+    user_ids = models.JSONField(default=list)
+    type = models.CharField(max_length=50, choices=Notification.NOTIFICATION_TYPES, default='info')
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    related_object_type = models.CharField(max_length=50, blank=True, null=True)
+    related_object_id = models.IntegerField(blank=True, null=True)
+    action_url = models.CharField(max_length=500, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} -> {len(self.user_ids)} user(s) ({self.status})"
+
+
+class NotificationPreference(models.Model):
+    """How a user receives notifications: immediately, or collected into a periodic digest (see digests.py)."""
+    
+    DIGEST_CHOICES = [
+        ('off', 'Immediately'),
+        ('hourly', 'Hourly Digest'),
+        ('daily', 'Daily Digest'),
+    ]
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_preference')
+    digest = models.CharField(max_length=20, choices=DIGEST_CHOICES, default='off')
+    last_digest_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.user.username}: {self.get_digest_display()}"
+
+
+class NotificationDigestItem(models.Model):
+    """Events of one type waiting for a user's next digest, merged into a counter."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notification_digest_items')
+    type = models.CharField(max_length=50, choices=Notification.NOTIFICATION_TYPES)
+    # Zero once sent; the row is reused by the next event of the type
+    count = models.PositiveIntegerField(default=0)
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    last_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['user', 'type']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'type'], name='notification_digest_item_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.count} x {self.type} for {self.user_id}"
+
+
+class NotificationTombstone(models.Model):
+    """A deleted or archived notification, reported to delta sync clients (see sync.py)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', db_index=False)
+    notification_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['user', 'deleted_at'], name='notif_tombstone_user_idx'),
+            models.Index(fields=['deleted_at'], name='notif_tombstone_deleted_idx'),
+        ]
+    
+    def __str__(self):
+        return f"Notification {self.notification_id} of {self.user_id} deleted"
+
+
+class NotificationArchive(models.Model):
+    """Read notifications past NOTIFICATION_RETENTION_DAYS, moved out of the hot table (see retention.py)."""
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications', db_index=False)
+    type = models.CharField(max_length=50, choices=Notification.NOTIFICATION_TYPES)
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    related_object_type = models.CharField(max_length=50, blank=True, null=True)
+    related_object_id = models.IntegerField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notif_archive_user_idx'),
+            models.Index(fields=['created_at'], name='notif_archive_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.title} - {self.user_id} (archived)"
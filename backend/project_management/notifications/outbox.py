@@ -0,0 +1,130 @@
+"""
+Transactional outbox for notifications
+The notify_* helpers save one NotificationOutbox row (the recipients and the
+message) in the caller's transaction, so a notification exists exactly when
+the change that caused it commits and the request does one INSERT however
+many users are notified. The process_notification_outbox worker claims
+pending rows in batches and materializes the Notification rows with
+bulk_create. A failing row is retried with exponential backoff and becomes
+a dead letter after NOTIFICATION_OUTBOX_MAX_ATTEMPTS attempts.
+"""
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Notification, NotificationOutbox
+
+
+# Longest wait between two attempts of the same row
+MAX_RETRY_DELAY = 60 * 60
+
+
+def enqueue(
+    user_ids: List[int],
+    notification_type: str,
+    title: str,
+    message: str,
+    related_object_type: Optional[str] = None,
+    related_object_id: Optional[int] = None,
+    action_url: Optional[str] = None
+) -> Optional[NotificationOutbox]:
+    """Save a notification for later delivery to user_ids (None when there is nobody to notify)"""
+    if not user_ids:
+        return None
+    return NotificationOutbox.objects.create(
+        user_ids=user_ids,
+        type=notification_type,
+        title=title,
+        message=message,
+        related_object_type=related_object_type,
+        related_object_id=related_object_id,
+        action_url=action_url
+    )
+
+
+def retry_delay(attempts: int) -> int:
+    """Seconds before the next attempt: the base delay doubled per failed attempt"""
+    return min(settings.NOTIFICATION_OUTBOX_RETRY_SECONDS * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+
+
+def _claim(batch_size: int):
+    """Due pending rows, locked so concurrent workers skip them"""
+    queryset = NotificationOutbox.objects.filter(status='pending', available_at__lte=timezone.now()).order_by('id')
+    if connection.features.has_select_for_update_skip_locked:
+        queryset = queryset.select_for_update(skip_locked=True)
+    elif connection.features.has_select_for_update:
+        queryset = queryset.select_for_update()
+    return list(queryset[:batch_size])
+
+
+def deliver(entry: NotificationOutbox) -> int:
+    """Write the entry's notifications and mark it done; returns the number created"""
+    # Users deleted since the entry was queued are skipped rather than failing the row
+    user_ids = User.objects.filter(pk__in=entry.user_ids).values_list('pk', flat=True).order_by('pk')
+    created = Notification.create_for_users(
+        user_ids.iterator(),
+        type=entry.type,
+        title=entry.title,
+        message=entry.message,
+        related_object_type=entry.related_object_type,
+        related_object_id=entry.related_object_id,
+        action_url=entry.action_url
+    )
+    entry.status = 'done'
+    entry.attempts += 1
+    entry.last_error = ''
+    entry.processed_at = timezone.now()
+    entry.save(update_fields=['status', 'attempts', 'last_error', 'processed_at'])
+    return created
+
+
+def process_batch(batch_size: Optional[int] = None, max_attempts: Optional[int] = None) -> Dict[str, int]:
+    """
+    Deliver up to batch_size due rows. Each row runs in its own savepoint, so
+    a failure rolls back only that row's notifications.
+    """
+    batch_size = batch_size or settings.NOTIFICATION_OUTBOX_BATCH_SIZE
+    max_attempts = max_attempts or settings.NOTIFICATION_OUTBOX_MAX_ATTEMPTS
+    result = {'claimed': 0, 'delivered': 0, 'notifications': 0, 'retried': 0, 'dead': 0}
+
+    with transaction.atomic():
+        entries = _claim(batch_size)
+        result['claimed'] = len(entries)
+        for entry in entries:
+            attempts = entry.attempts
+            try:
+                with transaction.atomic():
+                    result['notifications'] += deliver(entry)
+                result['delivered'] += 1
+            except Exception as e:
+                entry.attempts = attempts + 1
+                entry.last_error = f'{type(e).__name__}: {e}'
+                if entry.attempts >= max_attempts:
+                    entry.status = 'dead'
+                    result['dead'] += 1
+                else:
+                    entry.status = 'pending'
+                    entry.available_at = timezone.now() + timedelta(seconds=retry_delay(entry.attempts))
+                    result['retried'] += 1
+                entry.save(update_fields=['status', 'attempts', 'last_error', 'available_at'])
+    return result
+
+
+def requeue_dead(ids: Optional[List[int]] = None) -> int:
+    """Give dead letters (all, or the given ids) a fresh set of attempts"""
+    queryset = NotificationOutbox.objects.filter(status='dead')
+    if ids is not None:
+        queryset = queryset.filter(id__in=ids)
+    return queryset.update(status='pending', attempts=0, available_at=timezone.now())
+
+
+def outbox_counts() -> Dict[str, int]:
+    counts = {status: 0 for status, _ in NotificationOutbox.STATUS_CHOICES}
+    for row in NotificationOutbox.objects.values('status').annotate(count=Count('id')):
+        counts[row['status']] = row['count']
+    return counts
@@ -0,0 +1,172 @@
+"""
+Optional monthly range partitioning of the notification table (PostgreSQL)
+conversion_sql() rebuilds notifications_notification as a table partitioned
+by created_at with one partition per month and a default partition; the
+primary key becomes (id, created_at) because PostgreSQL requires the
+partition key in every unique constraint, and ids keep coming from one
+sequence. Afterwards old months can be dropped as whole tables
+(drop_partitions_before) instead of deleting rows, and ensure_partitions()
+creates the coming months ahead of time. The ORM is unaffected. Every
+dropped row gets a delta sync tombstone, like rows archived by retention.py.
+"""
+import re
+from datetime import date
+from typing import List
+
+from django.db import connection, transaction
+
+from .models import Notification, NotificationArchive, NotificationTombstone
+from .unread import reconcile_counters
+
+
+TABLE = Notification._meta.db_table
+LEGACY_TABLE = f'{TABLE}_legacy'
+ARCHIVE_TABLE = NotificationArchive._meta.db_table
+TOMBSTONE_TABLE = NotificationTombstone._meta.db_table
+SEQUENCE = f'{TABLE}_id_part_seq'
+PARTITION_RE = re.compile(rf'^{TABLE}_(\d{{4}})_(\d{{2}})$')
+
+ARCHIVE_COLUMNS = (
+    'id, user_id, type, title, message, related_object_type, related_object_id, created_at, read_at'
+)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f'{TABLE}_{month.year:04d}_{month.month:02d}'
+
+
+def create_partition_sql(month: date) -> str:
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(month)}" PARTITION OF "{TABLE}" '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)', [TABLE])
+        row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def conversion_sql(first_month: date, last_month: date) -> List[str]:
+    """
+    Statements turning the plain table into the partitioned layout, with
+    partitions from first_month to last_month. Run them in one transaction;
+    the table is locked while the rows are copied.
+    """
+    field = Notification._meta.get_field('user')
+    with connection.schema_editor(collect_sql=True, atomic=False) as editor:
+        indexes = [str(sql) for sql in editor._field_indexes_sql(Notification, field)]
+        indexes += [str(index.create_sql(Notification, editor)) for index in Notification._meta.indexes]
+        foreign_key = str(editor._create_fk_sql(Notification, field, '_fk_%(to_table)s_%(to_column)s'))
+
+    statements = [
+        f'LOCK TABLE "{TABLE}" IN ACCESS EXCLUSIVE MODE',
+        f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY_TABLE}"',
+        f'CREATE SEQUENCE "{SEQUENCE}"',
+        f"""SELECT setval('"{SEQUENCE}"', COALESCE((SELECT MAX(id) FROM "{LEGACY_TABLE}"), 0) + 1, false)""",
+        f'CREATE TABLE "{TABLE}" (LIKE "{LEGACY_TABLE}" INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)',
+        f"""ALTER TABLE "{TABLE}" ALTER COLUMN id SET DEFAULT nextval('"{SEQUENCE}"')""",
+        f'ALTER SEQUENCE "{SEQUENCE}" OWNED BY "{TABLE}".id',
+        f'ALTER TABLE "{TABLE}" ADD PRIMARY KEY (id, created_at)',
+        f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT',
+    ]
+    month = first_month
+    while month <= last_month:
+        statements.append(create_partition_sql(month))
+        month = add_months(month, 1)
+    statements += [
+        f'INSERT INTO "{TABLE}" SELECT * FROM "{LEGACY_TABLE}"',
+        f'DROP TABLE "{LEGACY_TABLE}"',
+        # Created after the copy, with the names Django gave the originals
+        *indexes,
+        foreign_key,
+    ]
+    return statements
+
+
+def convert(months_ahead: int) -> List[str]:
+    """Apply conversion_sql for every month holding notifications plus months_ahead more"""
+    oldest = Notification.objects.order_by('created_at').values_list('created_at', flat=True).first()
+    today = month_start(date.today())
+    first_month = month_start(oldest.date()) if oldest else today
+    statements = conversion_sql(first_month, add_months(today, months_ahead))
+    with transaction.atomic(), connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+    return statements
+
+
+def partitions() -> List[date]:
+    """Months that have their own partition, oldest first"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = to_regclass(%s)',
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def ensure_partitions(months_ahead: int) -> List[str]:
+    """
+    Create the partitions of this month and the next months_ahead months if
+    missing. Run it monthly: a month whose rows already landed in the default
+    partition can no longer get its own partition.
+    """
+    existing = set(partitions())
+    month = month_start(date.today())
+    created = []
+    with connection.cursor() as cursor:
+        for _ in range(months_ahead + 1):
+            if month not in existing:
+                cursor.execute(create_partition_sql(month))
+                created.append(partition_name(month))
+            month = add_months(month, 1)
+    return created
+
+
+def drop_partitions_before(month: date) -> List[str]:
+    """
+    Drop the partitions of months before `month`. Their read notifications
+    are archived first; unread ones are dropped with the partition, so the
+    unread counters are reconciled afterwards. Synced clients get a
+    tombstone for every dropped row.
+    """
+    dropped = []
+    for partition in partitions():
+        if partition >= month:
+            break
+        name = partition_name(partition)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO "{ARCHIVE_TABLE}" ({ARCHIVE_COLUMNS}, archived_at) '
+                f'SELECT {ARCHIVE_COLUMNS}, now() FROM "{name}" WHERE read ON CONFLICT (id) DO NOTHING'
+            )
+            cursor.execute(
+                f'INSERT INTO "{TOMBSTONE_TABLE}" (user_id, notification_id, deleted_at) '
+                f'SELECT user_id, id, now() FROM "{name}"'
+            )
+            cursor.execute(f'DROP TABLE "{name}"')
+        dropped.append(name)
+    if dropped:
+        reconcile_counters()
+    return dropped
@@ -0,0 +1,105 @@
+"""
+Notification retention
+Read notifications older than NOTIFICATION_RETENTION_DAYS are copied into
+NotificationArchive and deleted from the hot table; archived rows older than
+NOTIFICATION_ARCHIVE_RETENTION_DAYS and delivered outbox rows older than
+NOTIFICATION_OUTBOX_RETENTION_DAYS are deleted, as are delta sync tombstones
+older than NOTIFICATION_SYNC_TOMBSTONE_DAYS. Every step works in batches
+of primary keys, each in its own short transaction, so a purge never holds
+locks on many rows at once. Unread notifications are never archived.
+"""
+import time
+from datetime import timedelta
+from typing import Callable, Optional
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive, NotificationOutbox, NotificationTombstone
+
+
+ARCHIVED_FIELDS = [
+    'id', 'user_id', 'type', 'title', 'message', 'related_object_type',
+    'related_object_id', 'created_at', 'read_at',
+]
+
+
+def _locked(queryset):
+    """Rows locked for the batch; concurrent purges skip them instead of waiting"""
+    if connection.features.has_select_for_update_skip_locked:
+        return queryset.select_for_update(skip_locked=True)
+    return queryset
+
+
+def _delete(queryset) -> int:
+    # Plain DELETE: the Notification signals only matter for unread rows and
+    # live clients, and sending them per archived row would dominate the purge
+    return queryset._raw_delete(queryset.db)
+
+
+def _run_batches(step: Callable[[], int], max_batches: Optional[int], pause: float) -> int:
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        count = step()
+        if not count:
+            break
+        total += count
+        batches += 1
+        if pause:
+            time.sleep(pause)
+    return total
+
+
+def _archive_batch(cutoff, batch_size: int) -> int:
+    with transaction.atomic():
+        ids = list(
+            _locked(Notification.objects.filter(read=True, created_at__lt=cutoff).order_by('id'))
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+        rows = list(Notification.objects.filter(id__in=ids).values(*ARCHIVED_FIELDS))
+        NotificationArchive.objects.bulk_create(
+            [NotificationArchive(**row) for row in rows], ignore_conflicts=True
+        )
+        # Synced clients drop archived rows like deleted ones
+        NotificationTombstone.objects.bulk_create([
+            NotificationTombstone(user_id=row['user_id'], notification_id=row['id']) for row in rows
+        ])
+        return _delete(Notification.objects.filter(id__in=ids))
+
+
+def archive_read_notifications(days: int, batch_size: int, max_batches: Optional[int] = None,
+                               pause: float = 0) -> int:
+    """Move read notifications created more than `days` ago into the archive; returns the number moved"""
+    cutoff = timezone.now() - timedelta(days=days)
+    return _run_batches(lambda: _archive_batch(cutoff, batch_size), max_batches, pause)
+
+
+def _purge_batch(queryset, batch_size: int) -> int:
+    with transaction.atomic():
+        ids = list(_locked(queryset.order_by('pk')).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return 0
+        return _delete(queryset.model.objects.filter(pk__in=ids))
+
+
+def purge_archive(days: int, batch_size: int, max_batches: Optional[int] = None, pause: float = 0) -> int:
+    """Delete archived notifications created more than `days` ago"""
+    queryset = NotificationArchive.objects.filter(created_at__lt=timezone.now() - timedelta(days=days))
+    return _run_batches(lambda: _purge_batch(queryset, batch_size), max_batches, pause)
+
+
+def purge_outbox(days: int, batch_size: int, max_batches: Optional[int] = None, pause: float = 0) -> int:
+    """Delete delivered outbox rows processed more than `days` ago (dead letters are kept)"""
+    queryset = NotificationOutbox.objects.filter(
+        status='done', processed_at__lt=timezone.now() - timedelta(days=days)
+    )
+    return _run_batches(lambda: _purge_batch(queryset, batch_size), max_batches, pause)
+
+
+def purge_tombstones(days: int, batch_size: int, max_batches: Optional[int] = None, pause: float = 0) -> int:
+    """Delete delta sync tombstones older than `days` (cursors that old are expired anyway)"""
+    queryset = NotificationTombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days))
+    return _run_batches(lambda: _purge_batch(queryset, batch_size), max_batches, pause)
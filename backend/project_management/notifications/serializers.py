@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Notification
+from .models import Notification, NotificationPreference
 from django.contrib.auth.models import User
 
 
@@ -11,9 +11,9 @@ class NotificationSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'type', 'title', 'message', 'read', 
             'created_at', 'read_at', 'related_object_type', 
-            'related_object_id', 'action_url'
+            'related_object_id', 'action_url', 'count', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'read_at']
+        read_only_fields = ['id', 'created_at', 'read_at', 'count', 'updated_at']
 
 
 class NotificationListSerializer(serializers.ModelSerializer):
@@ -26,14 +26,14 @@ class NotificationListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'type', 'title', 'message', 'read', 
             'created_at', 'time_ago', 'related_object_type', 
-            'related_object_id', 'action_url'
+            'related_object_id', 'action_url', 'count'
         ]
     
     def get_time_ago(self, obj):
-        """Get human-readable time difference"""
+        """Get human-readable time difference (since the latest coalesced event)"""
         from django.utils import timezone
         now = timezone.now()
-        diff = now - obj.created_at
+        diff = now - obj.updated_at
         
         if diff.days > 0:
             return f"{diff.days} day{'s' if diff.days > 1 else ''} ago"
@@ -47,4 +47,10 @@ class NotificationListSerializer(serializers.ModelSerializer):
             return "Just now"
 
 
-
+class NotificationPreferenceSerializer(serializers.ModelSerializer):
+    """Serializer for a user's delivery preference"""
+    
+    class Meta:
+        model = NotificationPreference
+        fields = ['digest', 'last_digest_at']
+        read_only_fields = ['last_digest_at']
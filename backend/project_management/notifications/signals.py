@@ -0,0 +1,18 @@
+"""
+Signal handlers for the notifications app
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .models import Notification
+from .sync import record_deletion
+from .unread import apply_saved_notification, remember_previous_read, remove_deleted_notification
+from .versions import notification_changed
+
+
+# Unread counters first: the version bump tells streams to read the new count
+pre_save.connect(remember_previous_read, sender=Notification, dispatch_uid='notification_unread_pre_save')
+post_save.connect(apply_saved_notification, sender=Notification, dispatch_uid='notification_unread_save')
+post_delete.connect(remove_deleted_notification, sender=Notification, dispatch_uid='notification_unread_delete')
+post_save.connect(notification_changed, sender=Notification, dispatch_uid='notification_version_save')
+post_delete.connect(notification_changed, sender=Notification, dispatch_uid='notification_version_delete')
+post_delete.connect(record_deletion, sender=Notification, dispatch_uid='notification_sync_delete')
@@ -0,0 +1,221 @@
+"""
+Push delivery of notifications
+The Server-Sent Events stream and the long-poll endpoint share a Watcher:
+once every NOTIFICATION_POLL_INTERVAL seconds it compares the user's version
+token in the cache (see versions.py) and only queries the database when the
+token moved, or every NOTIFICATION_STREAM_RESYNC seconds in case the cache
+is not shared between worker processes. The views are async, so under ASGI
+a waiting client holds no worker thread. Coalesced notifications (an
+existing row that got a newer event) are sent again with their new count
+and message; clients replace the row with the same id.
+EventSource cannot send headers, so the stream takes a stream token in the
+query string instead of the access token: it is signed, expires after
+NOTIFICATION_STREAM_TOKEN_TTL seconds and is accepted once, so a token
+showing up in an access log is useless.
+"""
+import asyncio
+import json
+import secrets
+import time
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .models import Notification
+from .serializers import NotificationListSerializer
+from .unread import unread_count
+from .versions import aget_version
+
+
+# Notifications sent per database check; a full batch is followed by another check
+BATCH_SIZE = 50
+
+TOKEN_KEYWORDS = ('Bearer', 'Token')
+
+STREAM_TOKEN_SALT = 'notifications.stream'
+USED_STREAM_TOKEN_KEY = 'notifications:stream-token:{nonce}'
+
+
+def issue_stream_token(user_id: int) -> str:
+    """Short-lived, single-use token for opening the stream"""
+    return signing.dumps({'user': user_id, 'nonce': secrets.token_urlsafe(16)}, salt=STREAM_TOKEN_SALT)
+
+
+async def consume_stream_token(token: str) -> Optional[int]:
+    """User id of a valid stream token, marking it used; None when invalid, expired or used"""
+    try:
+        payload = signing.loads(token, salt=STREAM_TOKEN_SALT, max_age=settings.NOTIFICATION_STREAM_TOKEN_TTL)
+    except signing.BadSignature:
+        return None
+    # add() only succeeds for the first use; the marker outlives the token
+    key = USED_STREAM_TOKEN_KEY.format(nonce=payload['nonce'])
+    if not await cache.aadd(key, 1, timeout=settings.NOTIFICATION_STREAM_TOKEN_TTL + 1):
+        return None
+    return payload['user']
+
+
+async def authenticate(request):
+    """
+    User for a token in the Authorization header or a stream token in the
+    stream_token query parameter, falling back to the session user
+    """
+    stream_token = request.GET.get('stream_token')
+    if stream_token:
+        user_id = await consume_stream_token(stream_token)
+        if user_id is None:
+            return None
+        return await User.objects.filter(pk=user_id, is_active=True).afirst()
+
+    key = None
+    header = request.headers.get('Authorization', '').split()
+    if len(header) == 2 and header[0] in TOKEN_KEYWORDS:
+        key = header[1]
+    if key:
+        try:
+            token = await Token.objects.select_related('user').aget(key=key)
+        except Token.DoesNotExist:
+            return None
+        return token.user if token.user.is_active else None
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def _fetch(user_id: int, after_id: int, updated_since: datetime) -> Tuple[List[Dict], List[Dict], datetime, int]:
+    """
+    Notifications after after_id, already-sent ones coalesced after
+    updated_since, the newest updated_at seen and the unread count
+    """
+    notifications = Notification.objects.filter(user_id=user_id, id__gt=after_id).order_by('id')[:BATCH_SIZE]
+    # Only unread rows are coalesced, so the (user, read) index covers this
+    updated = list(
+        Notification.objects.filter(
+            user_id=user_id, read=False, id__lte=after_id, updated_at__gt=updated_since
+        ).order_by('updated_at')[:BATCH_SIZE]
+    )
+    if updated:
+        updated_since = updated[-1].updated_at
+    return (
+        NotificationListSerializer(notifications, many=True).data,
+        NotificationListSerializer(updated, many=True).data,
+        updated_since,
+        unread_count(user_id),
+    )
+
+
+def _latest_id(user_id: int) -> int:
+    return Notification.objects.filter(user_id=user_id).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+async def latest_id(user_id: int) -> int:
+    return await sync_to_async(_latest_id)(user_id)
+
+
+class Watcher:
+    """
+    Tracks what one client has seen: the last notification id, the last
+    coalesced update (from now unless given) and the unread count
+    """
+
+    def __init__(self, user_id: int, last_id: int, updated_since: Optional[datetime] = None):
+        self.user_id = user_id
+        self.last_id = last_id
+        self.updated_since = updated_since or timezone.now()
+        self.unread_count = None
+        self.version = None
+        self.check_at = 0.0
+
+    async def poll(self) -> Optional[Dict]:
+        """New notifications and the unread count, or None when nothing changed"""
+        version = await aget_version(self.user_id)
+        now = time.monotonic()
+        if version == self.version and now < self.check_at:
+            return None
+        self.version = version
+        self.check_at = now + settings.NOTIFICATION_STREAM_RESYNC
+
+        notifications, updated, self.updated_since, unread_count = await sync_to_async(_fetch)(
+            self.user_id, self.last_id, self.updated_since
+        )
+        if len(notifications) == BATCH_SIZE or len(updated) == BATCH_SIZE:
+            self.check_at = 0.0
+        if not notifications and not updated and unread_count == self.unread_count:
+            return None
+        if notifications:
+            self.last_id = notifications[-1]['id']
+        self.unread_count = unread_count
+        return {
+            'notifications': notifications,
+            'updated': updated,
+            'unread_count': unread_count,
+            'last_id': self.last_id,
+            'updated_since': self.updated_since,
+        }
+
+
+def sse(event: str, data, event_id: Optional[int] = None) -> str:
+    lines = [f'event: {event}']
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data, cls=DjangoJSONEncoder)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+async def event_stream(user_id: int, last_id: int) -> AsyncIterator[str]:
+    """
+    SSE events for one client: a "notification" event per new notification
+    (its id is the event id, so a reconnecting browser resumes through
+    Last-Event-ID), the same event without an id for a coalesced one, and
+    "unread_count" whenever the count changes. The stream
+    ends after NOTIFICATION_STREAM_TIMEOUT seconds and the browser reconnects.
+    """
+    watcher = Watcher(user_id, last_id)
+    yield f'retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n'
+    started = time.monotonic()
+    heartbeat_at = started + settings.NOTIFICATION_STREAM_HEARTBEAT
+    while time.monotonic() - started < settings.NOTIFICATION_STREAM_TIMEOUT:
+        change = await watcher.poll()
+        if change:
+            for notification in change['notifications']:
+                yield sse('notification', notification, event_id=notification['id'])
+            for notification in change['updated']:
+                yield sse('notification', notification)
+            yield sse('unread_count', {'unread_count': change['unread_count']})
+            heartbeat_at = time.monotonic() + settings.NOTIFICATION_STREAM_HEARTBEAT
+        elif time.monotonic() >= heartbeat_at:
+            # Comment line: keeps proxies from closing an idle connection
+            yield ': keepalive\n\n'
+            heartbeat_at = time.monotonic() + settings.NOTIFICATION_STREAM_HEARTBEAT
+        await asyncio.sleep(settings.NOTIFICATION_POLL_INTERVAL)
+
+
+async def wait_for_notifications(user_id: int, since_id: int, timeout: float,
+                                 updated_since: Optional[datetime] = None) -> Dict:
+    """
+    Notifications newer than since_id (or coalesced after updated_since),
+    waiting up to timeout seconds for one to arrive
+    """
+    watcher = Watcher(user_id, since_id, updated_since)
+    deadline = time.monotonic() + timeout
+    while True:
+        change = await watcher.poll()
+        # isoformat keeps the microseconds DjangoJSONEncoder would drop
+        if change and (change['notifications'] or change['updated']):
+            return {**change, 'updated_since': watcher.updated_since.isoformat(), 'timed_out': False}
+        if time.monotonic() >= deadline:
+            return {
+                'notifications': [],
+                'updated': [],
+                'unread_count': watcher.unread_count,
+                'last_id': watcher.last_id,
+                'updated_since': watcher.updated_since.isoformat(),
+                'timed_out': True,
+            }
+        await asyncio.sleep(min(settings.NOTIFICATION_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
@@ -0,0 +1,135 @@
+"""
+Delta sync of notifications
+A client sends back the cursor of its previous sync and gets only what
+changed since: notifications created, read or coalesced (keyset on
+(updated_at, id), see notification_user_sync_idx) and the ids deleted or
+archived (NotificationTombstone). The response carries an ETag, so an
+unchanged state costs a 304. Cursors are opaque: a timestamp and an id.
+Tombstones are kept NOTIFICATION_SYNC_TOMBSTONE_DAYS days; an older cursor
+is expired and the client starts over without one.
+"""
+import base64
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Notification, NotificationTombstone
+from .serializers import NotificationSerializer
+from .unread import cascaded, unread_count
+
+
+SYNC_PAGE_SIZE = 100
+MAX_SYNC_PAGE_SIZE = 500
+
+
+class ExpiredCursor(Exception):
+    """The cursor is older than the kept tombstones; sync again without one"""
+
+
+def encode_cursor(moment: datetime, pk: int) -> str:
+    raw = f'{moment.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(timestamp, id) of a cursor; ValueError for anything that is not one"""
+    try:
+        moment, pk = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode().split('|')
+        moment, pk = parse_datetime(moment), int(pk)
+    except ValueError:
+        raise ValueError('Invalid cursor')
+    if moment is None or timezone.is_naive(moment):
+        raise ValueError('Invalid cursor')
+    return moment, pk
+
+
+def keyset_page(queryset, cursor: Optional[str], limit: int) -> Tuple[List[Notification], Optional[str]]:
+    """
+    Newest-first page after cursor (a next_cursor from an earlier page),
+    seeking on (created_at, id) instead of OFFSET, and the next page's cursor
+    """
+    queryset = queryset.order_by('-created_at', '-id')
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    rows = list(queryset[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last.created_at, last.id)
+
+
+def sync(user_id: int, cursor: Optional[str] = None, limit: int = SYNC_PAGE_SIZE) -> Dict:
+    """
+    Without a cursor: the newest `limit` notifications, a cursor for the
+    next sync and next_page for older ones (notification_list ?cursor=).
+    With one: the notifications changed and the ids removed since it, oldest
+    change first; has_more means sync again right away with the new cursor.
+    """
+    now = timezone.now()
+    # Changes saved by transactions still open may carry a slightly older
+    # updated_at, so the cursor stays this far behind the present
+    settled = (now - timedelta(seconds=settings.NOTIFICATION_SYNC_SETTLE_SECONDS), 0)
+    notifications = Notification.objects.filter(user_id=user_id)
+
+    if cursor is None:
+        rows, next_page = keyset_page(notifications, None, limit)
+        return {
+            'notifications': NotificationSerializer(rows, many=True).data,
+            'deleted': [],
+            'has_more': False,
+            'next_page': next_page,
+            'cursor': encode_cursor(*settled),
+            'unread_count': unread_count(user_id),
+        }
+
+    since = decode_cursor(cursor)
+    if since[0] < now - timedelta(days=settings.NOTIFICATION_SYNC_TOMBSTONE_DAYS):
+        raise ExpiredCursor()
+
+    changed = list(
+        notifications.filter(Q(updated_at__gt=since[0]) | Q(updated_at=since[0], id__gt=since[1]))
+        .order_by('updated_at', 'id')[:limit + 1]
+    )
+    has_more = len(changed) > limit
+    changed = changed[:limit]
+    tombstones = NotificationTombstone.objects.filter(user_id=user_id, deleted_at__gt=since[0])
+    if has_more:
+        # Removals after the last change come with the next page
+        tombstones = tombstones.filter(deleted_at__lte=changed[-1].updated_at)
+    deleted = list(tombstones.order_by('deleted_at').values_list('notification_id', 'deleted_at'))
+
+    end = since
+    if changed:
+        end = max(end, (changed[-1].updated_at, changed[-1].id))
+    if deleted:
+        end = max(end, (deleted[-1][1], 0))
+    if not has_more:
+        end = max(min(end, settled), since)
+    return {
+        'notifications': NotificationSerializer(changed, many=True).data,
+        'deleted': [notification_id for notification_id, _ in deleted],
+        'has_more': has_more,
+        'next_page': None,
+        'cursor': encode_cursor(*end),
+        'unread_count': unread_count(user_id),
+    }
+
+
+def sync_etag(data: Dict) -> str:
+    payload = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    return f'"{hashlib.sha1(payload).hexdigest()}"'
+
+
+def record_deletion(sender, instance, origin=None, **kwargs):
+    """Tombstone for a deleted notification (none when the user is deleted with it)"""
+    if cascaded(sender, origin):
+        return
+    NotificationTombstone.objects.create(user_id=instance.user_id, notification_id=instance.id)
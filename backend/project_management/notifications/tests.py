@@ -1,3 +1,317 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .digests import send_digests
+from .models import (
+    Notification, NotificationArchive, NotificationDigestItem, NotificationOutbox, NotificationPreference,
+    NotificationTombstone, UnreadCounter,
+)
+from .outbox import process_batch, requeue_dead
+from .retention import archive_read_notifications, purge_archive, purge_outbox, purge_tombstones
+from .stream import authenticate
+from .sync import encode_cursor
+from .unread import reconcile_counters, reset, unread_count
+from .utils import bulk_notify, notify, notify_multiple_users
+
+
+class UnreadCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('reader')
+
+    def notify(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notification.objects.create(user=self.user, title='Hello', message='World', **fields)
+
+    def test_changes_invalidate_the_cached_count(self):
+        self.assertEqual(unread_count(self.user.id), 0)
+        first = self.notify()
+        self.notify()
+        self.assertEqual(unread_count(self.user.id), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.mark_as_read()
+        self.assertEqual(unread_count(self.user.id), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reset(self.user.id)
+        self.assertEqual(unread_count(self.user.id), 0)
+
+    def test_reconcile_repairs_drift(self):
+        self.notify()
+        UnreadCounter.objects.filter(user=self.user).update(unread=5)
+        cache.clear()
+        self.assertEqual(unread_count(self.user.id), 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = reconcile_counters([self.user.id])
+        self.assertEqual(result, {'checked': 1, 'corrected': 1})
+        self.assertEqual(unread_count(self.user.id), 1)
+
+
+@override_settings(NOTIFICATION_OUTBOX_ENABLED=False)
+class InlineNotifyTests(TestCase):
+    def test_failure_does_not_undo_the_callers_change(self):
+        with mock.patch.object(Notification, 'create_for_users', side_effect=DatabaseError('boom')):
+            with self.assertLogs('notifications.utils', 'ERROR'):
+                with transaction.atomic():
+                    user = User.objects.create_user('assignee')
+                    self.assertEqual(notify([user.id], 'info', 'Hello', 'World'), 0)
+
+        self.assertTrue(User.objects.filter(username='assignee').exists())
+        self.assertFalse(Notification.objects.exists())
+
+
+class StreamTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('listener')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def stream_user(self, stream_token):
+        request = RequestFactory().get('/api/notifications/stream/', {'stream_token': stream_token})
+        return async_to_sync(authenticate)(request)
+
+    def issue(self):
+        return self.client.post('/api/notifications/stream/token/').data['stream_token']
+
+    def test_stream_token_is_single_use(self):
+        stream_token = self.issue()
+        self.assertEqual(self.stream_user(stream_token), self.user)
+        self.assertIsNone(self.stream_user(stream_token))
+
+    @override_settings(NOTIFICATION_STREAM_TOKEN_TTL=0)
+    def test_expired_or_forged_stream_token_is_rejected(self):
+        stream_token = self.issue()
+        with mock.patch('django.core.signing.time.time', return_value=10 ** 10):
+            self.assertIsNone(self.stream_user(stream_token))
+        self.assertIsNone(self.stream_user(stream_token[:-2] + 'xx'))
+
+
+@override_settings(NOTIFICATION_OUTBOX_ENABLED=False)
+class BulkNotifyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.bulk_create([User(username=f'member{i}') for i in range(30)])
+        self.users = User.objects.filter(username__startswith='member')
+
+    def fan_out(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            notified = bulk_notify(self.users, 'info', 'Release', 'Version 2 is out', **kwargs)
+        return notified, len(queries)
+
+    def test_queryset_fan_out_uses_a_few_queries_per_batch(self):
+        notified, small_batches = self.fan_out(batch_size=10)
+        self.assertEqual(notified, 30)
+        self.assertEqual(Notification.objects.filter(title='Release').count(), 30)
+        self.assertEqual(set(UnreadCounter.objects.values_list('unread', flat=True)), {1})
+
+        _, one_batch = self.fan_out(batch_size=100)
+        self.assertLess(one_batch, small_batches)
+        self.assertLess(small_batches, 30)
+        self.assertEqual(unread_count(self.users.first().id), 2)
+
+
+@override_settings(NOTIFICATION_OUTBOX_ENABLED=True, NOTIFICATION_OUTBOX_MAX_ATTEMPTS=2)
+class OutboxTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(f'member{i}') for i in range(3)]
+
+    def test_notify_enqueues_one_row_and_the_worker_delivers_it(self):
+        entry = notify(self.users, 'info', 'Release', 'Version 2 is out')
+        notify_multiple_users([self.users[0]], 'info', 'Hotfix', 'Version 2.1 is out')
+        self.assertEqual(NotificationOutbox.objects.count(), 2)
+        self.assertEqual(entry.user_ids, [user.id for user in self.users])
+        self.assertFalse(Notification.objects.exists())
+
+        # A recipient deleted before delivery is skipped, not an error
+        self.users[2].delete()
+        result = process_batch()
+        self.assertEqual(result, {'claimed': 2, 'delivered': 2, 'notifications': 3, 'retried': 0, 'dead': 0})
+        self.assertEqual(Notification.objects.filter(title='Release').count(), 2)
+        self.assertEqual(set(NotificationOutbox.objects.values_list('status', flat=True)), {'done'})
+        self.assertEqual(process_batch()['claimed'], 0)
+
+    def test_failures_back_off_then_become_dead_letters(self):
+        entry = notify(self.users, 'info', 'Release', 'Version 2 is out')
+
+        with mock.patch.object(Notification, 'create_for_users', side_effect=DatabaseError('boom')):
+            self.assertEqual(process_batch()['retried'], 1)
+            entry.refresh_from_db()
+            self.assertEqual((entry.status, entry.attempts), ('pending', 1))
+            self.assertIn('boom', entry.last_error)
+            # Not due again until the retry delay has passed
+            self.assertEqual(process_batch()['claimed'], 0)
+
+            NotificationOutbox.objects.update(available_at=entry.created_at)
+            self.assertEqual(process_batch()['dead'], 1)
+        self.assertFalse(Notification.objects.exists())
+
+        self.assertEqual(requeue_dead(), 1)
+        self.assertEqual(process_batch()['delivered'], 1)
+        self.assertEqual(Notification.objects.count(), 3)
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('reader')
+        self.long_ago = timezone.now() - timedelta(days=100)
+
+    def add(self, count, read=True, created_at=None):
+        notifications = [
+            Notification.objects.create(user=self.user, title=f'Old {i}', message='', read=read)
+            for i in range(count)
+        ]
+        if created_at:
+            Notification.objects.filter(pk__in=[n.pk for n in notifications]).update(created_at=created_at)
+        return notifications
+
+    def test_archive_moves_old_read_notifications_in_batches(self):
+        old = self.add(5, created_at=self.long_ago)
+        self.add(1, read=False, created_at=self.long_ago)
+        recent = self.add(1)
+
+        self.assertEqual(archive_read_notifications(90, batch_size=2, max_batches=1), 2)
+        self.assertEqual(archive_read_notifications(90, batch_size=2), 3)
+
+        self.assertEqual(
+            sorted(NotificationArchive.objects.values_list('id', flat=True)), [n.id for n in old]
+        )
+        self.assertEqual(Notification.objects.filter(read=True).get(), recent[0])
+        self.assertEqual(Notification.objects.filter(read=False).count(), 1)
+        # Synced clients learn that the archived rows are gone
+        self.assertEqual(
+            sorted(NotificationTombstone.objects.values_list('notification_id', flat=True)), [n.id for n in old]
+        )
+
+    def test_purges_delete_only_expired_rows(self):
+        self.add(3, created_at=self.long_ago)
+        archive_read_notifications(90, batch_size=10)
+        self.assertEqual(purge_archive(365, batch_size=2), 0)
+        self.assertEqual(purge_archive(30, batch_size=2), 3)
+
+        done = NotificationOutbox.objects.create(title='Done', message='', status='done', processed_at=self.long_ago)
+        NotificationOutbox.objects.create(title='Dead', message='', status='dead', processed_at=self.long_ago)
+        self.assertEqual(purge_outbox(7, batch_size=10), 1)
+        self.assertFalse(NotificationOutbox.objects.filter(pk=done.pk).exists())
+        self.assertTrue(NotificationOutbox.objects.filter(status='dead').exists())
+
+        NotificationTombstone.objects.update(deleted_at=self.long_ago)
+        NotificationTombstone.objects.create(user=self.user, notification_id=0)
+        self.assertEqual(purge_tombstones(30, batch_size=2), 3)
+        self.assertEqual(NotificationTombstone.objects.count(), 1)
+
+
+@override_settings(NOTIFICATION_OUTBOX_ENABLED=False)
+class DigestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.hourly = User.objects.create_user('hourly')
+        self.immediate = User.objects.create_user('immediate')
+        NotificationPreference.objects.create(user=self.hourly, digest='hourly')
+
+    def notify_both(self, notification_type, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            notify([self.hourly.id, self.immediate.id], notification_type, title, f'{title} message')
+
+    def test_events_are_batched_into_one_digest_and_zeroed(self):
+        self.notify_both('task_assigned', 'Task 1')
+        self.notify_both('task_assigned', 'Task 2')
+        self.notify_both('sprint_created', 'Sprint')
+        self.notify_both('deadline_approaching', 'Deadline')
+
+        self.assertEqual(Notification.objects.filter(user=self.immediate).count(), 4)
+        # Urgent types skip the digest
+        self.assertEqual(list(Notification.objects.filter(user=self.hourly).values_list('title', flat=True)), ['Deadline'])
+        self.assertEqual(
+            dict(NotificationDigestItem.objects.values_list('type', 'count')),
+            {'task_assigned': 2, 'sprint_created': 1}
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(send_digests(), {'users': 1, 'events': 3})
+        digest = Notification.objects.get(user=self.hourly, type='digest')
+        self.assertEqual(digest.title, '3 updates since your last digest')
+        self.assertTrue(digest.message.startswith('2 x '))
+        self.assertEqual(set(NotificationDigestItem.objects.values_list('count', flat=True)), {0})
+        self.assertEqual(unread_count(self.hourly.id), 2)
+
+        # Not due again within the hour, and nothing is pending once it is
+        self.notify_both('task_assigned', 'Task 3')
+        self.assertEqual(send_digests()['users'], 0)
+        later = timezone.now() + timedelta(hours=1, minutes=1)
+        self.assertEqual(send_digests(now=later), {'users': 1, 'events': 1})
+        self.assertEqual(send_digests(now=later + timedelta(hours=2)), {'users': 0, 'events': 0})
+
+
+@override_settings(NOTIFICATION_SYNC_SETTLE_SECONDS=0)
+class SyncTests(TestCase):
+    url = '/api/notifications/sync/'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('syncer')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.first = Notification.objects.create(user=self.user, title='First', message='')
+        self.second = Notification.objects.create(user=self.user, title='Second', message='')
+
+    def sync(self, cursor=None, **params):
+        return self.client.get(self.url, {'cursor': cursor, **params} if cursor else params)
+
+    def test_cursor_returns_only_changes_and_tombstones(self):
+        response = self.sync()
+        self.assertEqual([row['title'] for row in response.data['notifications']], ['Second', 'First'])
+        cursor = response.data['cursor']
+
+        third = Notification.objects.create(user=self.user, title='Third', message='')
+        self.first.mark_as_read()
+        second_id = self.second.id
+        self.second.delete()
+
+        response = self.sync(cursor)
+        self.assertEqual([row['id'] for row in response.data['notifications']], [third.id, self.first.id])
+        self.assertTrue(response.data['notifications'][1]['read'])
+        self.assertEqual(response.data['deleted'], [second_id])
+        self.assertFalse(response.data['has_more'])
+
+        response = self.sync(response.data['cursor'])
+        self.assertEqual((response.data['notifications'], response.data['deleted']), ([], []))
+
+    def test_has_more_pages_through_changes(self):
+        cursor = self.sync().data['cursor']
+        Notification.objects.create(user=self.user, title='Third', message='')
+        Notification.objects.create(user=self.user, title='Fourth', message='')
+
+        page = self.sync(cursor, limit=1).data
+        self.assertEqual(([row['title'] for row in page['notifications']], page['has_more']), (['Third'], True))
+        page = self.sync(page['cursor'], limit=1).data
+        self.assertEqual(([row['title'] for row in page['notifications']], page['has_more']), (['Fourth'], False))
+
+    def test_unchanged_state_is_304(self):
+        cursor = self.sync().data['cursor']
+        response = self.sync(cursor)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(self.url, {'cursor': cursor}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        Notification.objects.create(user=self.user, title='Third', message='')
+        response = self.client.get(self.url, {'cursor': cursor}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_expired_and_invalid_cursors(self):
+        expired = encode_cursor(timezone.now() - timedelta(days=31), 0)
+        self.assertEqual(self.sync(expired).status_code, 410)
+        self.assertEqual(self.sync('not-a-cursor').status_code, 400)
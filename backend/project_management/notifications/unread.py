@@ -0,0 +1,149 @@
+"""
+Unread notification counters
+UnreadCounter keeps each user's unread count in the database. Signals apply
++1/-1 deltas with F() updates when a notification is created, read or
+deleted, and the cached copy is deleted once the transaction commits, so
+unread_count() is a cache read until the count changes. A cache miss loads
+the counter row, and reconcile_counters() (the reconcile_unread_counts
+command) recounts the notifications and repairs any drift.
+Writes never adjust the cached value in place: with a shared cache (Redis,
+memcached) the delete reaches every process, and with the default
+per-process local-memory cache other processes only catch up when their
+copy expires, which is why NOTIFICATION_UNREAD_CACHE_TIMEOUT is seconds.
+"""
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import Notification, UnreadCounter
+
+
+UNREAD_KEY = 'notifications:unread:{user_id}'
+
+
+def _key(user_id: int) -> str:
+    return UNREAD_KEY.format(user_id=user_id)
+
+
+def _count_unread(user_id: int) -> int:
+    return Notification.objects.filter(user_id=user_id, read=False).count()
+
+
+def unread_count(user_id: int) -> int:
+    """Cached unread count; a miss reads (or first creates) the counter row"""
+    count = cache.get(_key(user_id))
+    if count is None:
+        counter = UnreadCounter.objects.filter(user_id=user_id).values_list('unread', flat=True).first()
+        if counter is None:
+            counter = _count_unread(user_id)
+            UnreadCounter.objects.get_or_create(user_id=user_id, defaults={'unread': counter})
+        count = counter
+        cache.set(_key(user_id), count, timeout=settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+    return max(count, 0)
+
+
+def _invalidate(user_ids: Iterable[int]):
+    """Drop the cached counts once the transaction commits; the next reads load the counter rows"""
+    keys = [_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def adjust(user_id: int, delta: int):
+    """Add delta to a user's unread count"""
+    if not delta:
+        return
+    UnreadCounter.objects.get_or_create(user_id=user_id)
+    UnreadCounter.objects.filter(user_id=user_id).update(unread=F('unread') + delta, updated_at=timezone.now())
+    _invalidate([user_id])
+
+
+def add_unread(user_ids: Iterable[int]):
+    """One more unread notification for each id (repeated ids count repeatedly), as a few bulk statements"""
+    per_user = Counter(user_ids)
+    if not per_user:
+        return
+    UnreadCounter.objects.bulk_create(
+        [UnreadCounter(user_id=user_id) for user_id in per_user], ignore_conflicts=True
+    )
+    by_delta = {}
+    for user_id, delta in per_user.items():
+        by_delta.setdefault(delta, []).append(user_id)
+    for delta, user_ids in by_delta.items():
+        UnreadCounter.objects.filter(user_id__in=user_ids).update(
+            unread=F('unread') + delta, updated_at=timezone.now()
+        )
+    _invalidate(per_user)
+
+
+def reset(user_id: int):
+    """Everything read: the count is zero"""
+    UnreadCounter.objects.update_or_create(user_id=user_id, defaults={'unread': 0})
+    _invalidate([user_id])
+
+
+@transaction.atomic
+def reconcile_counters(user_ids: Optional[Iterable[int]] = None) -> Dict[str, int]:
+    """
+    Recount unread notifications (for every user, or the given ids) with one
+    grouped query and correct the counters that drifted
+    """
+    notifications = Notification.objects.filter(read=False)
+    counters = UnreadCounter.objects.all()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        notifications = notifications.filter(user_id__in=user_ids)
+        counters = counters.filter(user_id__in=user_ids)
+
+    actual = dict(notifications.values('user_id').annotate(count=Count('id')).values_list('user_id', 'count'))
+    stored = dict(counters.values_list('user_id', 'unread'))
+
+    drifted = {
+        user_id: actual.get(user_id, 0)
+        for user_id in set(actual) | set(stored)
+        if actual.get(user_id, 0) != stored.get(user_id)
+    }
+    now = timezone.now()
+    UnreadCounter.objects.bulk_create(
+        [UnreadCounter(user_id=user_id, unread=count, updated_at=now) for user_id, count in drifted.items()],
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['unread', 'updated_at'],
+        batch_size=1000,
+    )
+    _invalidate(drifted)
+    return {'checked': len(set(actual) | set(stored)), 'corrected': len(drifted)}
+
+
+def remember_previous_read(sender, instance, **kwargs):
+    """Load the stored read flag before an update so mark_as_read (or any save) can be counted"""
+    instance._unread_previous = None
+    if instance.pk is not None:
+        instance._unread_previous = sender.objects.filter(pk=instance.pk).values_list('read', flat=True).first()
+
+
+def apply_saved_notification(sender, instance, created, **kwargs):
+    if created:
+        if not instance.read:
+            adjust(instance.user_id, 1)
+        return
+    previous = getattr(instance, '_unread_previous', None)
+    if previous is not None and previous != instance.read:
+        adjust(instance.user_id, -1 if instance.read else 1)
+
+
+def cascaded(sender, origin) -> bool:
+    """Whether a post_delete comes from deleting another object (the user), whose rows go too"""
+    return origin is not None and getattr(origin, 'model', type(origin)) is not sender
+
+
+def remove_deleted_notification(sender, instance, origin=None, **kwargs):
+    if cascaded(sender, origin):
+        return
+    if not instance.read:
+        adjust(instance.user_id, -1)
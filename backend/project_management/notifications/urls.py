@@ -3,11 +3,16 @@ from . import views
 
 urlpatterns = [
     path('notifications/', views.notification_list, name='notification-list'),
+    path('notifications/sync/', views.notification_sync, name='notification-sync'),
     path('notifications/unread-count/', views.notification_unread_count, name='notification-unread-count'),
     path('notifications/<int:notification_id>/read/', views.notification_mark_read, name='notification-mark-read'),
     path('notifications/mark-all-read/', views.notification_mark_all_read, name='notification-mark-all-read'),
     path('notifications/<int:notification_id>/delete/', views.notification_delete, name='notification-delete'),
     path('notifications/create/', views.notification_create, name='notification-create'),
+    path('notifications/preferences/', views.notification_preferences, name='notification-preferences'),
+    path('notifications/stream/', views.notification_stream, name='notification-stream'),
+    path('notifications/stream/token/', views.notification_stream_token, name='notification-stream-token'),
+    path('notifications/poll/', views.notification_poll, name='notification-poll'),
 ]
 
 
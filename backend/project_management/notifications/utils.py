@@ -1,9 +1,30 @@
 """
 Utility functions for creating notifications
+The notify_* helpers take recipients: a single User, or a User queryset /
+iterable of users or user ids. With NOTIFICATION_OUTBOX_ENABLED (off by
+default) they save one outbox row in the caller's transaction and return
+it; the process_notification_outbox worker writes the notifications (see
+outbox.py). Otherwise they are written inline with bulk_create in a
+savepoint and return the number of users notified; a failure is logged and
+rolled back to the savepoint, so it never undoes the caller's change.
+Either way repeated events about the same object coalesce into one unread
+row and users in digest mode get them in their next digest (see
+Notification.create_for_users).
 """
+import logging
+
 from .models import Notification
+from .outbox import enqueue
+from django.conf import settings
 from django.contrib.auth.models import User
-from typing import Optional, List
+from django.db import transaction
+from django.db.models import QuerySet
+from typing import Iterable, Iterator, Optional, Union
+
+
+logger = logging.getLogger(__name__)
+
+Recipients = Union[User, QuerySet, Iterable[Union[User, int]]]
 
 
 def create_notification(
@@ -41,20 +62,84 @@ def create_notification(
     )
 
 
+def recipient_ids(recipients: Recipients, batch_size: Optional[int] = None) -> Iterator[int]:
+    """User ids of recipients; querysets are streamed, not loaded into memory"""
+    if isinstance(recipients, QuerySet):
+        return recipients.values_list('pk', flat=True).iterator(
+            chunk_size=batch_size or settings.NOTIFICATION_BATCH_SIZE
+        )
+    if isinstance(recipients, User):
+        recipients = [recipients]
+    return (recipient.pk if isinstance(recipient, User) else recipient for recipient in recipients)
+
+
+def bulk_notify(
+    recipients: Recipients,
+    notification_type: str,
+    title: str,
+    message: str,
+    related_object_type: Optional[str] = None,
+    related_object_id: Optional[int] = None,
+    action_url: Optional[str] = None,
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    Create the same notification for every recipient with bulk_create
+    
+    Args:
+        recipients: User queryset, or iterable of users or user ids
+        notification_type: Type of notification
+        title: Notification title
+        message: Notification message
+        related_object_type: Type of related object
+        related_object_id: ID of related object
+        action_url: URL to navigate when notification is clicked
+        batch_size: Rows per INSERT (default NOTIFICATION_BATCH_SIZE)
+    
+    Returns:
+        Number of users notified (new rows, coalesced rows and digest entries)
+    """
+    return Notification.create_for_users(
+        recipient_ids(recipients, batch_size),
+        type=notification_type,
+        title=title,
+        message=message,
+        related_object_type=related_object_type,
+        related_object_id=related_object_id,
+        action_url=action_url,
+        batch_size=batch_size
+    )
+
+
+def notify(recipients: Recipients, notification_type: str, title: str, message: str, **kwargs):
+    """
+    Outbox entry when the outbox is enabled; otherwise the number of users
+    notified inline (0 when writing the notifications failed)
+    """
+    if settings.NOTIFICATION_OUTBOX_ENABLED:
+        return enqueue(list(recipient_ids(recipients)), notification_type, title, message, **kwargs)
+    try:
+        with transaction.atomic():
+            return bulk_notify(recipients, notification_type, title, message, **kwargs)
+    except Exception:
+        logger.exception('Failed to create %s notification %r', notification_type, title)
+        return 0
+
+
 def notify_multiple_users(
-    users: List[User],
+    users: Recipients,
     notification_type: str,
     title: str,
     message: str,
     related_object_type: Optional[str] = None,
     related_object_id: Optional[int] = None,
     action_url: Optional[str] = None
-) -> List[Notification]:
+):
     """
-    Create notifications for multiple users
+    Create notifications for multiple users (through the outbox when enabled, see notify)
     
     Args:
-        users: List of users to notify
+        users: User queryset, or iterable of users or user ids
         notification_type: Type of notification
         title: Notification title
         message: Notification message
@@ -63,32 +148,28 @@ def notify_multiple_users(
         action_url: URL to navigate when notification is clicked
     
     Returns:
-        List of created Notification objects
+        Outbox entry, or the number of users notified
     """
-    notifications = []
-    for user in users:
-        notification = Notification.create_notification(
-            user=user,
-            type=notification_type,
-            title=title,
-            message=message,
-            related_object_type=related_object_type,
-            related_object_id=related_object_id,
-            action_url=action_url
-        )
-        notifications.append(notification)
-    return notifications
+    return notify(
+        users,
+        notification_type=notification_type,
+        title=title,
+        message=message,
+        related_object_type=related_object_type,
+        related_object_id=related_object_id,
+        action_url=action_url
+    )
 
 
-def notify_task_assigned(user: User, task_name: str, task_id: int, assigned_by: str = None):
-    """Notify user when a task is assigned to them"""
+def notify_task_assigned(recipients: Recipients, task_name: str, task_id: int, assigned_by: str = None):
+    """Notify recipients when a task is assigned to them"""
     title = "New Task Assigned"
     message = f"You have been assigned a new task: {task_name}"
     if assigned_by:
         message += f" by {assigned_by}"
     
-    return create_notification(
-        user=user,
+    return notify(
+        recipients,
         notification_type='task_assigned',
         title=title,
         message=message,
@@ -98,10 +179,10 @@ def notify_task_assigned(user: User, task_name: str, task_id: int, assigned_by:
     )
 
 
-def notify_task_completed(user: User, task_name: str, task_id: int):
-    """Notify user when a task is completed"""
-    return create_notification(
-        user=user,
+def notify_task_completed(recipients: Recipients, task_name: str, task_id: int):
+    """Notify recipients when a task is completed"""
+    return notify(
+        recipients,
         notification_type='task_completed',
         title="Task Completed",
         message=f"Task '{task_name}' has been marked as completed",
@@ -111,10 +192,10 @@ def notify_task_completed(user: User, task_name: str, task_id: int):
     )
 
 
-def notify_sprint_created(user: User, sprint_name: str, sprint_id: int):
-    """Notify user when a sprint is created"""
-    return create_notification(
-        user=user,
+def notify_sprint_created(recipients: Recipients, sprint_name: str, sprint_id: int):
+    """Notify recipients when a sprint is created"""
+    return notify(
+        recipients,
         notification_type='sprint_created',
         title="New Sprint Created",
         message=f"A new sprint '{sprint_name}' has been created",
@@ -124,10 +205,10 @@ def notify_sprint_created(user: User, sprint_name: str, sprint_id: int):
     )
 
 
-def notify_employee_added(user: User, employee_name: str, employee_id: int):
-    """Notify user when a new employee is added"""
-    return create_notification(
-        user=user,
+def notify_employee_added(recipients: Recipients, employee_name: str, employee_id: int):
+    """Notify recipients when a new employee is added"""
+    return notify(
+        recipients,
         notification_type='employee_added',
         title="New Employee Added",
         message=f"A new employee '{employee_name}' has been added to the system",
@@ -137,10 +218,10 @@ def notify_employee_added(user: User, employee_name: str, employee_id: int):
     )
 
 
-def notify_deadline_approaching(user: User, item_name: str, item_type: str, item_id: int, days_left: int):
-    """Notify user when a deadline is approaching"""
-    return create_notification(
-        user=user,
+def notify_deadline_approaching(recipients: Recipients, item_name: str, item_type: str, item_id: int, days_left: int):
+    """Notify recipients when a deadline is approaching"""
+    return notify(
+        recipients,
         notification_type='deadline_approaching',
         title="Deadline Approaching",
         message=f"{item_type.title()} '{item_name}' deadline is in {days_left} day{'s' if days_left > 1 else ''}",
@@ -148,6 +229,3 @@ def notify_deadline_approaching(user: User, item_name: str, item_type: str, item
         related_object_id=item_id,
         action_url=f'/{item_type}s'
     )
-
-
-
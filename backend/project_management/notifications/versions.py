@@ -0,0 +1,36 @@
+"""
+Per-user notification versions
+Every change to a user's notifications stores a new version token in the
+cache. Open streams and long-polls compare tokens once a second and only
+query the database when the token moved, so idle clients cost no queries.
+"""
+import time
+from typing import Iterable, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+VERSION_KEY = 'notifications:version:{user_id}'
+
+# Tokens outlive any stream; a missing token only delays delivery to the next resync
+VERSION_TIMEOUT = 60 * 60 * 24
+
+
+def get_version(user_id: int) -> Optional[int]:
+    return cache.get(VERSION_KEY.format(user_id=user_id))
+
+
+async def aget_version(user_id: int) -> Optional[int]:
+    return await cache.aget(VERSION_KEY.format(user_id=user_id))
+
+
+def touch(user_ids: Iterable[int]):
+    """Mark the notifications of these users as changed"""
+    token = time.time_ns()
+    cache.set_many({VERSION_KEY.format(user_id=user_id): token for user_id in set(user_ids)}, timeout=VERSION_TIMEOUT)
+
+
+def notification_changed(sender, instance, **kwargs):
+    """post_save/post_delete receiver for Notification; runs after commit, once the unread count is updated"""
+    transaction.on_commit(lambda: touch([instance.user_id]))
@@ -3,8 +3,18 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
-from .models import Notification
-from .serializers import NotificationSerializer, NotificationListSerializer
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_GET
+from .models import Notification, NotificationPreference
+from .serializers import NotificationSerializer, NotificationListSerializer, NotificationPreferenceSerializer
+from .stream import authenticate, event_stream, issue_stream_token, latest_id, wait_for_notifications
+from .sync import MAX_SYNC_PAGE_SIZE, SYNC_PAGE_SIZE, ExpiredCursor, keyset_page, sync, sync_etag
+from .unread import reset, unread_count
+from .versions import touch
+from django.conf import settings
 from django.db.models import Q, Count
 import json
 
@@ -12,7 +22,11 @@ import json
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def notification_list(request):
-    """Get all notifications for the current user"""
+    """
+    Get all notifications for the current user
+    ?page= pages with OFFSET and a total count; ?cursor= (empty for the first
+    page, then next_cursor) seeks on (created_at, id) and skips the count.
+    """
     try:
         notifications = Notification.objects.filter(user=request.user)
         
@@ -27,9 +41,20 @@ def notification_list(request):
         if type_filter:
             notifications = notifications.filter(type=type_filter)
         
+        page_size = int(request.query_params.get('page_size', 20))
+        
+        # Keyset pagination
+        if 'cursor' in request.query_params:
+            rows, next_cursor = keyset_page(notifications, request.query_params['cursor'], max(page_size, 1))
+            serializer = NotificationListSerializer(rows, many=True)
+            return Response({
+                'results': serializer.data,
+                'next_cursor': next_cursor,
+                'page_size': page_size
+            }, status=status.HTTP_200_OK)
+        
         # Pagination
         page = int(request.query_params.get('page', 1))
-        page_size = int(request.query_params.get('page_size', 20))
         start = (page - 1) * page_size
         end = start + page_size
         
@@ -45,6 +70,48 @@ def notification_list(request):
             'page_size': page_size
         }, status=status.HTTP_200_OK)
         
+    except ValueError as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except Exception as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def notification_sync(request):
+    """
+    Notifications changed and removed since a cursor (see sync.py)
+    Usage: GET /api/notifications/sync/?cursor=<cursor from the previous response>&limit=100
+    Without a cursor returns the newest notifications. Send the ETag back in
+    If-None-Match to get 304 when nothing changed; 410 means sync again without a cursor.
+    """
+    try:
+        limit = int(request.query_params.get('limit', SYNC_PAGE_SIZE))
+        limit = min(max(limit, 1), MAX_SYNC_PAGE_SIZE)
+        data = sync(request.user.id, request.query_params.get('cursor') or None, limit)
+        
+        etag = sync_etag(data)
+        headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(data, status=status.HTTP_200_OK, headers=headers)
+        
+    except ExpiredCursor:
+        return Response(
+            {'error': 'Cursor expired, sync again without a cursor'},
+            status=status.HTTP_410_GONE
+        )
+    except ValueError as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     except Exception as e:
         return Response(
             {'error': str(e)},
@@ -55,12 +122,9 @@ def notification_list(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def notification_unread_count(request):
-    """Get count of unread notifications"""
+    """Get count of unread notifications (a cache read, see unread.py)"""
     try:
-        count = Notification.objects.filter(
-            user=request.user,
-            read=False
-        ).count()
+        count = unread_count(request.user.id)
         
         return Response({
             'unread_count': count
@@ -104,10 +168,13 @@ def notification_mark_read(request, notification_id):
 def notification_mark_all_read(request):
     """Mark all notifications as read for the current user"""
     try:
+        now = timezone.now()
         updated = Notification.objects.filter(
             user=request.user,
             read=False
-        ).update(read=True)
+        ).update(read=True, read_at=now, updated_at=now)
+        reset(request.user.id)
+        touch([request.user.id])
         
         return Response({
             'message': f'{updated} notifications marked as read',
@@ -186,3 +253,106 @@ def notification_create(request):
             {'error': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+
+
+@api_view(['GET', 'PUT'])
+@permission_classes([IsAuthenticated])
+def notification_preferences(request):
+    """
+    Get or update how the current user receives notifications
+    digest: "off" (immediately), "hourly" or "daily" (see send_notification_digests)
+    """
+    try:
+        preference, _ = NotificationPreference.objects.get_or_create(user=request.user)
+        
+        if request.method == 'PUT':
+            serializer = NotificationPreferenceSerializer(preference, data=request.data, partial=True)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        
+        serializer = NotificationPreferenceSerializer(preference)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def notification_stream_token(request):
+    """
+    Issue a single-use token for opening the notification stream
+    (EventSource cannot send the Authorization header)
+    """
+    return Response({
+        'stream_token': issue_stream_token(request.user.id),
+        'expires_in': settings.NOTIFICATION_STREAM_TOKEN_TTL
+    }, status=status.HTTP_200_OK)
+
+
+# Push endpoints: plain async Django views (DRF views are sync), served under ASGI
+@require_GET
+async def notification_stream(request):
+    """
+    Server-Sent Events stream of new notifications and unread count changes
+    Usage: new EventSource('/api/notifications/stream/?stream_token=<token from stream/token/>')
+    A stream token opens one connection, so reconnect with a new one and ?last_id=.
+    Events: "notification" (NotificationList data) and "unread_count" ({"unread_count": n}).
+    Resumes after the Last-Event-ID header (or ?last_id=) when the browser reconnects.
+    """
+    user = await authenticate(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided.'}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    try:
+        last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_id')
+        last_id = int(last_id) if last_id else await latest_id(user.id)
+    except ValueError:
+        return JsonResponse({'error': 'last_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    response = StreamingHttpResponse(event_stream(user.id, last_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@require_GET
+async def notification_poll(request):
+    """
+    Long-poll fallback for clients without EventSource
+    Usage: ?since_id=<last_id>&updated_since=<updated_since>&timeout=25 (both from the previous response)
+    Returns as soon as a notification newer than since_id (default: the latest one) exists
+    or an older one was coalesced after updated_since (default: now), or after timeout seconds.
+    """
+    user = await authenticate(request)
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided.'}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    try:
+        since_id = request.GET.get('since_id')
+        since_id = int(since_id) if since_id else await latest_id(user.id)
+        timeout = float(request.GET.get('timeout', settings.NOTIFICATION_LONG_POLL_TIMEOUT))
+    except ValueError:
+        return JsonResponse({'error': 'since_id and timeout must be numbers'}, status=status.HTTP_400_BAD_REQUEST)
+    timeout = min(max(timeout, 0), settings.NOTIFICATION_LONG_POLL_TIMEOUT)
+    
+    updated_since = request.GET.get('updated_since')
+    if updated_since:
+        try:
+            updated_since = parse_datetime(updated_since)
+        except ValueError:
+            updated_since = None
+        if updated_since is None:
+            return JsonResponse({'error': 'updated_since must be an ISO datetime'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        result = await wait_for_notifications(user.id, since_id, timeout, updated_since or None)
+        return JsonResponse(result, status=status.HTTP_200_OK)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -13,6 +13,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'rest_framework',
     'rest_framework.authtoken',
@@ -138,6 +139,107 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10
 }
 
+# Cache Configuration
+# Local-memory by default; point CACHE_BACKEND at
+# django.core.cache.backends.filebased.FileBasedCache (with CACHE_LOCATION set
+# to a directory) to share entries between worker processes on one host.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='project-management'),
+    }
+}
+
+# Seconds a cached dashboard response stays valid (signals invalidate sooner)
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds a cached user display name stays valid (Employee/User saves invalidate sooner)
+DISPLAY_NAME_CACHE_TIMEOUT = config('DISPLAY_NAME_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Batch resume parsing. The batch endpoint is off until a process_resume_jobs
+# worker is deployed: the worker reads the uploads from MEDIA_ROOT, so it must
+# run where the web process stores them (same container or a shared volume)
+RESUME_BATCH_ENABLED = config('RESUME_BATCH_ENABLED', default=False, cast=bool)
+# Parser processes per worker,
+# files per batch (Django accepts at most DATA_UPLOAD_MAX_NUMBER_FILES uploads
+# per request; larger batches go in a zip), largest resume in MB, and seconds
+# without progress after which another worker takes over a running job
+RESUME_PARSE_WORKERS = config('RESUME_PARSE_WORKERS', default=2, cast=int)
+RESUME_BATCH_MAX_FILES = config('RESUME_BATCH_MAX_FILES', default=100, cast=int)
+RESUME_BATCH_MAX_FILE_MB = config('RESUME_BATCH_MAX_FILE_MB', default=10, cast=int)
+RESUME_JOB_STALE_SECONDS = config('RESUME_JOB_STALE_SECONDS', default=600, cast=int)
+
+# Parsed resumes kept by content hash; the least recently used go beyond this
+RESUME_CACHE_MAX_ENTRIES = config('RESUME_CACHE_MAX_ENTRIES', default=5000, cast=int)
+
+# Text search configuration for the global search vectors (rebuild_search_documents after changing it)
+SEARCH_CONFIG = config('SEARCH_CONFIG', default='english')
+
+# Grouped search: worker threads (each holds its own DB connection) and the
+# milliseconds after which a slow result type is dropped from the response
+SEARCH_MAX_WORKERS = config('SEARCH_MAX_WORKERS', default=6, cast=int)
+SEARCH_TYPE_TIMEOUT_MS = config('SEARCH_TYPE_TIMEOUT_MS', default=500, cast=int)
+# Run the per-type queries on the worker threads. Off by default: it only pays
+# off with spare database cores and persistent connections (CONN_MAX_AGE);
+# check with benchmark_search before enabling
+SEARCH_CONCURRENT = config('SEARCH_CONCURRENT', default=False, cast=bool)
+
+# Typeahead prefix cache: recent texts kept per user and seconds a user's list
+# stays valid (saves of the searched models invalidate sooner)
+TYPEAHEAD_CACHE_ENTRIES = config('TYPEAHEAD_CACHE_ENTRIES', default=20, cast=int)
+TYPEAHEAD_CACHE_TIMEOUT = config('TYPEAHEAD_CACHE_TIMEOUT', default=300, cast=int)
+
+# Notifications written per INSERT when one event notifies many users
+NOTIFICATION_BATCH_SIZE = config('NOTIFICATION_BATCH_SIZE', default=1000, cast=int)
+
+# Seconds within which another event of the same type about the same object
+# updates the user's unread notification instead of adding a row (0 disables)
+NOTIFICATION_COALESCE_WINDOW = config('NOTIFICATION_COALESCE_WINDOW', default=300, cast=int)
+
+# Delta sync (notifications/sync/): seconds the cursor stays behind the present
+# so changes from transactions still committing are not skipped, and days
+# deletions are remembered (older cursors must resync from scratch)
+NOTIFICATION_SYNC_SETTLE_SECONDS = config('NOTIFICATION_SYNC_SETTLE_SECONDS', default=5, cast=int)
+NOTIFICATION_SYNC_TOMBSTONE_DAYS = config('NOTIFICATION_SYNC_TOMBSTONE_DAYS', default=30, cast=int)
+
+# Notification push (SSE stream and long-poll): seconds between cache checks,
+# seconds between database checks when the cache shows no change (the default
+# local-memory cache is per process), stream lifetime before the browser
+# reconnects, keepalive interval, reconnect delay, and the longest long-poll wait
+NOTIFICATION_POLL_INTERVAL = config('NOTIFICATION_POLL_INTERVAL', default=1.0, cast=float)
+NOTIFICATION_STREAM_RESYNC = config('NOTIFICATION_STREAM_RESYNC', default=60, cast=int)
+NOTIFICATION_STREAM_TIMEOUT = config('NOTIFICATION_STREAM_TIMEOUT', default=300, cast=int)
+NOTIFICATION_STREAM_HEARTBEAT = config('NOTIFICATION_STREAM_HEARTBEAT', default=15, cast=int)
+NOTIFICATION_STREAM_RETRY_MS = config('NOTIFICATION_STREAM_RETRY_MS', default=3000, cast=int)
+NOTIFICATION_LONG_POLL_TIMEOUT = config('NOTIFICATION_LONG_POLL_TIMEOUT', default=25, cast=int)
+
+# Seconds a single-use stream token (what EventSource sends instead of the access token) stays valid
+NOTIFICATION_STREAM_TOKEN_TTL = config('NOTIFICATION_STREAM_TOKEN_TTL', default=60, cast=int)
+
+# Seconds a cached unread count stays valid. Changes delete the cached count, but the
+# default local-memory cache is per process, so keep this short unless CACHE_BACKEND
+# is shared (Redis, memcached); reconcile_unread_counts repairs counter drift
+NOTIFICATION_UNREAD_CACHE_TIMEOUT = config('NOTIFICATION_UNREAD_CACHE_TIMEOUT', default=10, cast=int)
+
+# Notification outbox: notify_* helpers queue notifications for the
+# process_notification_outbox worker (False writes them inline instead; only
+# enable it where that worker is deployed, or notifications are never sent),
+# rows claimed per batch, attempts before a row is dead-lettered and the
+# first retry delay in seconds (doubled per failed attempt)
+NOTIFICATION_OUTBOX_ENABLED = config('NOTIFICATION_OUTBOX_ENABLED', default=False, cast=bool)
+NOTIFICATION_OUTBOX_BATCH_SIZE = config('NOTIFICATION_OUTBOX_BATCH_SIZE', default=100, cast=int)
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = config('NOTIFICATION_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+NOTIFICATION_OUTBOX_RETRY_SECONDS = config('NOTIFICATION_OUTBOX_RETRY_SECONDS', default=30, cast=int)
+
+# Notification retention (purge_notifications): read notifications move to the
+# archive after NOTIFICATION_RETENTION_DAYS, archived rows and delivered outbox
+# rows are deleted after their own limits (0 keeps them), in batches of
+# NOTIFICATION_PURGE_BATCH_SIZE rows per transaction
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=90, cast=int)
+NOTIFICATION_ARCHIVE_RETENTION_DAYS = config('NOTIFICATION_ARCHIVE_RETENTION_DAYS', default=365, cast=int)
+NOTIFICATION_OUTBOX_RETENTION_DAYS = config('NOTIFICATION_OUTBOX_RETENTION_DAYS', default=7, cast=int)
+NOTIFICATION_PURGE_BATCH_SIZE = config('NOTIFICATION_PURGE_BATCH_SIZE', default=1000, cast=int)
+
 # CORS Configuration (for frontend)
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
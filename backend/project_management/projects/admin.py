@@ -1,4 +1,12 @@
 from django.contrib import admin
-from .models import Project
+from .models import Project, ProjectHealthScore
 
 admin.site.register(Project)
+
+
+@admin.register(ProjectHealthScore)
+class ProjectHealthScoreAdmin(admin.ModelAdmin):
+    list_display = ['project', 'score', 'health_status', 'risk_level', 'progress', 'is_stale', 'computed_at']
+    list_filter = ['health_status', 'risk_level', 'is_stale']
+    search_fields = ['project__title']
+    readonly_fields = ['computed_at']
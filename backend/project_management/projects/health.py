@@ -0,0 +1,116 @@
+"""
+Bulk project health scoring
+Scores are computed from one queryset annotated with task counts and stored in
+ProjectHealthScore. Task and project changes only flag the affected score as
+stale; reads refresh every stale or out-of-date score in one batch, so the
+dashboard never scores projects one query at a time.
+"""
+from typing import Dict, Iterable, Optional
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Project, ProjectHealthScore
+
+
+SCORE_FIELDS = [
+    'score', 'health_status', 'color', 'factors', 'recommendations',
+    'risk_score', 'risk_level', 'total_tasks', 'completed_tasks', 'progress',
+    'is_stale', 'computed_at',
+]
+
+
+def health_input(project, total_tasks: int, completed_tasks: int) -> Dict:
+    """Project data in the shape expected by DashboardAIService.calculate_project_health_score"""
+    progress = int((completed_tasks / total_tasks) * 100) if total_tasks > 0 else 0
+    return {
+        'id': project.id,
+        'title': project.title,
+        'end_date': project.end_date,
+        'start_date': project.start_date,
+        'budget': float(project.budget),
+        # Expense model doesn't have project field
+        'spent': 0.0,
+        'progress': progress,
+        'total_tasks': total_tasks,
+        'completed_tasks': completed_tasks,
+        'status': project.status,
+        'team_workload': 0.5  # Simplified - calculate actual workload
+    }
+
+
+def risk_level(score: int) -> str:
+    return 'high' if score < 60 else 'medium' if score < 80 else 'low'
+
+
+def compute_scores(project_ids: Optional[Iterable[int]] = None) -> int:
+    """Score the given projects (default: all) and upsert their rows"""
+    from employee.ai_services import DashboardAIService
+
+    projects = Project.objects.annotate(
+        total_tasks=Count('tasks'),
+        completed_tasks=Count('tasks', filter=Q(tasks__status='completed')),
+    )
+    if project_ids is not None:
+        projects = projects.filter(pk__in=project_ids)
+
+    now = timezone.now()
+    scores = []
+    for project in projects:
+        data = health_input(project, project.total_tasks, project.completed_tasks)
+        health = DashboardAIService.calculate_project_health_score(data)
+        scores.append(ProjectHealthScore(
+            project=project,
+            score=health['score'],
+            health_status=health['status'],
+            color=health['color'],
+            factors=health['factors'],
+            recommendations=health['recommendations'],
+            risk_score=100 - health['score'],
+            risk_level=risk_level(health['score']),
+            total_tasks=data['total_tasks'],
+            completed_tasks=data['completed_tasks'],
+            progress=data['progress'],
+            is_stale=False,
+            computed_at=now,
+        ))
+
+    ProjectHealthScore.objects.bulk_create(
+        scores,
+        update_conflicts=True,
+        unique_fields=['project'],
+        update_fields=SCORE_FIELDS,
+        batch_size=500,
+    )
+    return len(scores)
+
+
+def refresh_scores() -> int:
+    """
+    Recompute scores that are missing, flagged stale or computed before today
+    (the timeline factor depends on the current date)
+    """
+    start_of_day = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    project_ids = list(
+        Project.objects.filter(
+            Q(health_score__isnull=True)
+            | Q(health_score__is_stale=True)
+            | Q(health_score__computed_at__lt=start_of_day)
+        ).values_list('id', flat=True)
+    )
+    if not project_ids:
+        return 0
+    return compute_scores(project_ids)
+
+
+def mark_stale(project_ids: Iterable[int]):
+    project_ids = [project_id for project_id in project_ids if project_id]
+    if project_ids:
+        ProjectHealthScore.objects.filter(project_id__in=project_ids, is_stale=False).update(is_stale=True)
+
+
+def ordered_scores(ordering: str = 'score'):
+    """Stored scores ordered by 'score', '-score', 'risk_score' or '-risk_score'"""
+    if ordering.lstrip('-') not in ('score', 'risk_score'):
+        ordering = 'score'
+    return ProjectHealthScore.objects.select_related('project').order_by(ordering, 'project_id')
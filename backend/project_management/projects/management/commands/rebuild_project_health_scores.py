@@ -0,0 +1,16 @@
+"""
+Management command to recompute every stored project health score
+Usage: python manage.py rebuild_project_health_scores
+"""
+from django.core.management.base import BaseCommand
+from projects.health import compute_scores
+
+
+class Command(BaseCommand):
+    help = 'Recompute ProjectHealthScore rows for all projects in one batch'
+
+    def handle(self, *args, **options):
+        projects = compute_scores()
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully scored {projects} project(s).')
+        )
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_alter_project_client_delete_client'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectHealthScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.IntegerField(help_text='Health score (0-100)')),
+                ('health_status', models.CharField(max_length=20)),
+                ('color', models.CharField(max_length=20)),
+                ('factors', models.JSONField(blank=True, default=list)),
+                ('recommendations', models.JSONField(blank=True, default=list)),
+                ('risk_score', models.IntegerField(help_text='Risk score (100 - health score)')),
+                ('risk_level', models.CharField(max_length=20)),
+                ('total_tasks', models.IntegerField(default=0)),
+                ('completed_tasks', models.IntegerField(default=0)),
+                ('progress', models.IntegerField(default=0, help_text='Task completion percentage (0-100)')),
+                ('is_stale', models.BooleanField(default=False, help_text='Set when the project or its tasks changed')),
+                ('computed_at', models.DateTimeField()),
+                ('project', models.OneToOneField(help_text='Project this score belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='health_score', to='projects.project')),
+            ],
+            options={
+                'ordering': ['score'],
+                'indexes': [models.Index(fields=['score'], name='projects_pr_score_6d4a85_idx'), models.Index(fields=['risk_score'], name='projects_pr_risk_sc_9d80a8_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:27
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_trigram_extension'),
+        ('clients', '0002_name_trgm'),
+        ('projects', '0003_projecthealthscore'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='project_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
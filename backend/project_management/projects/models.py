@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.contrib.auth.models import User
 
 class Project(models.Model):
@@ -19,5 +20,42 @@ class Project(models.Model):
     client = models.ForeignKey('clients.Client', on_delete=models.SET_NULL, null=True, related_name='projects')
     budget = models.DecimalField(max_digits=12, decimal_places=2)
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['title'], name='project_title_trgm', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self):
         return self.title
+
+
+class ProjectHealthScore(models.Model):
+    """Persisted health and risk score of a project, computed in bulk by projects.health"""
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='health_score',
+        help_text="Project this score belongs to"
+    )
+    score = models.IntegerField(help_text="Health score (0-100)")
+    health_status = models.CharField(max_length=20)
+    color = models.CharField(max_length=20)
+    factors = models.JSONField(default=list, blank=True)
+    recommendations = models.JSONField(default=list, blank=True)
+    risk_score = models.IntegerField(help_text="Risk score (100 - health score)")
+    risk_level = models.CharField(max_length=20)
+    total_tasks = models.IntegerField(default=0)
+    completed_tasks = models.IntegerField(default=0)
+    progress = models.IntegerField(default=0, help_text="Task completion percentage (0-100)")
+    is_stale = models.BooleanField(default=False, help_text="Set when the project or its tasks changed")
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['score']
+        indexes = [
+            models.Index(fields=['score']),
+            models.Index(fields=['risk_score']),
+        ]
+
+    def __str__(self):
+        return f"{self.project} ({self.score})"
@@ -3,6 +3,7 @@ from django.contrib.auth.models import User
 from clients.models import Client as RealClient
 from .models import Project
 from employee.models import Employee
+from employee.display_names import DisplayNameListSerializer, resolver_for
 
 
 class EmployeeMiniSerializer(serializers.ModelSerializer):
@@ -11,10 +12,11 @@ class EmployeeMiniSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'name']
+        list_serializer_class = DisplayNameListSerializer
+        display_name_fields = ['id']
 
     def get_name(self, obj):
-        full = f"{obj.first_name} {obj.last_name}".strip()
-        return full or obj.username
+        return resolver_for(self).name(obj)
 
 
 class ClientMiniSerializer(serializers.ModelSerializer):
@@ -33,6 +35,8 @@ class ProjectListSerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'start_date', 'end_date', 'status',
             'assigned_to', 'client_name', 'budget'
         ]
+        list_serializer_class = DisplayNameListSerializer
+        display_name_fields = ['assigned_to_id']
 
 
 class ProjectCreateSerializer(serializers.ModelSerializer):
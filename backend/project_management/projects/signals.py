@@ -0,0 +1,36 @@
+"""
+Signal handlers flagging project health scores for recomputation
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from tasks.models import Task
+from .health import mark_stale
+from .models import Project
+
+
+def remember_previous_project(sender, instance, **kwargs):
+    """Load the stored project before an update so a task moved between projects flags both"""
+    instance._health_previous_project_id = None
+    if instance.pk is not None:
+        instance._health_previous_project_id = (
+            Task.objects.filter(pk=instance.pk).values_list('project_id', flat=True).first()
+        )
+
+
+def task_saved(sender, instance, **kwargs):
+    mark_stale({instance.project_id, getattr(instance, '_health_previous_project_id', None)})
+
+
+def task_deleted(sender, instance, **kwargs):
+    mark_stale([instance.project_id])
+
+
+def project_saved(sender, instance, created, **kwargs):
+    if not created:
+        mark_stale([instance.pk])
+
+
+pre_save.connect(remember_previous_project, sender=Task, dispatch_uid='project_health_task_pre_save')
+post_save.connect(task_saved, sender=Task, dispatch_uid='project_health_task_post_save')
+post_delete.connect(task_deleted, sender=Task, dispatch_uid='project_health_task_post_delete')
+post_save.connect(project_saved, sender=Project, dispatch_uid='project_health_project_post_save')
@@ -1,3 +1,63 @@
+from datetime import date, timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+
+from tasks.models import Task
+
+from .health import refresh_scores
+from .models import Project, ProjectHealthScore
+
+
+def create_project(title):
+    today = timezone.localdate()
+    return Project.objects.create(
+        title=title, description='', start_date=today - timedelta(days=30), end_date=today + timedelta(days=30),
+        status='in_progress', budget=1000,
+    )
+
+
+def add_task(project, name, status):
+    return Task.objects.create(
+        task_name=name, project=project, status=status, start_date=date.today(), end_date=date.today()
+    )
+
+
+class ProjectHealthScoreTests(TestCase):
+    def setUp(self):
+        self.apollo = create_project('Apollo')
+        self.gemini = create_project('Gemini')
+
+    def score(self, project):
+        return ProjectHealthScore.objects.get(project=project)
+
+    def test_refresh_scores_missing_projects_in_one_batch(self):
+        add_task(self.apollo, 'Done', 'completed')
+        add_task(self.apollo, 'Open', 'todo')
+
+        with self.assertNumQueries(3):
+            self.assertEqual(refresh_scores(), 2)
+
+        score = self.score(self.apollo)
+        self.assertEqual((score.total_tasks, score.completed_tasks, score.progress), (2, 1, 50))
+        self.assertEqual(score.risk_score, 100 - score.score)
+        self.assertFalse(score.is_stale)
+        self.assertEqual(refresh_scores(), 0)
+
+    def test_task_changes_flag_only_affected_projects(self):
+        task = add_task(self.apollo, 'Move me', 'todo')
+        refresh_scores()
+
+        task.project = self.gemini
+        task.status = 'completed'
+        task.save()
+        self.assertTrue(self.score(self.apollo).is_stale)
+        self.assertTrue(self.score(self.gemini).is_stale)
+
+        self.assertEqual(refresh_scores(), 2)
+        self.assertEqual(self.score(self.apollo).total_tasks, 0)
+        self.assertEqual(self.score(self.gemini).progress, 100)
 
-# Create your tests here.
+        task.delete()
+        self.assertTrue(self.score(self.gemini).is_stale)
+        self.assertFalse(self.score(self.apollo).is_stale)
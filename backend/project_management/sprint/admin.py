@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Sprint, SprintTask, SprintComment, SprintRetrospective
+from .models import Sprint, SprintTask, SprintComment, SprintRetrospective, SprintTaskStatusEvent
 
 
 @admin.register(Sprint)
@@ -8,7 +8,7 @@ class SprintAdmin(admin.ModelAdmin):
     list_filter = ['status', 'project', 'start_date', 'end_date']
     search_fields = ['name', 'project__title']
     date_hierarchy = 'created_at'
-    readonly_fields = ['created_at', 'updated_at', 'progress']
+    readonly_fields = ['created_at', 'updated_at', 'progress', 'todo_count', 'pending_count', 'in_progress_count', 'in_review_count', 'done_count']
 
 
 @admin.register(SprintTask)
@@ -36,3 +36,12 @@ class SprintRetrospectiveAdmin(admin.ModelAdmin):
     search_fields = ['notes', 'sprint__name']
     date_hierarchy = 'created_at'
     readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(SprintTaskStatusEvent)
+class SprintTaskStatusEventAdmin(admin.ModelAdmin):
+    list_display = ['sprint', 'task', 'from_status', 'to_status', 'changed_at']
+    list_filter = ['to_status', 'sprint']
+    search_fields = ['task__title', 'sprint__name']
+    date_hierarchy = 'changed_at'
+    readonly_fields = ['sprint', 'task', 'from_status', 'to_status', 'changed_at']
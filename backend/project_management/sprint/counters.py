@@ -0,0 +1,77 @@
+"""
+Per-status task counters on Sprint
+Task changes adjust the counters with a single UPDATE of F() expressions that
+also recomputes progress, so no COUNT queries run when tasks change.
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Value
+from django.db.models.functions import Coalesce, NullIf
+
+from .models import Sprint, SprintTask
+
+
+def apply_status_deltas(sprint_id: int, deltas: Dict[str, int]):
+    """Adjust a sprint's counters by {status: change} and refresh its progress"""
+    changes = {
+        Sprint.COUNTER_FIELDS[status]: change
+        for status, change in deltas.items()
+        if status in Sprint.COUNTER_FIELDS and change
+    }
+    if not changes:
+        return
+
+    # Every SET expression sees the pre-update row, so progress is built from the new values
+    new_values = {
+        field: F(field) + changes[field] if field in changes else F(field)
+        for field in Sprint.COUNTER_FIELDS.values()
+    }
+    total = sum(new_values.values(), Value(0))
+    progress = Coalesce(
+        new_values['done_count'] * 100 / NullIf(total, 0),
+        Value(0),
+        output_field=IntegerField()
+    )
+    Sprint.objects.filter(pk=sprint_id).update(
+        progress=progress,
+        **{field: new_values[field] for field in changes}
+    )
+
+
+def apply_status_events(events: Iterable):
+    """Apply (sprint_id, from_status, to_status) transitions, one UPDATE per sprint"""
+    deltas = defaultdict(lambda: defaultdict(int))
+    for sprint_id, from_status, to_status in events:
+        if from_status:
+            deltas[sprint_id][from_status] -= 1
+        if to_status:
+            deltas[sprint_id][to_status] += 1
+    for sprint_id, sprint_deltas in deltas.items():
+        apply_status_deltas(sprint_id, sprint_deltas)
+
+
+@transaction.atomic
+def rebuild_task_counters(sprint_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute counters and progress from the tasks with one grouped query"""
+    sprints = Sprint.objects.only('id', *Sprint.COUNTER_FIELDS.values(), 'progress')
+    tasks = SprintTask.objects.all()
+    if sprint_ids is not None:
+        sprints = sprints.filter(pk__in=sprint_ids)
+        tasks = tasks.filter(sprint_id__in=sprint_ids)
+
+    counts = defaultdict(dict)
+    for row in tasks.values('sprint_id', 'status').annotate(count=Count('id')):
+        counts[row['sprint_id']][row['status']] = row['count']
+
+    sprints = list(sprints)
+    for sprint in sprints:
+        for status, field in Sprint.COUNTER_FIELDS.items():
+            setattr(sprint, field, counts[sprint.id].get(status, 0))
+        sprint.progress = sprint.calculate_progress()
+
+    Sprint.objects.bulk_update(
+        sprints, [*Sprint.COUNTER_FIELDS.values(), 'progress'], batch_size=500
+    )
+    return len(sprints)
@@ -0,0 +1,132 @@
+"""
+Sprint flow metrics computed from the task status history
+Each metric reads the sprint's SprintTaskStatusEvent rows with one grouped
+query and replays the daily deltas with a running sum, so the query count does
+not depend on the length of the sprint or the number of tasks.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from statistics import mean, median
+from typing import Dict, Iterator, List, Tuple
+
+from django.db.models import Count, Max, Min, Q
+from django.db.models.functions import TruncDate
+
+from .models import SprintTask, SprintTaskStatusEvent
+
+
+STATUSES = [value for value, label in SprintTask.STATUS_CHOICES]
+
+# Statuses that mean work on the task has started
+STARTED_STATUSES = ['in_progress', 'in_review', 'done']
+
+
+def _daily_deltas(sprint, end_date: date) -> Dict[date, Dict[str, int]]:
+    """Net change of the task count per status for each day with events"""
+    rows = (
+        SprintTaskStatusEvent.objects.filter(sprint=sprint, changed_at__date__lte=end_date)
+        .annotate(day=TruncDate('changed_at'))
+        .values('day', 'from_status', 'to_status')
+        .annotate(count=Count('id'))
+    )
+    deltas = defaultdict(lambda: defaultdict(int))
+    for row in rows:
+        if row['from_status']:
+            deltas[row['day']][row['from_status']] -= row['count']
+        if row['to_status']:
+            deltas[row['day']][row['to_status']] += row['count']
+    return deltas
+
+
+def status_counts_by_day(sprint, start_date: date, end_date: date) -> Iterator[Tuple[date, Dict[str, int]]]:
+    """Yield (day, task count per status) for every day from start_date to end_date"""
+    deltas = _daily_deltas(sprint, end_date)
+    counts = {status: 0 for status in STATUSES}
+
+    # Fold everything that happened before the first day into the baseline
+    for day in sorted(day for day in deltas if day < start_date):
+        for status, change in deltas[day].items():
+            counts[status] += change
+
+    current_date = start_date
+    while current_date <= end_date:
+        for status, change in deltas.get(current_date, {}).items():
+            counts[status] += change
+        yield current_date, dict(counts)
+        current_date += timedelta(days=1)
+
+
+def burndown(sprint) -> List[Dict]:
+    """Remaining and completed tasks for each day of the sprint"""
+    total_tasks = sprint.tasks.count()
+    days_total = (sprint.end_date - sprint.start_date).days + 1
+    ideal_decrement = total_tasks / days_total if days_total > 0 else 0
+
+    burndown_data = []
+    for day_number, (current_date, counts) in enumerate(
+        status_counts_by_day(sprint, sprint.start_date, sprint.end_date)
+    ):
+        completed = counts['done']
+        burndown_data.append({
+            'date': current_date.isoformat(),
+            'day': day_number,
+            # Should decrease linearly from total_tasks to 0
+            'ideal_remaining': max(0, total_tasks - (ideal_decrement * day_number)),
+            'actual_remaining': sum(counts.values()) - completed,
+            'completed': completed
+        })
+    return burndown_data
+
+
+def cumulative_flow(sprint) -> List[Dict]:
+    """Task count per status for each day of the sprint"""
+    return [
+        {'date': current_date.isoformat(), **counts}
+        for current_date, counts in status_counts_by_day(sprint, sprint.start_date, sprint.end_date)
+    ]
+
+
+def _days(delta: timedelta) -> float:
+    return round(delta.total_seconds() / 86400, 2)
+
+
+def cycle_times(sprint) -> Dict:
+    """
+    Cycle time (work started -> done) and lead time (added -> done) of the
+    sprint's completed tasks
+    """
+    rows = (
+        SprintTaskStatusEvent.objects.filter(sprint=sprint, task__status='done')
+        .values('task_id', 'task__title')
+        .annotate(
+            added_at=Min('changed_at', filter=Q(from_status__isnull=True)),
+            started_at=Min('changed_at', filter=Q(to_status__in=STARTED_STATUSES)),
+            done_at=Max('changed_at', filter=Q(to_status='done')),
+        )
+        .order_by('done_at')
+    )
+
+    tasks = []
+    for row in rows:
+        if row['done_at'] is None:
+            continue
+        added_at = row['added_at'] or row['started_at']
+        started_at = row['started_at'] or added_at
+        tasks.append({
+            'task_id': row['task_id'],
+            'title': row['task__title'],
+            'started_at': started_at,
+            'done_at': row['done_at'],
+            'cycle_time_days': _days(row['done_at'] - started_at),
+            'lead_time_days': _days(row['done_at'] - added_at),
+        })
+
+    cycle = [task['cycle_time_days'] for task in tasks]
+    lead = [task['lead_time_days'] for task in tasks]
+    return {
+        'completed_tasks': len(tasks),
+        'average_cycle_time_days': round(mean(cycle), 2) if cycle else 0,
+        'median_cycle_time_days': round(median(cycle), 2) if cycle else 0,
+        'average_lead_time_days': round(mean(lead), 2) if lead else 0,
+        'tasks': tasks,
+    }
@@ -0,0 +1,24 @@
+"""
+Management command to recompute the per-status task counters on sprints
+Usage: python manage.py repair_sprint_counters [--sprint-ids 1 2 3]
+"""
+from django.core.management.base import BaseCommand
+from sprint.counters import rebuild_task_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute sprint task counters and progress from the sprint tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sprint-ids',
+            nargs='+',
+            type=int,
+            help='Only repair these sprints (default: all sprints)'
+        )
+
+    def handle(self, *args, **options):
+        sprints = rebuild_task_counters(options['sprint_ids'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully repaired task counters for {sprints} sprint(s).')
+        )
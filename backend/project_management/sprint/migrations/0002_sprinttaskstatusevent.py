@@ -0,0 +1,60 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_status_events(apps, schema_editor):
+    """
+    Seed the history of existing tasks: added as To Do when created, then moved
+    to their current status at their last update (the best record available)
+    """
+    SprintTask = apps.get_model('sprint', 'SprintTask')
+    SprintTaskStatusEvent = apps.get_model('sprint', 'SprintTaskStatusEvent')
+
+    events = []
+    for task in SprintTask.objects.only('id', 'sprint_id', 'status', 'created_at', 'updated_at').iterator():
+        events.append(SprintTaskStatusEvent(
+            sprint_id=task.sprint_id, task_id=task.id,
+            from_status=None, to_status='todo', changed_at=task.created_at
+        ))
+        if task.status != 'todo':
+            events.append(SprintTaskStatusEvent(
+                sprint_id=task.sprint_id, task_id=task.id,
+                from_status='todo', to_status=task.status, changed_at=task.updated_at
+            ))
+    SprintTaskStatusEvent.objects.bulk_create(events, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sprint', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sprinttask',
+            name='status',
+            field=models.CharField(choices=[('todo', 'To Do'), ('pending', 'Pending'), ('in_progress', 'In Progress'), ('in_review', 'In Review'), ('done', 'Done')], default='todo', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='SprintTaskStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('todo', 'To Do'), ('pending', 'Pending'), ('in_progress', 'In Progress'), ('in_review', 'In Review'), ('done', 'Done')], max_length=20, null=True)),
+                ('to_status', models.CharField(blank=True, choices=[('todo', 'To Do'), ('pending', 'Pending'), ('in_progress', 'In Progress'), ('in_review', 'In Review'), ('done', 'Done')], max_length=20, null=True)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sprint', models.ForeignKey(help_text='Sprint the task belonged to when the change happened', on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='sprint.sprint')),
+                ('task', models.ForeignKey(blank=True, help_text='Task that changed status (null once the task is deleted)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='status_events', to='sprint.sprinttask')),
+            ],
+            options={
+                'verbose_name': 'Sprint Task Status Event',
+                'verbose_name_plural': 'Sprint Task Status Events',
+                'ordering': ['changed_at', 'id'],
+                'indexes': [models.Index(fields=['sprint', 'changed_at'], name='sprint_spri_sprint__99a760_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_status_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:16
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+COUNTER_FIELDS = {
+    'todo': 'todo_count',
+    'pending': 'pending_count',
+    'in_progress': 'in_progress_count',
+    'in_review': 'in_review_count',
+    'done': 'done_count',
+}
+
+
+def backfill_counters(apps, schema_editor):
+    Sprint = apps.get_model('sprint', 'Sprint')
+    SprintTask = apps.get_model('sprint', 'SprintTask')
+
+    counts = {}
+    for row in SprintTask.objects.values('sprint_id', 'status').annotate(count=Count('id')):
+        counts.setdefault(row['sprint_id'], {})[row['status']] = row['count']
+
+    sprints = list(Sprint.objects.filter(pk__in=counts))
+    for sprint in sprints:
+        for status, field in COUNTER_FIELDS.items():
+            setattr(sprint, field, counts[sprint.id].get(status, 0))
+        total = sum(counts[sprint.id].get(status, 0) for status in COUNTER_FIELDS)
+        sprint.progress = int((sprint.done_count / total) * 100) if total else 0
+    Sprint.objects.bulk_update(sprints, [*COUNTER_FIELDS.values(), 'progress'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sprint', '0002_sprinttaskstatusevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sprint',
+            name='done_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='in_progress_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='in_review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='pending_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='sprint',
+            name='todo_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
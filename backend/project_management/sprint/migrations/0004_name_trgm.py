@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:27
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_trigram_extension'),
+        ('projects', '0004_name_trgm'),
+        ('sprint', '0003_sprint_task_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sprint',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='sprint_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from django.contrib.auth.models import User
 from projects.models import Project
 from django.utils import timezone
@@ -28,25 +29,58 @@ class Sprint(models.Model):
     )
     description = models.TextField(blank=True, null=True)
     
+    # Task counts per status, maintained by the SprintTask signals (see counters.py)
+    todo_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+    in_progress_count = models.PositiveIntegerField(default=0)
+    in_review_count = models.PositiveIntegerField(default=0)
+    done_count = models.PositiveIntegerField(default=0)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # SprintTask status -> counter field
+    COUNTER_FIELDS = {
+        "todo": "todo_count",
+        "pending": "pending_count",
+        "in_progress": "in_progress_count",
+        "in_review": "in_review_count",
+        "done": "done_count",
+    }
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = "Sprint"
         verbose_name_plural = "Sprints"
+        indexes = [
+            GinIndex(fields=['name'], name='sprint_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
     
     def __str__(self):
         return self.name
     
+    def save(self, *args, **kwargs):
+        # Counters and progress are updated in the database with F() expressions,
+        # so saving a stale instance must not write them back
+        if not self._state.adding and not kwargs.get('force_insert') and kwargs.get('update_fields') is None:
+            derived = {'progress', *self.COUNTER_FIELDS.values()}
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in derived
+            ]
+        super().save(*args, **kwargs)
+    
+    @property
+    def tasks_total(self):
+        return sum(getattr(self, field) for field in self.COUNTER_FIELDS.values())
+    
     def calculate_progress(self):
         """Calculate progress based on completed tasks"""
-        total_tasks = self.tasks.count()
+        total_tasks = self.tasks_total
         if total_tasks == 0:
             return 0
-        completed_tasks = self.tasks.filter(status="done").count()
-        return int((completed_tasks / total_tasks) * 100)
+        return int((self.done_count / total_tasks) * 100)
     
     def get_remaining_days(self):
         """Calculate remaining days until end date"""
@@ -167,3 +201,49 @@ class SprintRetrospective(models.Model):
     
     def __str__(self):
         return f"Retrospective for {self.sprint.name}"
+
+
+class SprintTaskStatusEvent(models.Model):
+    """
+    Append-only history of sprint task status changes.
+    A null from_status marks a task entering the sprint and a null to_status
+    marks it leaving (deleted or moved to another sprint).
+    """
+    sprint = models.ForeignKey(
+        Sprint,
+        on_delete=models.CASCADE,
+        related_name='status_events',
+        help_text="Sprint the task belonged to when the change happened"
+    )
+    task = models.ForeignKey(
+        SprintTask,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='status_events',
+        help_text="Task that changed status (null once the task is deleted)"
+    )
+    from_status = models.CharField(
+        max_length=20,
+        choices=SprintTask.STATUS_CHOICES,
+        blank=True,
+        null=True
+    )
+    to_status = models.CharField(
+        max_length=20,
+        choices=SprintTask.STATUS_CHOICES,
+        blank=True,
+        null=True
+    )
+    changed_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['changed_at', 'id']
+        verbose_name = "Sprint Task Status Event"
+        verbose_name_plural = "Sprint Task Status Events"
+        indexes = [
+            models.Index(fields=['sprint', 'changed_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.from_status or 'added'} -> {self.to_status or 'removed'}"
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from projects.models import Project
+from employee.display_names import DisplayNameListSerializer, resolver_for
 from .models import Sprint, SprintTask, SprintComment, SprintRetrospective
 from django.utils import timezone
 
@@ -12,24 +13,12 @@ class UserMiniSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'name']
+        list_serializer_class = DisplayNameListSerializer
+        display_name_fields = ['id']
     
     def get_name(self, obj):
-        # First priority: Employee profile name (if exists)
-        try:
-            if hasattr(obj, 'employee_profile') and obj.employee_profile:
-                employee = obj.employee_profile
-                if employee.name:
-                    return employee.name
-        except Exception:
-            pass
-        
-        # Second priority: User's full name
-        full = f"{obj.first_name} {obj.last_name}".strip()
-        if full:
-            return full
-        
-        # Last resort: Username
-        return obj.username
+        # Employee profile name, then full name, then username
+        return resolver_for(self).name(obj)
 
 
 class ProjectMiniSerializer(serializers.ModelSerializer):
@@ -52,6 +41,8 @@ class SprintTaskSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
+        list_serializer_class = DisplayNameListSerializer
+        display_name_fields = ['assigned_to_id']
     
     def create(self, validated_data):
         # Handle assigned_to_id from request context
@@ -75,11 +66,8 @@ class SprintTaskSerializer(serializers.ModelSerializer):
             # Set to None if not provided or explicitly null/empty
             validated_data['assigned_to'] = None
         
-        task = SprintTask.objects.create(**validated_data)
-        # Update sprint progress after creating task
-        task.sprint.progress = task.sprint.calculate_progress()
-        task.sprint.save()
-        return task
+        # Sprint counters and progress are updated by the SprintTask signals
+        return SprintTask.objects.create(**validated_data)
     
     def update(self, instance, validated_data):
         # Handle assigned_to_id - check if it was provided in the request
@@ -108,11 +96,6 @@ class SprintTaskSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
-        
-        # Update sprint progress after updating task
-        instance.sprint.progress = instance.sprint.calculate_progress()
-        instance.sprint.save()
-        
         return instance
 
 
@@ -128,6 +111,8 @@ class SprintCommentSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at', 'sprint', 'user']
+        list_serializer_class = DisplayNameListSerializer
+        display_name_fields = ['user_id']
     
     def validate_content(self, value):
         """Validate that content is not empty"""
@@ -169,10 +154,7 @@ class SprintListSerializer(serializers.ModelSerializer):
             return 0
     
     def get_tasks_count(self, obj):
-        try:
-            return obj.tasks.count()
-        except Exception:
-            return 0
+        return obj.tasks_total
 
 
 class SprintDetailSerializer(serializers.ModelSerializer):
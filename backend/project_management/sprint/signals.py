@@ -0,0 +1,59 @@
+"""
+Signal handlers recording sprint task status history and keeping the sprint
+task counters in step
+"""
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .counters import apply_status_events
+from .models import SprintTask, SprintTaskStatusEvent
+
+
+def remember_previous_status(sender, instance, **kwargs):
+    """Load the stored sprint and status before an update so transitions can be recorded"""
+    instance._previous_status = None
+    if instance.pk is None:
+        return
+    previous = SprintTask.objects.filter(pk=instance.pk).values('sprint_id', 'status').first()
+    if previous is not None:
+        instance._previous_status = (previous['sprint_id'], previous['status'])
+
+
+def record_status_change(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_status', None)
+    if created or previous is None:
+        events = [(instance.sprint_id, None, instance.status)]
+    elif previous == (instance.sprint_id, instance.status):
+        return
+    elif previous[0] != instance.sprint_id:
+        # Moved between sprints: leaves the old one, enters the new one
+        events = [(previous[0], previous[1], None), (instance.sprint_id, None, instance.status)]
+    else:
+        events = [(instance.sprint_id, previous[1], instance.status)]
+
+    SprintTaskStatusEvent.objects.bulk_create([
+        SprintTaskStatusEvent(sprint_id=sprint_id, task=instance, from_status=from_status, to_status=to_status)
+        for sprint_id, from_status, to_status in events
+    ])
+    apply_status_events(events)
+
+
+def record_task_removed(sender, instance, origin=None, **kwargs):
+    # Tasks removed by deleting their sprint (or project) take the history with them
+    deleted_directly = isinstance(origin, SprintTask) or (
+        isinstance(origin, QuerySet) and origin.model is SprintTask
+    )
+    if not deleted_directly:
+        return
+    SprintTaskStatusEvent.objects.create(
+        sprint_id=instance.sprint_id,
+        task=None,
+        from_status=instance.status,
+        to_status=None
+    )
+    apply_status_events([(instance.sprint_id, instance.status, None)])
+
+
+pre_save.connect(remember_previous_status, sender=SprintTask, dispatch_uid='sprint_task_status_pre_save')
+post_save.connect(record_status_change, sender=SprintTask, dispatch_uid='sprint_task_status_post_save')
+post_delete.connect(record_task_removed, sender=SprintTask, dispatch_uid='sprint_task_status_post_delete')
@@ -1,3 +1,119 @@
+from datetime import date, datetime, time
+
 from django.test import TestCase
+from django.utils import timezone
+
+from projects.models import Project
+
+from .counters import rebuild_task_counters
+from .flow import cumulative_flow, cycle_times
+from .models import Sprint, SprintTask, SprintTaskStatusEvent
+
+
+def create_sprint(**fields):
+    project = Project.objects.create(
+        title='Apollo', description='', start_date=date(2026, 3, 1), end_date=date(2026, 6, 30),
+        status='in_progress', budget=1000,
+    )
+    return Sprint.objects.create(
+        name='Sprint 1', project=project, start_date=date(2026, 3, 1), end_date=date(2026, 3, 3), **fields
+    )
+
+
+class SprintFlowTests(TestCase):
+    def setUp(self):
+        self.sprint = create_sprint()
+        self.recorded_after = timezone.now()
+
+    def happened(self, day, hour=10):
+        """Backdate the events recorded since the last call"""
+        when = timezone.make_aware(datetime.combine(date(2026, 3, day), time(hour)))
+        SprintTaskStatusEvent.objects.filter(changed_at__gte=self.recorded_after).update(changed_at=when)
+        self.recorded_after = timezone.now()
+
+    def test_history_drives_cumulative_flow_and_cycle_times(self):
+        shipped = SprintTask.objects.create(sprint=self.sprint, title='Ship it')
+        dropped = SprintTask.objects.create(sprint=self.sprint, title='Drop it')
+        self.happened(1)
+        shipped.status = 'in_progress'
+        shipped.save()
+        dropped.delete()
+        self.happened(2)
+        shipped.status = 'done'
+        shipped.save()
+        self.happened(3)
+
+        flow = {row['date']: row for row in cumulative_flow(self.sprint)}
+        self.assertEqual((flow['2026-03-01']['todo'], flow['2026-03-01']['done']), (2, 0))
+        self.assertEqual((flow['2026-03-02']['todo'], flow['2026-03-02']['in_progress']), (0, 1))
+        self.assertEqual((flow['2026-03-03']['in_progress'], flow['2026-03-03']['done']), (0, 1))
+
+        times = cycle_times(self.sprint)
+        self.assertEqual(times['completed_tasks'], 1)
+        self.assertEqual(times['tasks'][0]['cycle_time_days'], 1.0)
+        self.assertEqual(times['tasks'][0]['lead_time_days'], 2.0)
+
+    def test_moving_a_task_leaves_one_sprint_and_enters_the_other(self):
+        task = SprintTask.objects.create(sprint=self.sprint, title='Move me', status='in_progress')
+        other = Sprint.objects.create(
+            name='Sprint 2', project=self.sprint.project, start_date=date(2026, 3, 4), end_date=date(2026, 3, 10)
+        )
+        task.sprint = other
+        task.save()
+
+        self.assertEqual(
+            list(SprintTaskStatusEvent.objects.values_list('sprint_id', 'from_status', 'to_status')),
+            [
+                (self.sprint.id, None, 'in_progress'),
+                (self.sprint.id, 'in_progress', None),
+                (other.id, None, 'in_progress'),
+            ]
+        )
+
+
+class SprintTaskCounterTests(TestCase):
+    def setUp(self):
+        self.sprint = create_sprint()
+
+    def counters(self, sprint=None):
+        sprint = sprint or self.sprint
+        sprint.refresh_from_db()
+        counts = {
+            status: getattr(sprint, field)
+            for status, field in Sprint.COUNTER_FIELDS.items() if getattr(sprint, field)
+        }
+        return counts, sprint.progress
+
+    def test_counters_follow_status_changes_and_deletes(self):
+        tasks = [SprintTask.objects.create(sprint=self.sprint, title=f'Task {i}') for i in range(4)]
+        self.assertEqual(self.counters(), ({'todo': 4}, 0))
+
+        tasks[0].status = 'done'
+        tasks[0].save()
+        tasks[1].status = 'in_review'
+        tasks[1].save()
+        self.assertEqual(self.counters(), ({'todo': 2, 'in_review': 1, 'done': 1}, 25))
+
+        tasks[2].delete()
+        SprintTask.objects.filter(pk=tasks[3].pk).delete()
+        self.assertEqual(self.counters(), ({'in_review': 1, 'done': 1}, 50))
+
+    def test_moving_a_task_updates_both_sprints(self):
+        task = SprintTask.objects.create(sprint=self.sprint, title='Move me', status='done')
+        other = Sprint.objects.create(
+            name='Sprint 2', project=self.sprint.project, start_date=date(2026, 3, 4), end_date=date(2026, 3, 10)
+        )
+        task.sprint = other
+        task.save()
+
+        self.assertEqual(self.counters(), ({}, 0))
+        self.assertEqual(self.counters(other), ({'done': 1}, 100))
+
+    def test_rebuild_repairs_drift(self):
+        SprintTask.objects.create(sprint=self.sprint, title='Done', status='done')
+        SprintTask.objects.create(sprint=self.sprint, title='Todo')
+        Sprint.objects.filter(pk=self.sprint.pk).update(todo_count=7, done_count=0, progress=0)
+
+        rebuild_task_counters([self.sprint.id])
 
-# Create your tests here.
+        self.assertEqual(self.counters(), ({'todo': 1, 'done': 1}, 50))
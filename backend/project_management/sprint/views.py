@@ -4,8 +4,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError, NotFound
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db import transaction
 from django.db.models import Q
-from django.utils import timezone
 from .models import Sprint, SprintTask, SprintComment, SprintRetrospective
 from .serializers import (
     SprintListSerializer,
@@ -16,6 +16,7 @@ from .serializers import (
     SprintRetrospectiveSerializer
 )
 from .ai_services import SprintAIService
+from . import flow
 from notifications.utils import notify_sprint_created
 
 
@@ -23,7 +24,7 @@ class SprintViewSet(viewsets.ModelViewSet):
     """ViewSet for Sprint CRUD operations"""
     permission_classes = [IsAuthenticated]
     queryset = Sprint.objects.select_related('project').prefetch_related(
-        'tasks', 'retrospective'
+        'tasks__assigned_to', 'comments__user', 'retrospective'
     ).all()
     
     def get_serializer_class(self):
@@ -115,24 +116,15 @@ class SprintViewSet(viewsets.ModelViewSet):
                     {'error': 'Validation failed', 'details': serializer.errors},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            sprint = serializer.save()
-            
-            # Calculate initial progress
-            sprint.progress = sprint.calculate_progress()
-            sprint.save()
-            
-            # Send notification to project team members
-            try:
-                # Notify the user who created the sprint
-                if request.user:
-                    notify_sprint_created(
-                        user=request.user,
-                        sprint_name=sprint.name,
-                        sprint_id=sprint.id
-                    )
-            except Exception as notify_error:
-                # Don't fail sprint creation if notification fails
-                print(f"Notification error: {notify_error}")
+            with transaction.atomic():
+                sprint = serializer.save()
+                
+                # Notify the user who created the sprint (an outbox row in this transaction when the outbox is enabled)
+                notify_sprint_created(
+                    recipients=request.user,
+                    sprint_name=sprint.name,
+                    sprint_id=sprint.id
+                )
             
             # Return sprint list serializer for consistency
             return Response(
@@ -161,10 +153,6 @@ class SprintViewSet(viewsets.ModelViewSet):
             serializer.is_valid(raise_exception=True)
             sprint = serializer.save()
             
-            # Recalculate progress
-            sprint.progress = sprint.calculate_progress()
-            sprint.save()
-            
             return Response(
                 SprintDetailSerializer(sprint).data,
                 status=status.HTTP_200_OK
@@ -202,45 +190,8 @@ class SprintViewSet(viewsets.ModelViewSet):
         try:
             sprint = self.get_object()
             
-            # Get all tasks for the sprint
-            tasks = sprint.tasks.all()
-            total_tasks = tasks.count()
-            
-            # Generate data points for each day in the sprint
-            start_date = sprint.start_date
-            end_date = sprint.end_date
-            today = timezone.now().date()
-            
-            burndown_data = []
-            days_total = (end_date - start_date).days + 1
-            ideal_decrement = total_tasks / days_total if days_total > 0 else 0
-            
-            current_date = start_date
-            day_number = 0
-            
-            while current_date <= end_date:
-                # Count tasks completed by this date
-                completed_by_date = tasks.filter(
-                    status='done',
-                    updated_at__date__lte=current_date
-                ).count()
-                
-                actual_remaining = total_tasks - completed_by_date
-                
-                # Calculate ideal remaining: should decrease linearly from total_tasks to 0
-                # Formula: ideal = total_tasks - (ideal_decrement * day_number)
-                ideal_remaining = max(0, total_tasks - (ideal_decrement * day_number))
-                
-                burndown_data.append({
-                    'date': current_date.isoformat(),
-                    'day': day_number,
-                    'ideal_remaining': ideal_remaining,
-                    'actual_remaining': actual_remaining,
-                    'completed': completed_by_date
-                })
-                
-                current_date += timezone.timedelta(days=1)
-                day_number += 1
+            total_tasks = sprint.tasks.count()
+            burndown_data = flow.burndown(sprint)
             
             return Response({
                 'sprint_id': sprint.id,
@@ -255,6 +206,43 @@ class SprintViewSet(viewsets.ModelViewSet):
                 {'error': f'Failed to get burndown data: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    @action(detail=True, methods=['get'], url_path='cumulative-flow')
+    def cumulative_flow(self, request, pk=None):
+        """Get cumulative flow data (task count per status for each day)"""
+        try:
+            sprint = self.get_object()
+            return Response({
+                'sprint_id': sprint.id,
+                'sprint_name': sprint.name,
+                'statuses': flow.STATUSES,
+                'data': flow.cumulative_flow(sprint)
+            }, status=status.HTTP_200_OK)
+        except Sprint.DoesNotExist:
+            raise NotFound(detail='Sprint not found')
+        except Exception as e:
+            return Response(
+                {'error': f'Failed to get cumulative flow data: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @action(detail=True, methods=['get'], url_path='cycle-time')
+    def cycle_time(self, request, pk=None):
+        """Get cycle and lead times of completed tasks"""
+        try:
+            sprint = self.get_object()
+            return Response({
+                'sprint_id': sprint.id,
+                'sprint_name': sprint.name,
+                **flow.cycle_times(sprint)
+            }, status=status.HTTP_200_OK)
+        except Sprint.DoesNotExist:
+            raise NotFound(detail='Sprint not found')
+        except Exception as e:
+            return Response(
+                {'error': f'Failed to get cycle time data: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
 
 class SprintTaskViewSet(viewsets.ModelViewSet):
@@ -297,10 +285,6 @@ class SprintTaskViewSet(viewsets.ModelViewSet):
                 )
             task = serializer.save()
             
-            # Update sprint progress
-            task.sprint.progress = task.sprint.calculate_progress()
-            task.sprint.save()
-            
             return Response(
                 self.get_serializer(task).data,
                 status=status.HTTP_201_CREATED
@@ -333,10 +317,6 @@ class SprintTaskViewSet(viewsets.ModelViewSet):
                 )
             task = serializer.save()
             
-            # Update sprint progress
-            task.sprint.progress = task.sprint.calculate_progress()
-            task.sprint.save()
-            
             return Response(
                 self.get_serializer(task).data,
                 status=status.HTTP_200_OK
@@ -358,13 +338,8 @@ class SprintTaskViewSet(viewsets.ModelViewSet):
         """Delete a sprint task"""
         try:
             instance = self.get_object()
-            sprint = instance.sprint
             instance.delete()
             
-            # Update sprint progress
-            sprint.progress = sprint.calculate_progress()
-            sprint.save()
-            
             return Response(
                 {'detail': 'Task deleted successfully'},
                 status=status.HTTP_204_NO_CONTENT
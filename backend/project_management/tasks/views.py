@@ -4,6 +4,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound, ValidationError
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db import transaction
 from .models import Task
 from .serializers import TaskListSerializer, TaskCreateSerializer
 from notifications.utils import notify_task_assigned
@@ -94,20 +95,17 @@ def task_list(request):
         try:
             serializer = TaskCreateSerializer(data=request.data)
             if serializer.is_valid():
-                task = serializer.save()
-                
-                # Send notification if task is assigned to someone
-                if task.assigned_to and task.assigned_to.user:
-                    try:
+                with transaction.atomic():
+                    task = serializer.save()
+                    
+                    # Notify the assignee (an outbox row in this transaction when the outbox is enabled)
+                    if task.assigned_to and task.assigned_to.user_id:
                         notify_task_assigned(
-                            user=task.assigned_to.user,
+                            recipients=[task.assigned_to.user_id],
                             task_name=task.task_name,
                             task_id=task.id,
                             assigned_by=request.user.username
                         )
-                    except Exception as notify_error:
-                        # Don't fail task creation if notification fails
-                        print(f"Notification error: {notify_error}")
                 
                 # Return list serializer for consistent response
                 response_data = TaskListSerializer(task).data
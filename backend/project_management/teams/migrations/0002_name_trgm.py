@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-18 06:27
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_trigram_extension'),
+        ('employee', '0008_name_trgm'),
+        ('teams', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='team',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='team_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
 from employee.models import Employee
 
 
@@ -32,6 +33,9 @@ class Team(models.Model):
         ordering = ['-created_at']
         verbose_name = "Team"
         verbose_name_plural = "Teams"
+        indexes = [
+            GinIndex(fields=['name'], name='team_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
 
     def __str__(self):
         return self.name
@@ -23,42 +23,108 @@ import BASE_API_URL from '../../data';
 import { getToken } from '../../Token';
 import { useNavigate } from 'react-router';
 
+// Newest first, like the notification list endpoint
+const byNewest = (a, b) => new Date(b.created_at) - new Date(a.created_at) || b.id - a.id;
+
+// Apply a delta sync response: upsert changed notifications, drop removed ones
+const applyChanges = (prev, changes) => {
+  const changed = new Map(changes.notifications.map((notif) => [notif.id, notif]));
+  const removed = new Set(changes.deleted);
+  const kept = prev
+    .filter((notif) => !removed.has(notif.id))
+    .map((notif) => (changed.has(notif.id) ? { ...notif, ...changed.get(notif.id) } : notif));
+  const keptIds = new Set(kept.map((notif) => notif.id));
+  const added = changes.notifications.filter((notif) => !keptIds.has(notif.id));
+  return [...added, ...kept].sort(byNewest);
+};
+
+// Sync responses carry no time_ago (it would change the ETag every minute)
+const timeAgo = (notification) => {
+  const seconds = Math.floor((Date.now() - new Date(notification.updated_at || notification.created_at)) / 1000);
+  const days = Math.floor(seconds / 86400);
+  if (days > 0) return `${days} day${days > 1 ? 's' : ''} ago`;
+  if (seconds >= 3600) {
+    const hours = Math.floor(seconds / 3600);
+    return `${hours} hour${hours > 1 ? 's' : ''} ago`;
+  }
+  if (seconds >= 60) {
+    const minutes = Math.floor(seconds / 60);
+    return `${minutes} minute${minutes > 1 ? 's' : ''} ago`;
+  }
+  return 'Just now';
+};
+
 const NotificationDropdown = () => {
   const [anchorEl, setAnchorEl] = useState(null);
   const [notifications, setNotifications] = useState([]);
   const [unreadCount, setUnreadCount] = useState(0);
   const [loading, setLoading] = useState(false);
-  const [page, setPage] = useState(1);
-  const [hasMore, setHasMore] = useState(true);
+  const [nextPage, setNextPage] = useState(null);
+  const syncCursor = useRef(null);
   const navigate = useNavigate();
-  const pollIntervalRef = useRef(null);
 
   const open = Boolean(anchorEl);
 
-  // Fetch notifications
-  const fetchNotifications = async (pageNum = 1, append = false) => {
+  // Delta sync: the first call loads the newest page, later calls only what changed since
+  const syncNotifications = async () => {
+    const accessToken = getToken('accessToken');
+    if (!accessToken) return;
+
+    try {
+      let cursor = syncCursor.current;
+      setLoading(!cursor);
+      let more = true;
+      while (more) {
+        const response = await axios.get(`${BASE_API_URL}/notifications/sync/`, {
+          headers: {
+            Authorization: `Bearer ${accessToken}`,
+          },
+          params: cursor ? { cursor } : { limit: 10 },
+        });
+        const data = response.data;
+        if (cursor) {
+          setNotifications((prev) => applyChanges(prev, data));
+        } else {
+          setNotifications(data.notifications);
+          setNextPage(data.next_page);
+        }
+        setUnreadCount(data.unread_count || 0);
+        cursor = data.cursor;
+        more = data.has_more;
+      }
+      syncCursor.current = cursor;
+    } catch (error) {
+      if (error.response?.status === 410 && syncCursor.current) {
+        // Cursor too old: start over
+        syncCursor.current = null;
+        await syncNotifications();
+        return;
+      }
+      console.error('Error syncing notifications:', error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // Older notifications, keyset-paginated
+  const fetchMoreNotifications = async () => {
     try {
       setLoading(true);
       const accessToken = getToken('accessToken');
-      if (!accessToken) return;
+      if (!accessToken || !nextPage) return;
 
       const response = await axios.get(`${BASE_API_URL}/notifications/`, {
         headers: {
           Authorization: `Bearer ${accessToken}`,
         },
         params: {
-          page: pageNum,
+          cursor: nextPage,
           page_size: 10,
         },
       });
 
-      if (append) {
-        setNotifications((prev) => [...prev, ...response.data.results]);
-      } else {
-        setNotifications(response.data.results);
-      }
-
-      setHasMore(response.data.results.length === 10);
+      setNotifications((prev) => applyChanges(prev, { notifications: response.data.results, deleted: [] }));
+      setNextPage(response.data.next_cursor);
     } catch (error) {
       console.error('Error fetching notifications:', error);
     } finally {
@@ -173,32 +239,97 @@ const NotificationDropdown = () => {
     }
   };
 
-  // Poll for new notifications every 30 seconds
+  // Live updates: SSE stream, or long-polling where EventSource is unavailable
   useEffect(() => {
     fetchUnreadCount();
-    fetchNotifications(1);
+    syncNotifications();
+
+    const accessToken = getToken('accessToken');
+    if (!accessToken) return undefined;
+
+    // A coalesced notification comes again with the same id: move it to the top with its new count
+    const addNotification = (notification) => {
+      setNotifications((prev) => [notification, ...prev.filter((notif) => notif.id !== notification.id)]);
+    };
 
-    // Set up polling
-    pollIntervalRef.current = setInterval(() => {
-      fetchUnreadCount();
-      if (open) {
-        fetchNotifications(1);
+    if (window.EventSource) {
+      // EventSource cannot send headers, so each connection uses a single-use stream token
+      // instead of the access token, and reconnects itself with a new one
+      let active = true;
+      let source = null;
+      let retryTimer = null;
+      let lastId = null;
+      const connect = async () => {
+        try {
+          const response = await axios.post(`${BASE_API_URL}/notifications/stream/token/`, {}, {
+            headers: {
+              Authorization: `Bearer ${accessToken}`,
+            },
+          });
+          if (!active) return;
+          const params = new URLSearchParams({ stream_token: response.data.stream_token });
+          if (lastId) params.set('last_id', lastId);
+          source = new EventSource(`${BASE_API_URL}/notifications/stream/?${params}`);
+          source.addEventListener('notification', (event) => {
+            if (event.lastEventId) lastId = event.lastEventId;
+            addNotification(JSON.parse(event.data));
+          });
+          source.addEventListener('unread_count', (event) => {
+            setUnreadCount(JSON.parse(event.data).unread_count || 0);
+          });
+          source.onerror = () => {
+            source.close();
+            if (active) retryTimer = setTimeout(connect, 3000);
+          };
+        } catch (error) {
+          console.error('Error opening notification stream:', error);
+          if (active) retryTimer = setTimeout(connect, 30000);
+        }
+      };
+      connect();
+
+      return () => {
+        active = false;
+        clearTimeout(retryTimer);
+        if (source) source.close();
+      };
+    }
+
+    let active = true;
+    let sinceId = null;
+    let updatedSince = null;
+    const longPoll = async () => {
+      while (active) {
+        try {
+          const response = await axios.get(`${BASE_API_URL}/notifications/poll/`, {
+            headers: {
+              Authorization: `Bearer ${accessToken}`,
+            },
+            params: sinceId === null ? {} : { since_id: sinceId, updated_since: updatedSince },
+          });
+          if (!active) break;
+          sinceId = response.data.last_id;
+          updatedSince = response.data.updated_since;
+          response.data.notifications.forEach(addNotification);
+          response.data.updated.forEach(addNotification);
+          setUnreadCount(response.data.unread_count || 0);
+        } catch (error) {
+          console.error('Error polling notifications:', error);
+          await new Promise((resolve) => setTimeout(resolve, 30000));
+        }
       }
-    }, 30000); // Poll every 30 seconds
+    };
+    longPoll();
 
     return () => {
-      if (pollIntervalRef.current) {
-        clearInterval(pollIntervalRef.current);
-      }
+      active = false;
     };
   }, []);
 
-  // Refresh when dropdown opens - only fetch notifications, not count
+  // Refresh when dropdown opens - a delta sync, usually a 304 with nothing to apply
   useEffect(() => {
     if (open) {
-      fetchNotifications(1);
-      // Don't fetch unread count here - it's already being polled
-      // This prevents double-counting or incorrect increments
+      syncNotifications();
     }
   }, [open]);
 
@@ -392,7 +523,8 @@ const NotificationDropdown = () => {
                           {notification.message}
                         </Typography>
                         <Typography variant="caption" color="text.secondary">
-                          {notification.time_ago}
+                          {timeAgo(notification)}
+                          {notification.count > 1 && ` · ${notification.count} updates`}
                         </Typography>
                       </Box>
                       <IconButton
@@ -409,15 +541,11 @@ const NotificationDropdown = () => {
             </List>
           )}
 
-          {hasMore && notifications.length > 0 && (
+          {nextPage && notifications.length > 0 && (
             <Box sx={{ p: 1, textAlign: 'center' }}>
               <Button
                 size="small"
-                onClick={() => {
-                  const nextPage = page + 1;
-                  setPage(nextPage);
-                  fetchNotifications(nextPage, true);
-                }}
+                onClick={fetchMoreNotifications}
                 disabled={loading}
               >
                 {loading ? <CircularProgress size={16} /> : 'Load More'}